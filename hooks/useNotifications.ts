@@ -4,7 +4,7 @@ import { useEffect, useState } from "react"
 import { collection, query, where, orderBy, limit, onSnapshot, Timestamp } from "firebase/firestore"
 import { db } from "@/lib/firebase/config"
 import { getUserId } from "@/lib/auth-utils"
-import { getNotifications, markNotificationAsRead, markAllNotificationsAsRead, deleteOldNotifications, type TNotification } from "@/lib/firebase/notifications"
+import { getNotifications, getBroadcastNotifications, mergeWithBroadcasts, markNotificationAsRead, markAllNotificationsAsRead, deleteOldNotifications, type TNotification } from "@/lib/firebase/notifications"
 
 // TNotification을 re-export
 export type { TNotification } from "@/lib/firebase/notifications"
@@ -86,8 +86,11 @@ export function useNotifications() {
                 return notification
             }))
 
-            setNotifications(updatedNotifications)
-            setUnreadCount(updatedNotifications.filter(n => !n.isRead).length)
+            // 전체 공지(broadcastNotifications)는 사용자별 문서가 없으므로 따로 읽어 합침
+            const merged = mergeWithBroadcasts(updatedNotifications, await getBroadcastNotifications(userId))
+
+            setNotifications(merged)
+            setUnreadCount(merged.filter(n => !n.isRead).length)
             setIsLoading(false)
         }, (error) => {
             console.error('[useNotifications] 실시간 리스너 오류:', error)
@@ -96,6 +99,17 @@ export function useNotifications() {
             fetchNotifications()
         })
 
+        // 새 전체 공지가 올라오면 다시 가져오기 (첫 스냅샷은 위 리스너에서 이미 합침)
+        let broadcastsReady = false
+        const unsubscribeBroadcasts = onSnapshot(
+            query(collection(db, "broadcastNotifications"), orderBy("createdAt", "desc"), limit(1)),
+            () => {
+                if (broadcastsReady) fetchNotifications()
+                broadcastsReady = true
+            },
+            (error) => console.error('[useNotifications] 공지 리스너 오류:', error)
+        )
+
         // 3. 다른 인스턴스에서의 업데이트 감지 (수동 리프레시용)
         const handleRefresh = () => {
             console.log('[useNotifications] 알림 업데이트 이벤트 수신, 리프레시 실행')
@@ -107,6 +121,7 @@ export function useNotifications() {
         return () => {
             console.log('[useNotifications] 실시간 리스너 해제')
             unsubscribe()
+            unsubscribeBroadcasts()
             window.removeEventListener('notifications-updated', handleRefresh)
         }
     }, [userId])
@@ -118,7 +133,7 @@ export function useNotifications() {
         }
         
         console.log('[useNotifications] markAsRead 시작 - notificationId:', notificationId)
-        const success = await markNotificationAsRead(notificationId)
+        const success = await markNotificationAsRead(notificationId, userId)
         console.log('[useNotifications] markAsRead 결과:', success)
 
         if (success) {
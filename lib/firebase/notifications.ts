@@ -9,6 +9,9 @@ import {
   doc, 
   writeBatch,
   deleteDoc,
+  getDoc,
+  setDoc,
+  arrayUnion,
   Timestamp,
   serverTimestamp,
   addDoc
@@ -29,6 +32,8 @@ export interface TNotification {
   creatorId?: string;
   isRead: boolean;
   createdAt: string;
+  /** 전체 공지 (broadcastNotifications 문서 1개를 모든 사용자가 공유) */
+  isBroadcast?: boolean;
   creator?: {
     nickname: string;
     avatarUrl?: string;
@@ -36,6 +41,53 @@ export interface TNotification {
   };
 }
 
+/** 전체 공지는 id 앞에 붙여 개인 알림 문서와 구분 */
+export const BROADCAST_ID_PREFIX = "broadcast:";
+
+/**
+ * 전체 공지 조회 (읽음 여부는 notificationReads/{userId}의 워터마크와 개별 읽음 목록으로 계산)
+ */
+export async function getBroadcastNotifications(userId: string, limitCount: number = 20): Promise<TNotification[]> {
+  try {
+    const [broadcastSnap, readSnap] = await Promise.all([
+      getDocs(query(collection(db, "broadcastNotifications"), orderBy("createdAt", "desc"), limit(limitCount))),
+      getDoc(doc(db, "notificationReads", userId)),
+    ]);
+    const readState: Record<string, any> = readSnap.exists() ? readSnap.data() : {};
+    const readAt: Timestamp | undefined = readState.broadcastReadAt;
+    const readIds: string[] = readState.readBroadcastIds || [];
+
+    return broadcastSnap.docs.map((docSnapshot) => {
+      const data = docSnapshot.data();
+      const createdAt: Timestamp | undefined = data.createdAt instanceof Timestamp ? data.createdAt : undefined;
+      return {
+        id: `${BROADCAST_ID_PREFIX}${docSnapshot.id}`,
+        userId,
+        type: data.type || 'SYSTEM',
+        title: data.title,
+        content: data.content,
+        missionId: data.missionId || data.mission_id,
+        creatorId: data.creatorId,
+        isRead: readIds.includes(docSnapshot.id) || (!!readAt && !!createdAt && createdAt.toMillis() <= readAt.toMillis()),
+        createdAt: createdAt ? createdAt.toDate().toISOString() : data.createdAt,
+        isBroadcast: true,
+      };
+    });
+  } catch (error) {
+    console.error("[Firebase Notifications] Error fetching broadcast notifications:", error);
+    return [];
+  }
+}
+
+/**
+ * 개인 알림과 전체 공지를 최신순으로 합침
+ */
+export function mergeWithBroadcasts(notifications: TNotification[], broadcasts: TNotification[], limitCount: number = 20): TNotification[] {
+  return [...notifications, ...broadcasts]
+    .sort((a, b) => (b.createdAt || '').localeCompare(a.createdAt || ''))
+    .slice(0, limitCount);
+}
+
 export async function getNotifications(userId: string, limitCount: number = 20): Promise<TNotification[]> {
   try {
     console.log('[Firebase Notifications] getNotifications 시작 - userId:', userId)
@@ -79,17 +131,29 @@ export async function getNotifications(userId: string, limitCount: number = 20):
       return notification;
     }));
 
-    console.log('[Firebase Notifications] 반환할 알림 개수:', notifications.length)
-    return notifications;
+    const broadcasts = await getBroadcastNotifications(userId, limitCount);
+    const merged = mergeWithBroadcasts(notifications, broadcasts, limitCount);
+
+    console.log('[Firebase Notifications] 반환할 알림 개수:', merged.length)
+    return merged;
   } catch (error) {
     console.error("[Firebase Notifications] Error fetching notifications from Firestore:", error);
     return [];
   }
 }
 
-export async function markNotificationAsRead(notificationId: string): Promise<boolean> {
+export async function markNotificationAsRead(notificationId: string, userId?: string): Promise<boolean> {
   try {
     console.log('[Firebase Notifications] markNotificationAsRead 시작 - notificationId:', notificationId)
+    if (notificationId.startsWith(BROADCAST_ID_PREFIX)) {
+      // 전체 공지는 공지 문서 대신 내 읽음 상태 문서에 기록
+      if (!userId) return false;
+      await setDoc(doc(db, "notificationReads", userId), {
+        readBroadcastIds: arrayUnion(notificationId.slice(BROADCAST_ID_PREFIX.length)),
+        updatedAt: serverTimestamp()
+      }, { merge: true });
+      return true;
+    }
     await updateDoc(doc(db, "notifications", notificationId), {
       isRead: true,
       updatedAt: serverTimestamp()
@@ -115,6 +179,12 @@ export async function markAllNotificationsAsRead(userId: string): Promise<boolea
     snap.docs.forEach((docSnapshot) => {
       batch.update(docSnapshot.ref, { isRead: true, updatedAt: serverTimestamp() });
     });
+    // 전체 공지는 워터마크만 올림 (지금까지의 공지 모두 읽음)
+    batch.set(doc(db, "notificationReads", userId), {
+      broadcastReadAt: serverTimestamp(),
+      readBroadcastIds: [],
+      updatedAt: serverTimestamp()
+    }, { merge: true });
     
     await batch.commit();
     return true;
@@ -178,6 +178,95 @@ router.post('/crawl', async (req, res) => {
   }
 });
 
+type SourceVideo = {
+  videoId: string;
+  title: string;
+  desc?: string;
+  channelName?: string;
+  channelId?: string;
+  keyword?: string;
+};
+
+// showId 추출 (정밀 키워드 매칭)
+const extractShowId = (text: string): string => {
+  const t = text.toLowerCase();
+  if (t.includes('합숙맞선') || t.includes('합숙 맞선')) return 'habsuk-matseon';
+  if (t.includes('쇼미더머니') || t.includes('show me the money') || t.includes('smtm') || t.includes('쇼미')) return 'show-me-the-money-12';
+  if (t.includes('골때녀') || t.includes('골때리는 그녀') || t.includes('goal girls') || t.includes('골 때리는')) return 'goal-girls-8';
+  if (t.includes('나솔사계') || t.includes('나는 솔로 그 후')) return 'nasolsagye';
+  if (t.includes('나는솔로') || t.includes('나는 솔로') || t.includes('i am solo') || t.includes('나솔')) return 'nasolo';
+  if (t.includes('환승연애') || t.includes('환연')) return 'hwanseung4';
+  if (t.includes('돌싱글즈') || t.includes('돌싱')) return 'dolsingles6';
+  if (t.includes('솔로지옥')) return 'solojihuk5';
+  if (t.includes('끝사랑')) return 'kkeut-sarang';
+  if (t.includes('연애남매')) return 'yeonae-nammae';
+  if (t.includes('최강야구') || t.includes('최강 몬스터즈') || t.includes('최강몬스터즈')) return 'choegang-yagu-2025';
+  if (t.includes('강철부대')) return 'steel-troops-w';
+  if (t.includes('피의게임') || t.includes('피의 게임')) return 'blood-game3';
+  if (t.includes('대학전쟁')) return 'univ-war2';
+  if (t.includes('흑백요리사')) return 'culinary-class-wars2';
+  if (t.includes('뭉쳐야찬다') || t.includes('뭉쳐야 찬다')) return 'kick-together3';
+  if (t.includes('무쇠소녀단')) return 'iron-girls';
+  if (t.includes('노엑싯게임룸') || t.includes('노엑싯')) return 'no-exit-gameroom';
+  if (t.includes('미스터트롯') || t.includes('미스터 트롯')) return 'mr-trot3';
+  if (t.includes('미스트롯')) return 'mistrot4';
+  if (t.includes('현역가왕')) return 'active-king2';
+  if (t.includes('프로젝트7') || t.includes('project 7')) return 'project7';
+  if (t.includes('유니버스리그') || t.includes('유니버스 리그')) return 'universe-league';
+  if (t.includes('싱어게인')) return 'sing-again';
+  if (t.includes('랩퍼블릭') || t.includes('랩:퍼블릭')) return 'rap-public';
+  return 'nasolo';
+};
+
+// 카테고리 매핑 로직
+const showIdToCategory: Record<string, string> = {
+  'nasolo': 'LOVE', 'nasolsagye': 'LOVE', 'dolsingles6': 'LOVE', 'solojihuk5': 'LOVE', 'hwanseung4': 'LOVE', 'kkeut-sarang': 'LOVE', 'yeonae-nammae': 'LOVE', 'habsuk-matseon': 'LOVE',
+  'choegang-yagu-2025': 'VICTORY', 'goal-girls-8': 'VICTORY', 'steel-troops-w': 'VICTORY', 'blood-game3': 'VICTORY', 'univ-war2': 'VICTORY', 'culinary-class-wars2': 'VICTORY', 'kick-together3': 'VICTORY', 'iron-girls': 'VICTORY', 'no-exit-gameroom': 'VICTORY',
+  'mr-trot3': 'STAR', 'mistrot4': 'STAR', 'active-king2': 'STAR', 'project7': 'STAR', 'universe-league': 'STAR', 'show-me-the-money-12': 'STAR', 'sing-again': 'STAR', 'rap-public': 'STAR'
+};
+
+/**
+ * AI 미션 1개를 t_marketing_ai_missions에 저장하고 프로그램/카테고리/문서 ID를 붙여 반환
+ */
+async function saveAiMission(video: SourceVideo, mission: any) {
+  const { videoId, title, desc, channelName, channelId, keyword } = video;
+  const finalShowId = extractShowId(keyword || title);
+  const finalCategory = showIdToCategory[finalShowId] || 'LOVE';
+
+  const missionRef = db.collection('t_marketing_ai_missions').doc();
+  const missionData = {
+    title: mission.title,
+    description: mission.description || '',
+    category: finalCategory,
+    showId: finalShowId,
+    kind: mission.kind || 'MAJORITY',
+    form: mission.form || 'multiple',
+    options: mission.options || [],
+    sourceVideo: {
+      videoId: videoId,
+      title: title,
+      description: desc || '',
+      channelName: channelName || '',
+      channelId: channelId || '',
+      url: `https://www.youtube.com/watch?v=${videoId}`,
+      thumbnailUrl: `https://img.youtube.com/vi/${videoId}/hqdefault.jpg`
+    },
+    status: 'PENDING',
+    createdAt: new Date().toISOString(),
+    createdBy: 'AI_GEMINI',
+    isApproved: false
+  };
+
+  await missionRef.set(missionData);
+
+  return {
+    ...mission,
+    category: finalCategory,
+    showId: finalShowId,
+    aiMissionId: missionRef.id
+  };
+}
+
 /**
  * YouTube 영상 분석 (AI 미션 생성)
  */
@@ -197,84 +286,11 @@ router.post('/analyze', async (req, res) => {
     });
     
     if (result.success && result.missions && result.missions.length > 0) {
-      const mission = result.missions[0];
-      
-      // showId 추출 (정밀 키워드 매칭)
-      const extractShowId = (text: string): string => {
-        const t = text.toLowerCase();
-        if (t.includes('합숙맞선') || t.includes('합숙 맞선')) return 'habsuk-matseon';
-        if (t.includes('쇼미더머니') || t.includes('show me the money') || t.includes('smtm') || t.includes('쇼미')) return 'show-me-the-money-12';
-        if (t.includes('골때녀') || t.includes('골때리는 그녀') || t.includes('goal girls') || t.includes('골 때리는')) return 'goal-girls-8';
-        if (t.includes('나솔사계') || t.includes('나는 솔로 그 후')) return 'nasolsagye';
-        if (t.includes('나는솔로') || t.includes('나는 솔로') || t.includes('i am solo') || t.includes('나솔')) return 'nasolo';
-        if (t.includes('환승연애') || t.includes('환연')) return 'hwanseung4';
-        if (t.includes('돌싱글즈') || t.includes('돌싱')) return 'dolsingles6';
-        if (t.includes('솔로지옥')) return 'solojihuk5';
-        if (t.includes('끝사랑')) return 'kkeut-sarang';
-        if (t.includes('연애남매')) return 'yeonae-nammae';
-        if (t.includes('최강야구') || t.includes('최강 몬스터즈') || t.includes('최강몬스터즈')) return 'choegang-yagu-2025';
-        if (t.includes('강철부대')) return 'steel-troops-w';
-        if (t.includes('피의게임') || t.includes('피의 게임')) return 'blood-game3';
-        if (t.includes('대학전쟁')) return 'univ-war2';
-        if (t.includes('흑백요리사')) return 'culinary-class-wars2';
-        if (t.includes('뭉쳐야찬다') || t.includes('뭉쳐야 찬다')) return 'kick-together3';
-        if (t.includes('무쇠소녀단')) return 'iron-girls';
-        if (t.includes('노엑싯게임룸') || t.includes('노엑싯')) return 'no-exit-gameroom';
-        if (t.includes('미스터트롯') || t.includes('미스터 트롯')) return 'mr-trot3';
-        if (t.includes('미스트롯')) return 'mistrot4';
-        if (t.includes('현역가왕')) return 'active-king2';
-        if (t.includes('프로젝트7') || t.includes('project 7')) return 'project7';
-        if (t.includes('유니버스리그') || t.includes('유니버스 리그')) return 'universe-league';
-        if (t.includes('싱어게인')) return 'sing-again';
-        if (t.includes('랩퍼블릭') || t.includes('랩:퍼블릭')) return 'rap-public';
-        return 'nasolo';
-      };
-
-      const finalShowId = extractShowId(keyword || title);
-      
-      // 카테고리 매핑 로직
-      const showIdToCategory: Record<string, string> = {
-        'nasolo': 'LOVE', 'nasolsagye': 'LOVE', 'dolsingles6': 'LOVE', 'solojihuk5': 'LOVE', 'hwanseung4': 'LOVE', 'kkeut-sarang': 'LOVE', 'yeonae-nammae': 'LOVE', 'habsuk-matseon': 'LOVE',
-        'choegang-yagu-2025': 'VICTORY', 'goal-girls-8': 'VICTORY', 'steel-troops-w': 'VICTORY', 'blood-game3': 'VICTORY', 'univ-war2': 'VICTORY', 'culinary-class-wars2': 'VICTORY', 'kick-together3': 'VICTORY', 'iron-girls': 'VICTORY', 'no-exit-gameroom': 'VICTORY',
-        'mr-trot3': 'STAR', 'mistrot4': 'STAR', 'active-king2': 'STAR', 'project7': 'STAR', 'universe-league': 'STAR', 'show-me-the-money-12': 'STAR', 'sing-again': 'STAR', 'rap-public': 'STAR'
-      };
-      
-      const finalCategory = showIdToCategory[finalShowId] || 'LOVE';
-
-      const missionRef = db.collection('t_marketing_ai_missions').doc();
-      const missionData = {
-        title: mission.title,
-        description: mission.description || '',
-        category: finalCategory,
-        showId: finalShowId,
-        kind: mission.kind || 'MAJORITY',
-        form: mission.form || 'multiple',
-        options: mission.options || [],
-        sourceVideo: {
-          videoId: videoId,
-          title: title,
-          description: desc || '',
-          channelName: channelName || '',
-          channelId: channelId || '',
-          url: `https://www.youtube.com/watch?v=${videoId}`,
-          thumbnailUrl: `https://img.youtube.com/vi/${videoId}/hqdefault.jpg`
-        },
-        status: 'PENDING',
-        createdAt: new Date().toISOString(),
-        createdBy: 'AI_GEMINI',
-        isApproved: false
-      };
-      
-      await missionRef.set(missionData);
+      const saved = await saveAiMission({ videoId, title, desc, channelName, channelId, keyword }, result.missions[0]);
       
       return res.json({
         ...result,
-        missions: [{
-          ...mission,
-          category: finalCategory,
-          showId: finalShowId,
-          aiMissionId: missionRef.id
-        }],
+        missions: [saved],
         savedToDb: true,
         savedCount: 1
       });
@@ -287,6 +303,59 @@ router.post('/analyze', async (req, res) => {
   }
 });
 
+/**
+ * 여러 영상 일괄 분석 (AI 미션 생성)
+ * body: { videos: [{ videoId, title, desc, channelName, channelId, keyword }], concurrency? }
+ * 응답: NDJSON 스트림 - 영상별 결과가 끝나는 순서대로 한 줄씩, 마지막 줄은 { type: 'done' } 요약
+ */
+router.post('/analyze-batch', async (req, res) => {
+  const { videos = [], concurrency } = req.body as { videos?: SourceVideo[]; concurrency?: number };
+  const targets = videos.filter((v) => v?.videoId && v?.title);
+  if (!targets.length) {
+    return res.status(400).json({ success: false, error: "videos(videoId, title 포함)가 필요합니다." });
+  }
+
+  const byId = new Map(targets.map((v) => [v.videoId, v]));
+  res.setHeader('Content-Type', 'application/x-ndjson; charset=utf-8');
+  const writeLine = (obj: any) => res.write(JSON.stringify(obj) + "\n");
+
+  // 대시보드가 응답을 다 받기 전에 떠나면 Python 쪽 분석(진행 중인 Gemini 호출 포함)도 취소
+  const abort = new AbortController();
+  res.on('close', () => {
+    if (!res.writableFinished) abort.abort();
+  });
+
+  let savedCount = 0;
+  const saves: Promise<void>[] = [];
+  const result = await runMarketerBridge("analyze-videos", {
+    videos: targets.map((v) => ({ video_id: v.videoId, title: v.title, desc: v.desc || '', keyword: v.keyword || '' })),
+    ...(concurrency ? { concurrency } : {}),
+  }, {
+    signal: abort.signal,
+    onEvent: (event) => {
+      if (event?.event !== 'video-analyzed') return;
+      const video = byId.get(event.video_id);
+      if (!video || !event.success || !event.missions?.length) {
+        writeLine({ type: 'video', videoId: event.video_id, success: false, error: event.error || '미션 생성 실패', done: event.done, total: event.total });
+        return;
+      }
+      saves.push(saveAiMission(video, event.missions[0])
+        .then((mission) => {
+          savedCount++;
+          writeLine({ type: 'video', videoId: event.video_id, success: true, missions: [mission], done: event.done, total: event.total });
+        })
+        .catch((e: any) => {
+          writeLine({ type: 'video', videoId: event.video_id, success: false, error: e.message, done: event.done, total: event.total });
+        }));
+    },
+  }) as any;
+  await Promise.all(saves);
+  if (abort.signal.aborted) return;
+
+  writeLine({ type: 'done', success: !!result?.success, error: result?.error, total: targets.length, savedCount });
+  res.end();
+});
+
 /**
  * 매일 새벽 6시 자동 실행: 지난 24시간 영상 수집 → 수집된 모든 영상에 대해 미션 생성
  * body: { keywords: string[], baseUrl: string } (baseUrl = 메인 앱 URL, 스크리닝 API 호출용)
@@ -323,37 +392,43 @@ router.post('/run-daily-auto-mission', async (req, res) => {
     }> = [];
 
     // 1. 키워드별로 지난 24시간 영상 수집 (Python 크롤만, DB 저장 없이 수집만)
+    // 키워드별 검색은 Python 쪽에서 하나의 이벤트 루프로 동시에 실행됨
     console.log(`[run-daily-auto-mission] 1단계: 유튜브 크롤링 시작 (키워드: ${keywords.length}개)`);
-    for (let i = 0; i < keywords.length; i++) {
-      const kw = keywords[i];
-      try {
-        console.log(`[run-daily-auto-mission] (${i + 1}/${keywords.length}) '${kw}' 크롤링 중...`);
-        const result = (await runMarketerBridge('crawl-youtube', {
-          keywords: kw,
-          'max-results': MAX_RESULTS,
-          hours_back: HOURS_BACK,
-        })) as any;
-        if (result?.success && Array.isArray(result.videos)) {
-          console.log(`[run-daily-auto-mission] '${kw}' 결과: ${result.videos.length}개 발견`);
-          for (const v of result.videos) {
-            if (v?.video_id && !seenIds.has(v.video_id)) {
-              seenIds.add(v.video_id);
-              allVideos.push({
-                video_id: v.video_id,
-                title: v.title || '',
-                description: v.description || '',
-                channel_id: v.channel_id,
-                channel_title: v.channel_title,
-                keyword: kw,
-                published_at: v.published_at,
-                thumbnail: v.thumbnail,
-              });
-            }
+    try {
+      // incremental: 지난 실행에서 이미 처리한 영상은 제외하고 새 업로드만 받음 (기존 영상은 조회수만 갱신)
+      const result = (await runMarketerBridge('crawl-youtube-multi', {
+        keywords,
+        'max-results': MAX_RESULTS,
+        hours_back: HOURS_BACK,
+        incremental: true,
+      })) as any;
+      if (!result?.success) {
+        console.warn(`[run-daily-auto-mission] 크롤 실패:`, result?.error);
+      } else {
+        console.log(`[run-daily-auto-mission] 기존 영상 조회수 갱신: ${Object.keys(result.refreshed || {}).length}개`);
+      }
+      const results: Record<string, any[]> = result?.results || {};
+      for (const kw of keywords) {
+        const videos = Array.isArray(results[kw]) ? results[kw] : [];
+        console.log(`[run-daily-auto-mission] '${kw}' 결과: ${videos.length}개 발견`);
+        for (const v of videos) {
+          if (v?.video_id && !seenIds.has(v.video_id)) {
+            seenIds.add(v.video_id);
+            allVideos.push({
+              video_id: v.video_id,
+              title: v.title || '',
+              description: v.description || '',
+              channel_id: v.channel_id,
+              channel_title: v.channel_title,
+              keyword: kw,
+              published_at: v.published_at,
+              thumbnail: v.thumbnail,
+            });
           }
         }
-      } catch (e) {
-        console.warn(`[run-daily-auto-mission] 크롤 실패 (${kw}):`, e);
       }
+    } catch (e) {
+      console.warn(`[run-daily-auto-mission] 크롤 실패:`, e);
     }
 
     console.log(`[run-daily-auto-mission] 총 ${allVideos.length}개 유니크 영상 수집됨`);
@@ -370,40 +445,42 @@ router.post('/run-daily-auto-mission', async (req, res) => {
 
     // 2. 수집된 모든 영상에 대해 즉시 미션 생성 (스크리닝 없이 전수 생성)
     console.log(`[run-daily-auto-mission] 2단계: 미션 생성 시작 (대상: ${allVideos.length}개 영상)`);
+    // 영상별 자막 조회 → Gemini 호출은 Python 쪽에서 제한된 동시 실행으로 진행되고 (호출 속도는 Gemini 리미터가 조절)
+    // 끝나는 영상부터 이벤트로 받아 바로 저장
     let missionsCreated = 0;
-    const backendUrl = process.env.MARKETING_BOT_URL || 'http://localhost:3001';
-    
-    for (let i = 0; i < allVideos.length; i++) {
-      const video = allVideos[i];
-      try {
-        console.log(`[run-daily-auto-mission] (${i + 1}/${allVideos.length}) 미션 생성 중: ${video.title.slice(0, 30)}...`);
-        
-        const analyzeRes = await fetch(`${backendUrl}/api/youtube/analyze`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({
-            videoId: video.video_id,
-            title: video.title,
-            desc: video.description || '',
-            channelName: video.channel_title,
-            channelId: video.channel_id,
-            keyword: video.keyword,
-          }),
-        });
-        
-        const data = await analyzeRes.json();
-        if (data.success && data.missions?.length) {
-          console.log(`[run-daily-auto-mission] 🚀 미션 생성 완료!`);
-          missionsCreated++;
-        } else {
-          console.log(`[run-daily-auto-mission] ⚠️ 미션 생성 실패: ${data.error || '알 수 없는 이유'}`);
+    const byId = new Map(allVideos.map((v) => [v.video_id, v]));
+    const saves: Promise<void>[] = [];
+    const batch = (await runMarketerBridge('analyze-videos', {
+      videos: allVideos.map((v) => ({ video_id: v.video_id, title: v.title, desc: v.description || '', keyword: v.keyword || '' })),
+    }, {
+      onEvent: (event) => {
+        if (event?.event !== 'video-analyzed') return;
+        const video = byId.get(event.video_id);
+        if (!video) return;
+        if (!event.success || !event.missions?.length) {
+          console.log(`[run-daily-auto-mission] (${event.done}/${event.total}) ⚠️ 미션 생성 실패: ${event.error || '알 수 없는 이유'}`);
+          return;
         }
-        
-        // AI 분석 부하를 줄이기 위해 간격 유지
-        await new Promise((r) => setTimeout(r, 2500));
-      } catch (e) {
-        console.warn(`[run-daily-auto-mission] 미션 생성 중 오류 (${video.video_id}):`, e);
-      }
+        saves.push(saveAiMission({
+          videoId: video.video_id,
+          title: video.title,
+          desc: video.description || '',
+          channelName: video.channel_title,
+          channelId: video.channel_id,
+          keyword: video.keyword,
+        }, event.missions[0])
+          .then(() => {
+            missionsCreated++;
+            console.log(`[run-daily-auto-mission] (${event.done}/${event.total}) 🚀 미션 생성 완료: ${video.title.slice(0, 30)}...`);
+          })
+          .catch((e) => {
+            console.warn(`[run-daily-auto-mission] 미션 저장 중 오류 (${video.video_id}):`, e);
+          }));
+      },
+    })) as any;
+    await Promise.all(saves);
+    if (!batch?.success) {
+      console.warn(`[run-daily-auto-mission] 미션 일괄 생성 실패:`, batch?.error);
     }
 
     console.log(
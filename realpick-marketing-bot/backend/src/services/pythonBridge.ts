@@ -1,4 +1,5 @@
 import { spawn } from "child_process";
+import net from "net";
 import path from "path";
 import fs from "fs";
 import { randomBytes } from "crypto";
@@ -8,34 +9,173 @@ import { dirname } from 'path';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
+type BridgeOptions = {
+  onLogLine?: (line: string) => void;
+  // 진행 이벤트 (analyze-videos의 영상별 결과 등, 최종 결과보다 먼저 도착)
+  onEvent?: (event: any) => void;
+  // 중단 신호 (요청한 클라이언트가 떠나면 abort → 상주 브릿지 연결 종료/프로세스 종료로 Python 쪽 작업 취소)
+  signal?: AbortSignal;
+};
+
+const CANCELLED_RESULT = { success: false, error: "요청이 취소되었습니다.", cancelled: true };
+
+// spawn 실행 시 stderr로 오는 이벤트 줄 접두어 (bridge.py EVENT_PREFIX)
+const EVENT_PREFIX = "@@EVENT ";
+
+// 상주 브릿지 (python bridge.py --serve) 접속 정보
+const DAEMON_HOST = process.env.BRIDGE_DAEMON_HOST || "127.0.0.1";
+const DAEMON_PORT = Number(process.env.BRIDGE_DAEMON_PORT || 8765);
+const DAEMON_DISABLED = process.env.BRIDGE_DAEMON === "off";
+// 브릿지 인증 토큰 파일 (BRIDGE_DAEMON_TOKEN이 없으면 상주 브릿지가 시작할 때 새로 만들어 씀, bridge.py DAEMON_TOKEN_FILE)
+const DAEMON_TOKEN_FILE = path.join("data", "bridge_daemon.token");
+
+/**
+ * crawler 디렉토리 (realpick-marketing-bot/crawler, 없으면 상위 디렉토리에서 찾기)
+ */
+function resolveCrawlerPath(): string {
+  const botRoot = path.resolve(__dirname, "..", "..", "..");
+  const crawlerPath = path.join(botRoot, "crawler");
+  if (fs.existsSync(crawlerPath)) {
+    return crawlerPath;
+  }
+  const altCrawlerPath = path.join(path.dirname(botRoot), "crawler");
+  if (fs.existsSync(altCrawlerPath)) {
+    console.log(`[Python Bridge] crawler 디렉토리를 대체 경로에서 발견: ${altCrawlerPath}`);
+    return altCrawlerPath;
+  }
+  throw new Error(`crawler 디렉토리를 찾을 수 없습니다: ${crawlerPath}, ${altCrawlerPath}`);
+}
+
+/**
+ * 상주 브릿지 인증 토큰 (환경변수 우선, 없으면 브릿지가 만든 토큰 파일)
+ * 브릿지가 재시작하면 토큰이 바뀌므로 요청마다 다시 읽음
+ */
+function readDaemonToken(): string {
+  if (process.env.BRIDGE_DAEMON_TOKEN) {
+    return process.env.BRIDGE_DAEMON_TOKEN;
+  }
+  try {
+    return fs.readFileSync(path.join(resolveCrawlerPath(), DAEMON_TOKEN_FILE), "utf8").trim();
+  } catch {
+    return "";
+  }
+}
+
 /**
  * crawler/bridge.py를 실행하는 공통 유틸리티 (로컬 전용)
- * 한글 인코딩 문제 해결을 위해 JSON 파일로 인자 전달
+ * 상주 브릿지가 떠 있으면 소켓으로 요청하고, 없으면 프로세스를 새로 실행
  */
 export async function runMarketerBridge(
   command: string,
   args: Record<string, any> = {},
-  options?: { onLogLine?: (line: string) => void }
+  options?: BridgeOptions
 ) {
+  if (options?.signal?.aborted) {
+    return CANCELLED_RESULT;
+  }
+  if (!DAEMON_DISABLED) {
+    const daemonResult = await runViaDaemon(command, args, options);
+    if (daemonResult !== null) {
+      return daemonResult;
+    }
+  }
+  return runViaSpawn(command, args, options);
+}
+
+/**
+ * 상주 브릿지에 JSON 한 줄로 요청 (연결 실패 시 null 반환 → spawn으로 대체)
+ */
+function runViaDaemon(
+  command: string,
+  args: Record<string, any>,
+  options?: BridgeOptions
+): Promise<any | null> {
   return new Promise((resolve) => {
-    try {
-      // 1. 경로 설정 (realpick-marketing-bot/crawler)
-      const botRoot = path.resolve(__dirname, "..", "..", "..");
-      let crawlerPath = path.join(botRoot, "crawler");
-      
-      // crawler 디렉토리가 없으면 상위 디렉토리에서 찾기
-      if (!fs.existsSync(crawlerPath)) {
-        const altCrawlerPath = path.join(path.dirname(botRoot), "crawler");
-        if (fs.existsSync(altCrawlerPath)) {
-          console.log(`[Python Bridge] crawler 디렉토리를 대체 경로에서 발견: ${altCrawlerPath}`);
-          crawlerPath = altCrawlerPath;
-        } else {
-          throw new Error(`crawler 디렉토리를 찾을 수 없습니다: ${crawlerPath}, ${altCrawlerPath}`);
+    let connected = false;
+    let settled = false;
+    let buffer = "";
+
+    const finish = (value: any | null) => {
+      if (settled) return;
+      settled = true;
+      options?.signal?.removeEventListener("abort", onAbort);
+      socket.destroy();
+      resolve(value);
+    };
+
+    // 연결을 끊으면 상주 브릿지가 진행 중인 작업을 취소함
+    const onAbort = () => {
+      console.log(`[Python Bridge] 요청 취소: ${command}`);
+      finish(CANCELLED_RESULT);
+    };
+    options?.signal?.addEventListener("abort", onAbort);
+
+    const socket = net.createConnection({ host: DAEMON_HOST, port: DAEMON_PORT }, () => {
+      connected = true;
+      console.log(`[Python Bridge] 상주 브릿지로 실행: ${command} (${DAEMON_HOST}:${DAEMON_PORT})`);
+      const payload: Record<string, any> = { command, ...args, token: readDaemonToken() };
+      socket.write(JSON.stringify(payload) + "\n", "utf8");
+    });
+
+    socket.setEncoding("utf8");
+
+    socket.on("data", (chunk: string) => {
+      buffer += chunk;
+      const lines = buffer.split("\n");
+      buffer = lines.pop() ?? "";
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        let frame: any;
+        try {
+          frame = JSON.parse(line);
+        } catch {
+          console.error("[Python Bridge] 상주 브릿지 응답 파싱 실패:", line);
+          continue;
+        }
+        if (frame.type === "log") {
+          process.stderr.write(frame.line + "\n");
+          options?.onLogLine?.(frame.line);
+        } else if (frame.type === "event") {
+          options?.onEvent?.(frame.event);
+        } else if (frame.type === "result") {
+          finish(frame.result);
         }
       }
+    });
+
+    socket.on("error", (error: any) => {
+      if (!connected) {
+        // 상주 브릿지가 없음 → 기존 방식으로 실행
+        finish(null);
+        return;
+      }
+      console.error("[Python Bridge] 상주 브릿지 오류:", error);
+      finish({ success: false, error: error.message });
+    });
+
+    socket.on("close", () => {
+      finish(connected
+        ? { success: false, error: "상주 브릿지 연결이 결과 없이 종료되었습니다." }
+        : null);
+    });
+  });
+}
+
+/**
+ * bridge.py를 1회성 프로세스로 실행
+ * 한글 인코딩 문제 해결을 위해 JSON 파일로 인자 전달
+ */
+function runViaSpawn(
+  command: string,
+  args: Record<string, any>,
+  options?: BridgeOptions
+) {
+  return new Promise((resolve) => {
+    try {
+      // 1. 경로 설정 (realpick-marketing-bot/crawler)
+      const crawlerPath = resolveCrawlerPath();
       const pythonPath = process.platform === 'win32' ? 'py' : 'python3';
 
-      console.log(`[Python Bridge] 봇 루트: ${botRoot}`);
       console.log(`[Python Bridge] 크롤러 경로: ${crawlerPath}`);
 
       // 2. 임시 JSON 파일로 인자 저장 (한글 인코딩 문제 해결)
@@ -70,19 +210,35 @@ export async function runMarketerBridge(
         const chunk = data.toString('utf8');
         stderr += chunk;
 
-        // 실시간 로그 라인 스트리밍 (대시보드 진행현황용)
-        if (options?.onLogLine) {
+        // 실시간 로그 라인 스트리밍 (대시보드 진행현황용) + 진행 이벤트 분리
+        if (options?.onLogLine || options?.onEvent) {
           stderrBuf += chunk;
           const lines = stderrBuf.split(/\r?\n/);
           stderrBuf = lines.pop() ?? "";
           for (const line of lines) {
             const trimmed = line.trim();
-            if (trimmed) options.onLogLine(trimmed);
+            if (!trimmed) continue;
+            if (trimmed.startsWith(EVENT_PREFIX)) {
+              try {
+                options?.onEvent?.(JSON.parse(trimmed.slice(EVENT_PREFIX.length)));
+              } catch {
+                console.error("[Python Bridge] 이벤트 파싱 실패:", trimmed);
+              }
+              continue;
+            }
+            options?.onLogLine?.(trimmed);
           }
         }
       });
 
+      const onAbort = () => {
+        console.log(`[Python Bridge] 요청 취소: ${command} (프로세스 종료)`);
+        child.kill();
+      };
+      options?.signal?.addEventListener("abort", onAbort);
+
       child.on("close", (code) => {
+        options?.signal?.removeEventListener("abort", onAbort);
         // 임시 파일 삭제
         try {
           if (fs.existsSync(tempFile)) {
@@ -96,6 +252,11 @@ export async function runMarketerBridge(
           console.warn("[Python Bridge] stderr:", stderr);
         }
 
+        if (options?.signal?.aborted) {
+          resolve(CANCELLED_RESULT);
+          return;
+        }
+
         // 4. 결과 파싱
         try {
           const result = JSON.parse(stdout.trim());
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bridge.py 명령별 시작(임포트) 비용 측정 스크립트
+
+각 명령에 대해 새 Python 프로세스에서 `python -X importtime`으로
+bridge.py + 해당 명령 모듈만 임포트한 비용을 재고,
+예전처럼 모든 모듈을 한 번에 임포트했을 때(eager)와 비교합니다.
+
+사용법:
+    python bench_bridge_startup.py              # 전체 명령
+    python bench_bridge_startup.py crawl-youtube analyze-video
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+CRAWLER_DIR = Path(__file__).parent
+EAGER = '(eager: 기존 방식)'
+
+# lazy 임포트 전 bridge.py가 모듈 로드 시점에 임포트하던 목록
+EAGER_MODULES = [
+    'modules.youtube_crawler',
+    'modules.gemini_analyzer',
+    'modules.firebase_manager',
+    'modules.email_sender',
+    'modules.community_crawler',
+    'modules.auto_commenter',
+    'modules.naver_cafe_crawler',
+    'youtube_transcript_api',
+    'google.generativeai',
+    'firebase_admin.firestore',
+]
+
+# "import time:       123 |       4567 |   package.name"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(command: str) -> dict:
+    """새 프로세스에서 명령 모듈을 임포트하고 importtime 결과를 집계"""
+    if command == EAGER:
+        code = f"import bridge, importlib; [importlib.import_module(m) for m in {EAGER_MODULES!r}]"
+    else:
+        code = f"import bridge; bridge.preload_command_modules({[command]!r})"
+
+    env = dict(os.environ, PYTHONIOENCODING='utf-8', PYTHONUTF8='1')
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=str(CRAWLER_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    total_us = 0
+    by_package = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us = int(match.group(2))
+        indent = len(match.group(3)) - 1
+        name = match.group(4)
+        # 들여쓰기 없는 줄 = 최상위 임포트 (cumulative에 하위 임포트 포함)
+        if indent == 0:
+            total_us += cumulative_us
+            by_package[name.split('.')[0]] += cumulative_us
+
+    top = sorted(by_package.items(), key=lambda x: x[1], reverse=True)[:5]
+    return {
+        'command': command,
+        'import_ms': total_us / 1000,
+        'wall_ms': wall_ms,
+        'top': top,
+        'ok': proc.returncode == 0,
+    }
+
+
+def main():
+    sys.path.insert(0, str(CRAWLER_DIR))
+    import bridge  # COMMAND_MODULES 조회용
+
+    commands = sys.argv[1:] or list(bridge.COMMAND_MODULES.keys())
+    results = [measure(EAGER)] + [measure(c) for c in commands]
+    eager_ms = results[0]['import_ms']
+
+    print(f"{'command':<22} {'imports(ms)':>12} {'wall(ms)':>10} {'vs eager':>9}  heaviest top-level imports")
+    print('-' * 100)
+    for r in results:
+        saved = 0 if eager_ms == 0 else (1 - r['import_ms'] / eager_ms) * 100
+        heaviest = ', '.join(f"{name} {us / 1000:.0f}ms" for name, us in r['top'])
+        status = '' if r['ok'] else '  (임포트 실패)'
+        print(f"{r['command']:<22} {r['import_ms']:>12.1f} {r['wall_ms']:>10.1f} {-saved:>8.0f}%  {heaviest}{status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프로그램 키워드 매칭 마이크로 벤치마크
+
+자막 코퍼스에 대해 기존 방식(프로그램마다 `any(kw in text ...)` if/elif 체인)과
+modules.show_matcher(컴파일된 정규식 한 번 스캔)의 분류 속도를 비교하고,
+두 방식의 분류 결과가 같은지도 확인합니다.
+
+코퍼스: data/cache.sqlite3에 캐시된 자막이 있으면 사용하고, 없으면 합성 자막을 만듭니다.
+
+사용법:
+    python bench_show_matcher.py
+    python bench_show_matcher.py --synthetic 2000 --repeat 5
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+import zlib
+from pathlib import Path
+
+CRAWLER_DIR = Path(__file__).parent
+sys.path.insert(0, str(CRAWLER_DIR))
+
+from modules.json_store import DATA_DIR  # noqa: E402
+from modules.show_matcher import SHOW_REGISTRY, get_show_matcher  # noqa: E402
+
+FILLER = ('오늘 방송에서 출연자들이 서로의 속마음을 털어놓았습니다 그리고 다음 주 예고에서는 '
+          '충격적인 반전이 공개될 예정이라고 하는데요 시청자들의 반응도 뜨거웠습니다 ').split()
+
+
+def load_cached_transcripts(limit: int):
+    path = DATA_DIR / 'cache.sqlite3'
+    if not path.exists():
+        return []
+    try:
+        conn = sqlite3.connect(str(path))
+        rows = conn.execute('SELECT value FROM transcripts LIMIT ?', (limit,)).fetchall()
+        conn.close()
+    except sqlite3.Error:
+        return []
+    return [zlib.decompress(row[0]).decode('utf-8') for row in rows if row[0]]
+
+
+def synthetic_transcripts(count: int, words: int = 600):
+    """필러 문장 사이에 프로그램 키워드를 드문드문 섞은 합성 자막"""
+    rng = random.Random(42)
+    keywords = [kw for entry in SHOW_REGISTRY for kw in entry['keywords']]
+    corpus = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(0, 3)):
+            tokens.insert(rng.randrange(len(tokens)), rng.choice(keywords))
+        corpus.append(' '.join(tokens))
+    return corpus
+
+
+def legacy_classify(text: str):
+    """기존 if/elif 체인과 같은 방식 (프로그램 순서대로 키워드 substring 검사)"""
+    text = text.lower()
+    for entry in SHOW_REGISTRY:
+        if any(kw in text for kw in entry['keywords']):
+            return entry['show_id']
+    return None
+
+
+def matcher_classify(text: str):
+    hit = get_show_matcher().best(text)
+    return hit['show_id'] if hit else None
+
+
+def bench(fn, corpus, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show matcher micro-benchmark')
+    parser.add_argument('--synthetic', type=int, default=1000, help='캐시 자막이 없을 때 만들 합성 자막 수')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    corpus = load_cached_transcripts(args.synthetic)
+    source = 'transcript cache'
+    if not corpus:
+        corpus = synthetic_transcripts(args.synthetic)
+        source = 'synthetic'
+    # 기존 분석기와 같은 입력 길이 (transcript[:3000])
+    corpus = [text[:3000] for text in corpus]
+
+    get_show_matcher()  # 컴파일 비용은 프로세스당 1회이므로 측정에서 제외
+    mismatches = sum(1 for text in corpus if legacy_classify(text) != matcher_classify(text))
+
+    legacy = bench(legacy_classify, corpus, args.repeat)
+    matcher = bench(matcher_classify, corpus, args.repeat)
+    total_chars = sum(len(text) for text in corpus)
+
+    print(f"corpus: {len(corpus)} texts ({source}), avg {total_chars // max(len(corpus), 1)} chars")
+    print(f"{'method':<16} {'total(ms)':>10} {'per text(us)':>13}")
+    print('-' * 42)
+    for name, elapsed in (('if/elif chain', legacy), ('show_matcher', matcher)):
+        print(f"{name:<16} {elapsed * 1000:>10.1f} {elapsed * 1e6 / len(corpus):>13.1f}")
+    print(f"speedup: {legacy / matcher:.1f}x, classification mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
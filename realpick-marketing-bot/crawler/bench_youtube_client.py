@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YouTube API 클라이언트 동기/비동기 비교 스크립트
+
+키워드마다 search.list → videos.list + channels.list 를 호출하는 작업(자막 조회 제외)을
+세 가지 방식으로 실행해 걸린 시간을 비교합니다.
+  - legacy : 호출마다 requests.get (기존 방식, 매번 새 연결)
+  - session: YouTubeApiClient (requests.Session 연결 재사용, 키워드 순차)
+  - async  : AsyncYouTubeApiClient (httpx 연결 풀/HTTP2, 키워드 동시 실행)
+
+사용법:
+    python bench_youtube_client.py --local                 # 로컬 가짜 API 서버 (할당량 소모 없음)
+    python bench_youtube_client.py --local --latency 0.2
+    python bench_youtube_client.py 나는솔로 환승연애        # 실제 API (YOUTUBE_API_KEY, 키워드당 약 102 units 소모)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+CRAWLER_DIR = Path(__file__).parent
+sys.path.insert(0, str(CRAWLER_DIR))
+
+from modules.youtube_api_client import (  # noqa: E402
+    HAS_H2,
+    HAS_HTTPX,
+    AsyncYouTubeApiClient,
+    QuotaTracker,
+    YouTubeApiClient,
+    get_quota_tracker,
+)
+
+DEFAULT_KEYWORDS = ['나는솔로', '나솔사계', '솔로지옥', '환승연애', '최강야구', '현역가왕']
+
+
+def start_local_api(latency: float):
+    """search/videos/channels 만 흉내내는 로컬 API 서버 (응답마다 latency초 지연)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            time.sleep(latency)
+            if url.path.endswith('/search'):
+                items = [
+                    {'id': {'videoId': f"{query['q'][0]}-{i}"}, 'snippet': {'channelId': f'UC{i % 5}'}}
+                    for i in range(int(query.get('maxResults', ['25'])[0]))
+                ]
+            else:
+                items = [{'id': i, 'statistics': {}} for i in query.get('id', [''])[0].split(',') if i]
+            body = json.dumps({'items': items}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/youtube/v3"
+
+
+def search_params(keyword):
+    return {'part': 'snippet', 'q': keyword, 'type': 'video', 'maxResults': 25, 'regionCode': 'KR'}
+
+
+def detail_requests(data):
+    items = data.get('items', [])
+    video_ids = ','.join(item['id']['videoId'] for item in items)
+    channel_ids = ','.join(dict.fromkeys(item['snippet']['channelId'] for item in items))
+    return [
+        ('videos', {'part': 'statistics,contentDetails', 'id': video_ids}),
+        ('channels', {'part': 'statistics', 'id': channel_ids}),
+    ]
+
+
+def run_legacy(api_key, base_url, keywords, tracker):
+    for keyword in keywords:
+        data = requests.get(f"{base_url}/search", params={**search_params(keyword), 'key': api_key}).json()
+        tracker.record('search', 100)
+        for endpoint, params in detail_requests(data):
+            requests.get(f"{base_url}/{endpoint}", params={**params, 'key': api_key}).json()
+            tracker.record(endpoint, 1)
+
+
+def run_session(api_key, base_url, keywords, tracker):
+    client = YouTubeApiClient(api_key, tracker=tracker, base_url=base_url)
+    for keyword in keywords:
+        data = client.get('search', search_params(keyword), priority='high')
+        for endpoint, params in detail_requests(data):
+            client.get(endpoint, params, priority='high')
+
+
+def run_async(api_key, base_url, keywords, tracker):
+    async def one(client, keyword):
+        data = await client.aget('search', search_params(keyword), priority='high')
+        await asyncio.gather(*(client.aget(endpoint, params, priority='high')
+                               for endpoint, params in detail_requests(data)))
+
+    async def main():
+        async with AsyncYouTubeApiClient(api_key, tracker=tracker, base_url=base_url) as client:
+            await asyncio.gather(*(one(client, keyword) for keyword in keywords))
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='YouTube API client benchmark')
+    parser.add_argument('keywords', nargs='*', help='검색 키워드 (기본: 타겟 프로그램 6개)')
+    parser.add_argument('--local', action='store_true', help='로컬 가짜 API 서버로 측정')
+    parser.add_argument('--latency', type=float, default=0.1, help='로컬 서버 응답 지연 (초)')
+    parser.add_argument('--repeat', type=int, default=3, help='방식별 반복 횟수 (중앙값 사용)')
+    args = parser.parse_args()
+    keywords = args.keywords or DEFAULT_KEYWORDS
+
+    if args.local:
+        server, base_url = start_local_api(args.latency)
+        api_key = 'local'
+        # 실제 할당량 기록을 건드리지 않도록 임시 파일 사용
+        tracker = QuotaTracker(path=Path(tempfile.mkdtemp()) / 'quota.json', daily_limit=10 ** 9)
+    else:
+        from dotenv import load_dotenv
+        load_dotenv(CRAWLER_DIR.parent / '.env')
+        api_key = os.getenv('YOUTUBE_API_KEY')
+        if not api_key:
+            print("YOUTUBE_API_KEY가 없습니다. --local로 실행하세요.")
+            return
+        base_url = "https://www.googleapis.com/youtube/v3"
+        tracker = get_quota_tracker()
+
+    modes = [('legacy', run_legacy), ('session', run_session)]
+    if HAS_HTTPX:
+        modes.append(('async', run_async))
+    else:
+        print("httpx 미설치: async 방식은 건너뜁니다.")
+
+    print(f"keywords={len(keywords)}  calls={len(keywords) * 3}  http2={'on' if HAS_H2 and not args.local else 'off'}"
+          f"  target={'local (latency %.0fms)' % (args.latency * 1000) if args.local else 'googleapis.com'}")
+    print(f"{'mode':<10} {'median(s)':>10} {'per call(ms)':>13} {'vs legacy':>10}")
+    print('-' * 48)
+    baseline = None
+    for name, fn in modes:
+        timings = []
+        for _ in range(args.repeat if args.local else 1):
+            started = time.perf_counter()
+            fn(api_key, base_url, keywords, tracker)
+            timings.append(time.perf_counter() - started)
+        median = sorted(timings)[len(timings) // 2]
+        baseline = baseline or median
+        print(f"{name:<10} {median:>10.2f} {median * 1000 / (len(keywords) * 3):>13.1f} {baseline / median:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
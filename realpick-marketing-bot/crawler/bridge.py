@@ -9,7 +9,14 @@ import sys
 import io
 import json
 import argparse
+import contextvars
+import hmac
+import importlib
+import ipaddress
 import os
+import secrets
+import socketserver
+import threading
 from pathlib import Path
 
 # Windows 인코딩 문제 해결
@@ -34,28 +41,81 @@ else:
     else:
         print(f"[Bridge] 경고: .env.local 파일을 찾을 수 없습니다: {env_path}", file=sys.stderr)
 
-from modules.youtube_crawler import YouTubeCrawler
-from modules.gemini_analyzer import GeminiAnalyzer
-from modules.firebase_manager import FirebaseManager
-from modules.email_sender import EmailSender
-from modules.community_crawler import CommunityCrawler
-from modules.auto_commenter import AutoCommenter
-try:
-    from modules.naver_cafe_crawler import NaverCafeCrawler
-    HAS_NAVER_CAFE = True
-except ImportError:
-    HAS_NAVER_CAFE = False
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi
-    HAS_TRANSCRIPT = True
-except ImportError:
-    HAS_TRANSCRIPT = False
-import google.generativeai as genai
+# 크롤러/분석기 모듈은 각 명령 처리 함수 안에서 임포트한다.
+# (crawl-youtube 1회 실행에 selenium, firebase_admin, google.generativeai 임포트 비용을 내지 않도록)
 import random
-import string
 import time
 from datetime import timedelta
-from firebase_admin import firestore
+
+# 명령별로 필요한 모듈 (상주 모드 예열 및 bench_bridge_startup.py 측정용)
+COMMAND_MODULES = {
+    'crawl-youtube': ['modules.youtube_crawler'],
+    'crawl-youtube-multi': ['modules.youtube_crawler'],
+    'analyze-video': ['modules.youtube_crawler', 'modules.gemini_analyzer'],
+    'analyze-videos': ['modules.youtube_crawler', 'modules.gemini_analyzer'],
+    'crawl-community': ['modules.community_crawler', 'modules.gemini_analyzer'],
+    'crawl-naver-cafe': ['modules.naver_cafe_crawler'],
+    'manual-login': ['modules.auto_commenter'],
+    'auto-comment': ['modules.auto_commenter'],
+    'rollup-votes': ['modules.firebase_manager', 'modules.vote_counter'],
+    'ping': [],
+}
+
+def preload_command_modules(commands=None):
+    """명령에 필요한 모듈을 미리 임포트 (commands가 None이면 전체)"""
+    if commands is None:
+        commands = list(COMMAND_MODULES.keys())
+    for command in commands:
+        for module_name in COMMAND_MODULES.get(command, []):
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                print(f"[Bridge] ⚠️ {module_name} 임포트 실패 ({command}): {e}", file=sys.stderr)
+
+# 진행 이벤트 (analyze-videos의 영상별 결과 등, 최종 결과보다 먼저 보냄)
+# 상주 모드: 요청 연결로 {"type": "event"} 프레임 전송 / CLI 모드: stderr에 EVENT_PREFIX + JSON 한 줄
+EVENT_PREFIX = '@@EVENT '
+_event_sink = contextvars.ContextVar('bridge_event_sink', default=None)
+
+def emit_event(event):
+    """진행 이벤트 1개 전송"""
+    sink = _event_sink.get()
+    if sink is not None:
+        sink(event)
+    else:
+        print(EVENT_PREFIX + json.dumps(event, ensure_ascii=False), file=sys.stderr, flush=True)
+
+# 요청 취소 신호 (상주 모드에서 요청한 클라이언트가 연결을 끊으면 set)
+_cancel_event = contextvars.ContextVar('bridge_cancel_event', default=None)
+
+def request_cancelled():
+    """현재 요청이 취소되었는지 (CLI 모드는 프로세스가 종료되므로 항상 False)"""
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+# 상주(daemon) 모드에서 요청 간 재사용되는 분석기 인스턴스 (API 키별 1개)
+_gemini_analyzers = {}
+_gemini_analyzers_lock = threading.Lock()
+
+def get_gemini_analyzer(api_key):
+    """GeminiAnalyzer를 API 키별로 한 번만 생성하여 재사용"""
+    with _gemini_analyzers_lock:
+        analyzer = _gemini_analyzers.get(api_key)
+        if analyzer is None:
+            from modules.gemini_analyzer import GeminiAnalyzer
+            analyzer = GeminiAnalyzer(api_key)
+            _gemini_analyzers[api_key] = analyzer
+        return analyzer
+
+def keyword_priority(keyword):
+    """검색 키워드가 속한 타겟 프로그램의 우선순위 (없으면 medium)"""
+    from config.settings import TARGET_CHANNELS
+    keyword = (keyword or '').strip().lower()
+    for channel in TARGET_CHANNELS:
+        names = [channel.get('name', '')] + channel.get('keywords', [])
+        if any(keyword == name.lower() for name in names if name):
+            return channel.get('priority', 'medium')
+    return 'medium'
 
 def crawl_youtube(args):
     """YouTube 크롤링 (키워드로 영상 직접 검색)"""
@@ -71,22 +131,87 @@ def crawl_youtube(args):
         max_results = int(getattr(args, 'max_results', 5))
         hours_back = int(getattr(args, 'hours_back', 24))  # 기본값 24시간
         
+        from modules.youtube_crawler import YouTubeCrawler
         crawler = YouTubeCrawler(api_key)
         
+        # 타겟 프로그램(config/settings.TARGET_CHANNELS)의 우선순위로 할당량 배분
+        priority = getattr(args, 'priority', None) or keyword_priority(keywords)
+        
         # 키워드로 영상 직접 검색 (채널 검색이 아님)
         # 최근 24시간 이내 업로드된 영상 중 조회수 상위 영상 반환
-        videos = crawler.search_videos_by_keyword(keywords, max_results, hours_back=hours_back)
+        # incremental: 지난 실행 이후 새로 올라온 영상만 처리 (이미 본 영상은 조회수만 갱신)
+        incremental = bool(getattr(args, 'incremental', False))
+        videos = crawler.search_videos_by_keyword(keywords, max_results, hours_back=hours_back, priority=priority,
+                                                  incremental=incremental)
+        quota = crawler.client.tracker.summary()
+        
+        if incremental:
+            return {
+                "success": True,
+                "count": len(videos),
+                "videos": videos,
+                "refreshed": crawler.refreshed_stats,
+                "quota": quota
+            }
         
         if not videos:
             return {
                 "success": False,
-                "error": f"'{keywords}' 키워드로 영상을 찾을 수 없습니다. 다른 키워드를 시도해보세요."
+                "error": f"'{keywords}' 키워드로 영상을 찾을 수 없습니다. 다른 키워드를 시도해보세요.",
+                "quota": quota
             }
         
         return {
             "success": True,
             "count": len(videos),
-            "videos": videos
+            "videos": videos,
+            "quota": quota
+        }
+    except Exception as e:
+        import traceback
+        return {
+            "success": False,
+            "error": str(e),
+            "trace": traceback.format_exc()
+        }
+
+def crawl_youtube_multi(args):
+    """여러 키워드 YouTube 크롤링 (키워드별 검색을 하나의 이벤트 루프에서 동시에 실행)"""
+    try:
+        api_key = os.getenv('YOUTUBE_API_KEY')
+        if not api_key:
+            return {
+                "success": False,
+                "error": "YouTube API 키가 설정되지 않았습니다."
+            }
+        
+        keywords = args.keywords
+        if isinstance(keywords, str):
+            keywords = [k.strip() for k in keywords.split(',')]
+        keywords = [k for k in dict.fromkeys(keywords or []) if k]
+        if not keywords:
+            return {
+                "success": False,
+                "error": "keywords가 필요합니다."
+            }
+        max_results = int(getattr(args, 'max_results', None) or 5)
+        hours_back = int(getattr(args, 'hours_back', None) or 24)
+        
+        from modules.youtube_crawler import YouTubeCrawler
+        crawler = YouTubeCrawler(api_key)
+        
+        results = crawler.search_keywords(
+            keywords, max_results, hours_back=hours_back,
+            priorities={keyword: keyword_priority(keyword) for keyword in keywords},
+            incremental=bool(getattr(args, 'incremental', False)),
+        )
+        
+        return {
+            "success": True,
+            "count": sum(len(videos) for videos in results.values()),
+            "results": results,
+            "refreshed": crawler.refreshed_stats,
+            "quota": crawler.client.tracker.summary()
         }
     except Exception as e:
         import traceback
@@ -96,12 +221,113 @@ def crawl_youtube(args):
             "trace": traceback.format_exc()
         }
 
+def _transcript_crawler():
+    """자막 조회용 YouTubeCrawler (자막 캐시/요청 제한 공유). youtube_crawler를 못 쓰면 None"""
+    try:
+        from modules.youtube_crawler import YouTubeCrawler
+    except ImportError:
+        print("DEBUG: HAS_TRANSCRIPT is False", file=sys.stderr)
+        return None
+    return YouTubeCrawler(os.getenv('YOUTUBE_API_KEY', ''))
+
+def _prepare_video(crawler, video_id, title='', desc='', keyword=''):
+    """영상 1개의 분석 입력 (video_info, 자막 텍스트)"""
+    # 자막 가져오기 (로컬 자막 캐시 우선 → 없으면 YouTube)
+    if crawler is not None:
+        print(f"DEBUG: Fetching transcript for {video_id}", file=sys.stderr)
+        transcript_text = crawler.get_video_transcript(video_id)
+        if transcript_text:
+            print(f"DEBUG: Transcript length: {len(transcript_text)}", file=sys.stderr)
+        else:
+            # 자막이 없어도 계속 진행
+            print("DEBUG: Transcript not available", file=sys.stderr)
+            transcript_text = "자막 없음. 제목과 설명으로 분석합니다."
+    else:
+        transcript_text = "자막 API가 설치되지 않았습니다. 제목과 설명으로 분석합니다."
+    
+    # 크롤링 시 선택한 프로그램 키워드 전달 → 자막과 맞는 프로그램 분류용
+    keyword = keyword or ''
+    if isinstance(keyword, str):
+        keyword = keyword.strip().strip('"')
+    video_info = {
+        'title': (title or '').strip('"'),
+        'description': (desc or '').strip('"'),
+        'video_id': video_id,
+        'keyword': keyword
+    }
+    return video_info, transcript_text
+
+def _mission_outcome(result):
+    """분석 결과 → 브릿지 응답 형식"""
+    if result and 'missions' in result:
+        return {
+            "success": True,
+            "missions": result['missions']
+        }
+    return {
+        "success": False,
+        "error": "미션 생성에 실패했습니다. Gemini 응답을 확인해주세요."
+    }
+
+def _analyze_one(analyzer, crawler, video_id, title='', desc='', keyword=''):
+    """영상 1개: 자막 가져오기 → Gemini 분석 → 미션 결과"""
+    video_info, transcript_text = _prepare_video(crawler, video_id, title, desc, keyword)
+    
+    # Gemini로 분석
+    print(f"DEBUG: Analyzing with Gemini. Title: {video_info['title'][:20]}, keyword: {video_info['keyword']}", file=sys.stderr)
+    result = analyzer.analyze_with_transcript(video_info, transcript_text)
+    print(f"DEBUG: Gemini result: {str(result)[:100]}", file=sys.stderr)
+    return _mission_outcome(result)
+
+async def _analyze_packs(analyzer, crawler, packs, concurrency, deadline, publish):
+    """묶음별 자막 조회 → Gemini 분석을 공용 이벤트 루프에서 동시에 진행하고 끝나는 대로 publish(video_id, 결과)
+    deadline(time.monotonic 기준)이 지나면 남은 묶음을 취소하고 시간 초과로 보고"""
+    import asyncio
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run_pack(pack):
+        async with semaphore:
+            # 자막 조회는 블로킹이므로 스레드에서 (to_thread가 요청별 로그 라우팅 컨텍스트도 복사)
+            items = await asyncio.gather(*(asyncio.to_thread(_prepare_video, crawler, **video) for video in pack))
+            if len(items) == 1:
+                video_info, transcript_text = items[0]
+                results = {video_info['video_id']: await analyzer.aanalyze_with_transcript(
+                    video_info, transcript_text, deadline=deadline)}
+            else:
+                print(f"DEBUG: Analyzing {len(items)} videos in one Gemini prompt", file=sys.stderr)
+                results = await analyzer.aanalyze_batch(items, pack_size=len(items), deadline=deadline)
+            return [(video['video_id'], _mission_outcome(results.get(video['video_id']))) for video in pack]
+    
+    tasks = {asyncio.ensure_future(run_pack(pack)): pack for pack in packs}
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    outcomes = task.result()
+                except Exception as e:
+                    outcomes = [(video['video_id'], {"success": False, "error": str(e)}) for video in tasks[task]]
+                for video_id, outcome in outcomes:
+                    publish(video_id, outcome)
+    finally:
+        # 시간 초과 또는 요청 취소(바깥에서 Future.cancel) 시 남은 묶음도 취소
+        for task in pending:
+            task.cancel()
+    
+    if pending:
+        print(f"⏱️ 시간 예산 초과: {sum(len(tasks[task]) for task in pending)}개 영상 분석을 중단합니다.", file=sys.stderr)
+        for task in pending:
+            for video in tasks[task]:
+                publish(video['video_id'], {"success": False, "error": "시간 예산을 넘어 분석을 중단했습니다."})
+
 def analyze_video(args):
     """영상 분석 및 AI 미션 생성"""
     try:
         video_id = getattr(args, 'video_id', None)
-        title = getattr(args, 'title', '')
-        desc = getattr(args, 'desc', '')
         
         if not video_id:
             return {
@@ -117,58 +343,125 @@ def analyze_video(args):
                 "error": "Gemini API 키가 설정되지 않았습니다."
             }
         
-        # 자막 가져오기
-        transcript_text = ""
-        if HAS_TRANSCRIPT:
-            try:
-                print(f"DEBUG: Fetching transcript for {video_id}", file=sys.stderr)
-                transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['ko', 'en'])
-                transcript_text = " ".join([t['text'] for t in transcript_list])
-                print(f"DEBUG: Transcript length: {len(transcript_text)}", file=sys.stderr)
-            except Exception as e:
-                # 자막이 없어도 계속 진행
-                print(f"DEBUG: Transcript error: {str(e)}", file=sys.stderr)
-                transcript_text = f"자막 없음. 제목과 설명으로 분석합니다. (오류: {str(e)})"
-        else:
-            print("DEBUG: HAS_TRANSCRIPT is False", file=sys.stderr)
-            transcript_text = "자막 API가 설치되지 않았습니다. 제목과 설명으로 분석합니다."
-        
-        # Gemini로 분석 (크롤링 시 선택한 프로그램 키워드 전달 → 자막과 맞는 프로그램 분류용)
-        keyword = getattr(args, 'keyword', '') or ''
-        if isinstance(keyword, str):
-            keyword = keyword.strip().strip('"')
-        print(f"DEBUG: Analyzing with Gemini. Title: {title[:20]}, keyword: {keyword}", file=sys.stderr)
-        analyzer = GeminiAnalyzer(gemini_key)
-        video_info = {
-            'title': title.strip('"'),
-            'description': desc.strip('"'),
-            'video_id': video_id,
-            'keyword': keyword
+        return _analyze_one(
+            get_gemini_analyzer(gemini_key), _transcript_crawler(), video_id,
+            title=getattr(args, 'title', ''),
+            desc=getattr(args, 'desc', ''),
+            keyword=getattr(args, 'keyword', ''),
+        )
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
         }
+
+def analyze_videos(args):
+    """여러 영상 AI 미션 일괄 생성
+    영상 묶음(AI_SETTINGS['pack_size'])마다 자막 조회 → 프롬프트 생성 → 비동기 Gemini 호출을 동시에 진행하고
+    (동시 실행 수는 AI_SETTINGS['batch_concurrency'], 호출 속도는 자막/Gemini 리미터가 조절)
+    끝나는 순서대로 영상별 결과를 이벤트로 먼저 보냅니다.
+    전체 시간 예산(batch_time_budget_seconds)을 넘거나 요청한 클라이언트가 연결을 끊으면 남은 분석을 취소합니다."""
+    try:
+        videos = getattr(args, 'videos', None) or []
+        if isinstance(videos, str):
+            videos = json.loads(videos)
         
-        result = analyzer.analyze_with_transcript(video_info, transcript_text)
-        print(f"DEBUG: Gemini result: {str(result)[:100]}", file=sys.stderr)
-        
-        if result and 'missions' in result:
+        # video_id 기준 중복 제거 (videoId/description 키도 허용)
+        unique = {}
+        for video in videos:
+            video_id = video.get('video_id') or video.get('videoId')
+            if video_id and video_id not in unique:
+                unique[video_id] = {
+                    'video_id': video_id,
+                    'title': video.get('title', ''),
+                    'desc': video.get('desc', video.get('description', '')),
+                    'keyword': video.get('keyword', ''),
+                }
+        videos = list(unique.values())
+        if not videos:
             return {
-                "success": True,
-                "missions": result['missions']
+                "success": False,
+                "error": "videos가 필요합니다."
             }
-        else:
+        
+        gemini_key = os.getenv('GEMINI_API_KEY')
+        if not gemini_key:
             return {
                 "success": False,
-                "error": "미션 생성에 실패했습니다. Gemini 응답을 확인해주세요."
+                "error": "Gemini API 키가 설정되지 않았습니다."
             }
-            
+        
+        try:
+            from config.settings import AI_SETTINGS
+        except ImportError:
+            AI_SETTINGS = {}
+        concurrency = int(getattr(args, 'concurrency', None) or AI_SETTINGS.get('batch_concurrency', 4))
+        
+        # pack_size > 1이면 영상 pack_size개를 한 프롬프트로 묶어 분석 (지침 반복 제거 → 토큰/요청 수 감소)
+        pack_size = max(1, int(getattr(args, 'pack_size', None) or AI_SETTINGS.get('pack_size', 4)))
+        packs = [videos[i:i + pack_size] for i in range(0, len(videos), pack_size)]
+        
+        time_budget = float(getattr(args, 'time_budget', None) or AI_SETTINGS.get('batch_time_budget_seconds', 600))
+        
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from modules.gemini_analyzer import run_in_gemini_loop
+        analyzer = get_gemini_analyzer(gemini_key)
+        crawler = _transcript_crawler()
+        
+        results = []
+        
+        def publish(video_id, outcome):
+            item = {"video_id": video_id, **outcome}
+            results.append(item)
+            emit_event({"event": "video-analyzed", "done": len(results), "total": len(videos), **item})
+        
+        future = run_in_gemini_loop(_analyze_packs(
+            analyzer, crawler, packs, concurrency, time.monotonic() + time_budget, publish))
+        while True:
+            try:
+                future.result(timeout=0.5)
+                break
+            except FutureTimeoutError:
+                # 요청한 클라이언트(대시보드)가 연결을 끊었으면 진행 중인 Gemini 호출까지 취소
+                if request_cancelled():
+                    future.cancel()
+                    print(f"[Bridge] 요청이 취소되어 남은 영상 분석을 중단합니다 ({len(results)}/{len(videos)} 완료)",
+                          file=sys.stderr)
+                    return {
+                        "success": False,
+                        "error": "요청이 취소되었습니다.",
+                        "results": results
+                    }
+        
+        succeeded = sum(1 for item in results if item.get('success'))
+        from modules.json_response import get_parse_metrics
+        return {
+            "success": True,
+            "total": len(videos),
+            "succeeded": succeeded,
+            "failed": len(videos) - succeeded,
+            "results": results,
+            # 캐시/JSON 복구/수정 요청으로 아낀 Gemini 호출 수 (오늘, 누적)
+            "parse_metrics": get_parse_metrics().summary()
+        }
     except Exception as e:
+        import traceback
         return {
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "trace": traceback.format_exc()
         }
 
 def crawl_naver_cafe(args):
     """네이버 카페 크롤링 (Selenium 기반)"""
     try:
+        try:
+            from modules.naver_cafe_crawler import NaverCafeCrawler
+            HAS_NAVER_CAFE = True
+        except ImportError:
+            HAS_NAVER_CAFE = False
+
         if not HAS_NAVER_CAFE:
             return {
                 "success": False,
@@ -256,6 +549,11 @@ def crawl_naver_cafe(args):
         print(f"[Naver Cafe Crawl] 목록 수집 완료: {len(posts_list)}개", file=sys.stderr)
         
         # 상세 수집 (스마트 재개: 기존 post_id는 스킵)
+        try:
+            from config.settings import NAVER_CAFE_SETTINGS
+        except ImportError:
+            NAVER_CAFE_SETTINGS = {}
+        api_delay = NAVER_CAFE_SETTINGS.get('api_delay_seconds', [0.5, 1.5])
         all_posts = []
         for post_info in posts_list:
             post_id = post_info.get('post_id')
@@ -285,13 +583,17 @@ def crawl_naver_cafe(args):
                 all_posts.append(merged_post)
                 existing_post_ids.add(post_id)
             
-            # Rate limiting
-            time.sleep(random.uniform(3, 7))
+            # Rate limiting (API로 받은 상세는 페이지 로딩이 없으므로 짧게)
+            if crawler.last_detail_source == 'api':
+                time.sleep(random.uniform(*api_delay))
+            else:
+                time.sleep(random.uniform(3, 7))
         
         return {
             "success": True,
             "posts": all_posts,
-            "total": len(all_posts)
+            "total": len(all_posts),
+            "list_wait": crawler.last_list_wait_stats
         }
         
     except Exception as e:
@@ -317,7 +619,7 @@ def crawl_community(args):
         if not gemini_key:
             return {"success": False, "error": "Gemini API 키가 필요합니다."}
             
-        analyzer = GeminiAnalyzer(gemini_key)
+        analyzer = get_gemini_analyzer(gemini_key)
         
         # limit 파라미터 받기 (기본값 30)
         limit = int(getattr(args, 'limit', 30))
@@ -337,6 +639,7 @@ def crawl_community(args):
 
         # board 모드에서는 맘카페 리스트 로드 불필요 (속도 개선 + 불필요한 로그 제거)
         # 에펨코리아 등 봇 차단이 심한 사이트 대응을 위해 use_browser=True 설정
+        from modules.community_crawler import CommunityCrawler
         crawler = CommunityCrawler(load_mamacafe=(include_mamacafe or only_mamacafe), use_browser=True)
         
         # 브라우저 시작 (명시적 호출)
@@ -401,10 +704,9 @@ def crawl_community(args):
                     
                 # AI 댓글 생성
                 try:
+                    # 호출 간격은 GeminiAnalyzer의 공용 rate limiter가 조절
                     comment = analyzer.generate_viral_comment(post.get('content', ''), post.get('title', ''))
                     post['suggestedComment'] = comment
-                    # API 호출 간 딜레이 추가 (Rate Limit 방지)
-                    time.sleep(2) 
                 except Exception as e:
                     print(f"⚠️ 댓글 생성 실패: {e}", file=sys.stderr)
                     post['suggestedComment'] = "댓글 생성 실패"
@@ -458,6 +760,7 @@ def manual_login(args):
                     user_pw = env_pw
                     print(f"[Bridge] {site_id} 계정 정보를 환경 변수({id_key})에서 로드함: {user_id[:2]}***", file=sys.stderr)
 
+        from modules.auto_commenter import AutoCommenter
         commenter = AutoCommenter(headless=False)
         if not commenter.start_browser():
             return {"success": False, "error": "브라우저 시작 실패"}
@@ -538,6 +841,321 @@ def auto_comment(args):
         }
 
 
+def rollup_votes(args):
+    """투표 샤드 값을 missions1 집계로 롤업 (mission_ids가 없으면 대기 중인 미션 전체)"""
+    from modules.firebase_manager import FirebaseManager
+
+    mission_ids = getattr(args, 'mission_ids', None) or getattr(args, 'missionIds', None)
+    mission_id = getattr(args, 'mission_id', None) or getattr(args, 'missionId', None)
+    if mission_id:
+        mission_ids = [mission_id]
+    report = FirebaseManager().rollup_mission_votes(mission_ids)
+    return {"success": not report.get('error') and not report['failed'], **report}
+
+
+def _start_vote_rollup_loop():
+    """상주 모드에서 VOTE_COUNTER_SETTINGS['rollup_interval_seconds']마다 투표 샤드 롤업"""
+    try:
+        from config.settings import VOTE_COUNTER_SETTINGS
+    except ImportError:
+        VOTE_COUNTER_SETTINGS = {}
+    interval = float(VOTE_COUNTER_SETTINGS.get('rollup_interval_seconds', 30))
+    if interval <= 0:
+        return
+
+    # 실패가 이어지면(색인 없음 등) 재시도 간격을 늘려 로그가 쌓이지 않게 함
+    max_delay = max(interval, 600.0)
+
+    def loop():
+        from modules.firebase_manager import FirebaseManager
+        delay = interval
+        while True:
+            time.sleep(delay)
+            manager = FirebaseManager()
+            if not manager.db:
+                continue
+            report = manager.rollup_mission_votes()
+            if report.get('error'):
+                delay = min(delay * 2, max_delay)
+                print(f"[Bridge] ⚠️ 투표 롤업 실패 ({delay:.0f}초 뒤 재시도): {report['error']}", file=sys.stderr)
+                continue
+            delay = interval
+            if report['votes']:
+                print(f"[Bridge] 🗳️ 투표 롤업: 미션 {report['missions']}개, {report['votes']}표", file=sys.stderr)
+
+    threading.Thread(target=loop, name='vote-rollup', daemon=True).start()
+
+
+def _rollup_touched_votes():
+    """1회성 실행(상주 브릿지 없음)에서 이번 명령이 샤드에 기록한 투표를 바로 missions1로 롤업"""
+    vote_counter = sys.modules.get('modules.vote_counter')
+    if vote_counter is None:
+        return
+    mission_ids = vote_counter.pop_touched_mission_ids()
+    if not mission_ids:
+        return
+    from modules.firebase_manager import FirebaseManager
+    report = FirebaseManager().rollup_mission_votes(mission_ids)
+    if report.get('error') or report['failed']:
+        print(f"[Bridge] ⚠️ 투표 롤업 실패 (rollup-votes로 다시 실행): {report.get('error') or report['failed']}",
+              file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# 상주(daemon) 모드
+# 요청마다 Python 프로세스를 새로 띄우면 google.generativeai / firebase_admin /
+# selenium 임포트와 Firebase 초기화를 매번 다시 하게 되므로, 로컬 TCP 소켓에서
+# JSON 한 줄 요청을 받아 같은 프로세스에서 처리한다.
+#
+#   요청: {"command": "crawl-youtube", "token": "...", "keywords": "나는솔로", ...}\n
+#   응답: {"type": "log", "line": "..."}\n  (0개 이상, stderr 로그)
+#         {"type": "result", "result": {...}}\n
+# ---------------------------------------------------------------------------
+DAEMON_HOST = os.getenv('BRIDGE_DAEMON_HOST', '127.0.0.1')
+DAEMON_PORT = int(os.getenv('BRIDGE_DAEMON_PORT', '8765'))
+DAEMON_TOKEN = os.getenv('BRIDGE_DAEMON_TOKEN', '')
+# BRIDGE_DAEMON_TOKEN이 없으면 상주 모드 시작 시 토큰을 만들어 이 파일(0600)에 씀 → 백엔드가 읽어 사용
+DAEMON_TOKEN_FILE = Path(__file__).parent / 'data' / 'bridge_daemon.token'
+
+
+def ping(args):
+    """상주 모드 상태 확인용"""
+    return {"success": True, "pid": os.getpid()}
+
+
+# 명령어 → 처리 함수
+COMMANDS = {
+    'crawl-youtube': crawl_youtube,
+    'crawl-youtube-multi': crawl_youtube_multi,
+    'analyze-video': analyze_video,
+    'analyze-videos': analyze_videos,
+    'crawl-community': crawl_community,
+    'crawl-naver-cafe': crawl_naver_cafe,
+    'manual-login': manual_login,
+    'auto-comment': auto_comment,
+    'rollup-votes': rollup_votes,
+    'ping': ping,
+}
+
+
+def run_command(args):
+    """args.command에 해당하는 처리 함수 실행"""
+    handler = COMMANDS.get(args.command)
+    if handler is None:
+        return {
+            "success": False,
+            "error": f"Unknown command: {args.command}"
+        }
+    return handler(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Realpick Marketing Bridge')
+    parser.add_argument('--args-file', type=str, help='JSON file with arguments')
+    parser.add_argument('command', type=str, nargs='?', help='Command to execute')
+
+    # 공통 인자
+    parser.add_argument('--keywords', type=str, help='Search keywords')
+    parser.add_argument('--max-results', type=int, help='Maximum results')
+    parser.add_argument('--video-id', type=str, help='YouTube video ID')
+    parser.add_argument('--title', type=str, help='Video title')
+    parser.add_argument('--desc', type=str, help='Video description')
+
+    # 상주 모드
+    parser.add_argument('--serve', action='store_true', help='Run as a long-lived bridge server')
+    parser.add_argument('--host', type=str, default=DAEMON_HOST, help='Bridge server host')
+    parser.add_argument('--port', type=int, default=DAEMON_PORT, help='Bridge server port')
+    return parser
+
+
+def apply_json_args(args, json_args):
+    """JSON 인자를 argparse.Namespace에 반영 ('max-results' → max_results)"""
+    for key, value in json_args.items():
+        if key == 'command':
+            args.command = value
+        else:
+            setattr(args, key.replace('-', '_'), value)
+    return args
+
+
+class _ContextStderr(io.TextIOBase):
+    """요청 처리 컨텍스트의 stderr 출력을 해당 연결로도 흘려보내는 래퍼
+    (ContextVar 기반이라 contextvars.copy_context()로 넘긴 작업 스레드의 로그도 같은 연결로 감)"""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._sink = contextvars.ContextVar('bridge_stderr_sink', default=None)
+
+    def set_sink(self, sink):
+        self._sink.set(sink)
+
+    def clear_sink(self):
+        self._sink.set(None)
+
+    def write(self, text):
+        self._fallback.write(text)
+        sink = self._sink.get()
+        if sink is not None:
+            sink(text)
+        return len(text)
+
+    def flush(self):
+        self._fallback.flush()
+
+
+_stderr_router = None
+
+
+class _BridgeRequestHandler(socketserver.StreamRequestHandler):
+    """연결 1개 = 명령 1개"""
+
+    def _watch_disconnect(self):
+        """요청 후 클라이언트가 연결을 끊으면 set되는 Event (클라이언트는 요청 한 줄 이후 아무것도 보내지 않음)"""
+        disconnected = threading.Event()
+
+        def watch():
+            try:
+                while self.connection.recv(1024):
+                    pass
+            except OSError:
+                pass
+            disconnected.set()
+
+        threading.Thread(target=watch, daemon=True).start()
+        return disconnected
+
+    def handle(self):
+        raw = self.rfile.readline()
+        if not raw:
+            return
+
+        send_lock = threading.Lock()
+
+        def send(frame):
+            data = (json.dumps(frame, ensure_ascii=False) + "\n").encode('utf-8')
+            with send_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    # 클라이언트가 먼저 연결을 끊은 경우
+                    pass
+
+        pending = []
+
+        def log_sink(text):
+            pending.append(text)
+            if "\n" not in text:
+                return
+            lines = "".join(pending).split("\n")
+            pending[:] = [lines.pop()]
+            for line in lines:
+                if line.strip():
+                    send({"type": "log", "line": line.rstrip()})
+
+        try:
+            payload = json.loads(raw.decode('utf-8'))
+            token = str(payload.pop('token', None) or '')
+            if not DAEMON_TOKEN or not hmac.compare_digest(token.encode('utf-8'), DAEMON_TOKEN.encode('utf-8')):
+                result = {"success": False, "error": "Invalid bridge token"}
+            else:
+                args = apply_json_args(build_parser().parse_args([]), payload)
+                _stderr_router.set_sink(log_sink)
+                event_token = _event_sink.set(lambda event: send({"type": "event", "event": event}))
+                cancel_token = _cancel_event.set(self._watch_disconnect())
+                try:
+                    result = run_command(args)
+                finally:
+                    _cancel_event.reset(cancel_token)
+                    _event_sink.reset(event_token)
+                    _stderr_router.clear_sink()
+                    log_sink("\n")
+        except Exception as e:
+            import traceback
+            result = {
+                "success": False,
+                "error": str(e),
+                "trace": traceback.format_exc()
+            }
+
+        send({"type": "result", "result": result})
+
+
+class _BridgeServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def warm_up():
+    """상주 모드 시작 시 모듈 임포트, Firestore 클라이언트, Gemini 모델을 미리 준비"""
+    preload_command_modules()
+
+    try:
+        from modules.firebase_manager import FirebaseManager
+        if FirebaseManager().db:
+            print("[Bridge] ✅ Firestore 클라이언트 준비 완료", file=sys.stderr)
+    except Exception as e:
+        print(f"[Bridge] ⚠️ Firestore 준비 실패 (요청 시 재시도): {e}", file=sys.stderr)
+
+    gemini_key = os.getenv('GEMINI_API_KEY')
+    if gemini_key:
+        try:
+            get_gemini_analyzer(gemini_key)
+            print("[Bridge] ✅ Gemini 모델 준비 완료", file=sys.stderr)
+        except Exception as e:
+            print(f"[Bridge] ⚠️ Gemini 준비 실패 (요청 시 재시도): {e}", file=sys.stderr)
+
+
+def _is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _prepare_daemon_token(host):
+    """상주 모드 인증 토큰 준비 (토큰 없이는 요청을 받지 않음)
+    BRIDGE_DAEMON_TOKEN이 있으면 그대로 쓰고, 없으면 새로 만들어 DAEMON_TOKEN_FILE(0600)에 기록.
+    루프백이 아닌 주소로 열 때는 양쪽에 미리 맞춘 BRIDGE_DAEMON_TOKEN이 있어야 함"""
+    global DAEMON_TOKEN
+    if DAEMON_TOKEN:
+        return
+    if not _is_loopback(host):
+        print(f"[Bridge] ❌ {host}는 루프백 주소가 아닙니다. BRIDGE_DAEMON_TOKEN을 설정해야 상주 모드를 열 수 있습니다.",
+              file=sys.stderr)
+        raise SystemExit(1)
+    token = secrets.token_urlsafe(32)
+    DAEMON_TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = DAEMON_TOKEN_FILE.with_name(f'{DAEMON_TOKEN_FILE.name}.{os.getpid()}.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    os.replace(tmp_path, DAEMON_TOKEN_FILE)
+    DAEMON_TOKEN = token
+    print(f"[Bridge] 🔑 인증 토큰 생성: {DAEMON_TOKEN_FILE}", file=sys.stderr)
+
+
+def serve(host=DAEMON_HOST, port=DAEMON_PORT):
+    """브릿지 상주 서버 실행 (Ctrl+C로 종료)"""
+    global _stderr_router
+    _prepare_daemon_token(host)
+    _stderr_router = _ContextStderr(sys.stderr)
+    sys.stderr = _stderr_router
+    sys.stdout = _stderr_router
+
+    warm_up()
+    _start_vote_rollup_loop()
+
+    with _BridgeServer((host, port), _BridgeRequestHandler) as server:
+        print(f"[Bridge] 상주 모드 대기 중: {host}:{port} (pid={os.getpid()})", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("[Bridge] 상주 모드 종료", file=sys.stderr)
+
+
 def main():
     # 모든 경고 메시지를 무시하여 JSON 출력만 깨끗하게 유지
     import warnings
@@ -548,18 +1166,11 @@ def main():
     sys.stdout = sys.stderr
     
     try:
-        parser = argparse.ArgumentParser(description='Realpick Marketing Bridge')
-        parser.add_argument('--args-file', type=str, help='JSON file with arguments')
-        parser.add_argument('command', type=str, nargs='?', help='Command to execute')
-        
-        # 공통 인자
-        parser.add_argument('--keywords', type=str, help='Search keywords')
-        parser.add_argument('--max-results', type=int, help='Maximum results')
-        parser.add_argument('--video-id', type=str, help='YouTube video ID')
-        parser.add_argument('--title', type=str, help='Video title')
-        parser.add_argument('--desc', type=str, help='Video description')
-        
-        args, _ = parser.parse_known_args()
+        args, _ = build_parser().parse_known_args()
+
+        if args.serve:
+            serve(args.host, args.port)
+            return
         
         # --args-file이 제공되면 JSON 파일에서 인자 로드
         if args.args_file and os.path.exists(args.args_file):
@@ -567,31 +1178,11 @@ def main():
                 json_args = json.load(f)
             
             # JSON 인자를 argparse.Namespace로 변환
-            for key, value in json_args.items():
-                if key == 'command':
-                    args.command = value
-                else:
-                    setattr(args, key.replace('-', '_'), value)
+            apply_json_args(args, json_args)
         
         # 명령어에 따라 함수 실행
-        result = None
-        if args.command == 'crawl-youtube':
-            result = crawl_youtube(args)
-        elif args.command == 'analyze-video':
-            result = analyze_video(args)
-        elif args.command == 'crawl-community':
-            result = crawl_community(args)
-        elif args.command == 'crawl-naver-cafe':
-            result = crawl_naver_cafe(args)
-        elif args.command == 'manual-login':
-            result = manual_login(args)
-        elif args.command == 'auto-comment':
-            result = auto_comment(args)
-        else:
-            result = {
-                "success": False,
-                "error": f"Unknown command: {args.command}"
-            }
+        result = run_command(args)
+        _rollup_touched_votes()
         
         # JSON 출력 (반드시 stdout에 한 줄로)
         sys.stdout = original_stdout
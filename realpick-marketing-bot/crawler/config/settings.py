@@ -65,7 +65,81 @@ CRAWL_SETTINGS = {
     'days_back': 7,  # 며칠 전까지의 영상을 가져올지
     'min_views': 1000,  # 최소 조회수
     'exclude_shorts': True,  # 쇼츠 제외
-    'crawl_interval_hours': 24  # 크롤링 주기 (시간)
+    'crawl_interval_hours': 24,  # 크롤링 주기 (시간)
+    # 증분 크롤링 커서 (data/youtube_crawl_cursors.json)
+    'cursor_overlap_minutes': 60,  # 검색 색인 지연을 고려해 마지막 게시 시각보다 이만큼 앞에서 다시 조회
+    'seen_retention_days': 7,  # 이미 처리한 영상 ID를 기억하는 기간 (조회수 갱신 대상)
+}
+
+# YouTube Data API 할당량 설정
+YOUTUBE_QUOTA_SETTINGS = {
+    'daily_limit': int(os.getenv('YOUTUBE_DAILY_QUOTA', '10000')),  # 프로젝트 일일 할당량 (units)
+    # 우선순위별로 남겨둘 할당량: low 크롤링은 남은 양이 3000 미만이면 미룸
+    'reserve': {'high': 0, 'medium': 1000, 'low': 3000},
+}
+
+# YouTube API HTTP 설정 (연결 재사용 / 타임아웃 / 재시도)
+YOUTUBE_HTTP_SETTINGS = {
+    'timeout': 10,  # 요청당 타임아웃 (초)
+    'max_retries': 3,  # 5xx / 속도 제한(403, 429) 재시도 횟수
+    'backoff_base': 1.0,  # 재시도 대기 기본값 (초, 지수 증가)
+    'max_connections': 10,  # 연결 풀 크기 (비동기 모드 동시 요청 수)
+}
+
+# 자막 조회 설정 (youtube_transcript_api)
+TRANSCRIPT_SETTINGS = {
+    'max_workers': 8,  # 동시에 조회할 영상 수
+    'requests_per_second': 5,  # www.youtube.com 초당 요청 수 제한
+    'cache_ttl_days': 30,  # 자막 캐시 보관 기간 (data/cache.sqlite3)
+    'cache_max_mb': 200,  # 자막 캐시 최대 용량 (넘으면 오래 안 쓴 자막부터 삭제)
+    'missing_ttl_hours': 6,  # 자막 없는 영상을 다시 확인하기까지의 시간
+}
+
+# 자막 압축 설정 (Gemini 프롬프트에 넣기 전 정보가 많은 구간만 선택, modules/transcript_condenser.py)
+TRANSCRIPT_CONDENSE_SETTINGS = {
+    'max_chars': 3000,  # 단일 영상 프롬프트에 넣을 자막 길이
+    'window_words': 40,  # 구간 하나의 단어 수
+    'late_bias': 0.2,  # 점수가 비슷하면 뒤쪽 구간 우선 (방송 후반부에 픽거리가 많음)
+    # 점수에 반영할 출연진 이름 (영상 제목의 단어도 함께 반영)
+    'cast_names': ['영수', '영호', '영식', '영철', '광수', '상철', '경수', '영숙', '정숙', '순자',
+                   '영자', '옥순', '현숙', '정희', '미경', '영미'],
+}
+
+# 네이버 카페 크롤링 설정 (modules/naver_cafe_crawler.py)
+NAVER_CAFE_SETTINGS = {
+    # 게시글 상세 수집 방식: 'api' = 게시글 API 우선, 실패 시 브라우저 / 'browser' = 항상 브라우저
+    'detail_mode': 'api',
+    'api_timeout': 10,  # API 요청 타임아웃 (초)
+    'max_connections': 4,  # API 세션 연결 풀 크기
+    'api_delay_seconds': [0.5, 1.5],  # API로 상세를 받은 뒤 다음 게시글까지 쉬는 시간 (브라우저는 3~7초)
+    # 목록 페이지 대기 (고정 sleep 대신 게시글 링크 표시 + 네트워크 idle 조건)
+    'list_wait_timeout': 20,  # 목록이 뜰 때까지 최대 대기 (초)
+    'scroll_wait_timeout': 3,  # 스크롤 후 지연 로딩 행을 기다리는 최대 시간 (초)
+    'network_idle_ms': 500,  # 링크 수/리소스 요청 수가 이 시간 동안 그대로면 로딩 끝으로 판단
+}
+
+# 전체 사용자 알림 팬아웃 설정 (modules/notification_fanout.py, 진행 상황은 data/notification_fanouts.json)
+NOTIFICATION_FANOUT_SETTINGS = {
+    'batch_size': 500,  # batch commit 하나에 쓸 알림 수 (Firestore 최대 500)
+    'max_workers': 8,  # 동시에 commit할 batch 수
+    'max_retries': 3,  # batch commit 실패 시 재시도 횟수
+    'keep_runs': 20,  # 완료된 팬아웃 기록 보관 개수
+}
+
+# 미션 투표 분산 카운터 (modules/vote_counter.py)
+VOTE_COUNTER_SETTINGS = {
+    'num_shards': 10,  # 미션당 샤드 수 (샤드당 초당 약 1회 쓰기)
+    'rollup_interval_seconds': 30,  # 상주 브릿지가 샤드 값을 missions1로 롤업하는 주기 (0이면 끔)
+    # 투표 시 missionId/userId 쿼리로 중복 확인 - 고정 ID 도입 전 .add()로 임의 ID에 저장된 픽은
+    # create() 조건으로 걸러지지 않으므로, 기존 픽을 {userId}_{missionId}로 옮기기 전까지는 켜 둘 것
+    'legacy_duplicate_check': True,
+}
+
+# Gemini 호출 속도 제한 (모든 분석기가 공유, 브릿지 프로세스 간에도 data/gemini_rate_limit.json으로 공유)
+GEMINI_RATE_LIMIT = {
+    'requests_per_minute': int(os.getenv('GEMINI_RPM', '15')),
+    'tokens_per_minute': int(os.getenv('GEMINI_TPM', '1000000')),
+    'shared_across_processes': True,
 }
 
 # AI 분석 설정
@@ -74,7 +148,16 @@ AI_SETTINGS = {
     'max_missions_per_video': 2,  # 영상당 최대 미션 수
     'preferred_mission_types': ['predict', 'majority'],
     'max_options_per_mission': 4,  # 미션당 최대 선택지 수
-    'analysis_language': 'ko'  # 분석 언어
+    'analysis_language': 'ko',  # 분석 언어
+    'batch_concurrency': 4,  # analyze-videos 동시 분석 묶음 수 (실제 호출 속도는 GEMINI_RATE_LIMIT가 조절)
+    'pack_size': 4,  # 한 프롬프트에 묶어 분석할 영상 수 (1이면 영상마다 개별 호출)
+    'packed_transcript_chars': 2000,  # 묶음 프롬프트에 넣을 영상당 자막 길이
+    'call_timeout_seconds': 60,  # 비동기 Gemini 호출 1회 제한 시간 (넘으면 취소 후 재시도)
+    'batch_time_budget_seconds': 600,  # analyze-videos 전체 시간 예산 (넘으면 남은 영상 분석 중단)
+    # Gemini 응답 캐시 (같은 모델 + 같은 프롬프트면 API 호출 없이 재사용, data/cache.sqlite3)
+    'response_cache_enabled': True,
+    'response_cache_ttl_days': 14,
+    'response_cache_max_mb': 50,
 }
 
 # 이메일 발송 설정
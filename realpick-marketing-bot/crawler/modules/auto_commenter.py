@@ -9,11 +9,12 @@ import os
 import time
 import random
 import json
-import pickle
 from typing import Optional
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from modules.cookie_store import COOKIE_DIR, get_cookie_store
+
 try:
     import undetected_chromedriver as uc
     from selenium.webdriver.common.by import By
@@ -26,9 +27,6 @@ except ImportError:
     HAS_SELENIUM = False
 
 
-COOKIE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cookies')
-
-
 class AutoCommenter:
     """사이트별 자동 댓글 등록 (사람처럼 동작)"""
 
@@ -165,32 +163,22 @@ class AutoCommenter:
     # ──────────────────────────────────────────────
     # 쿠키 저장/로드
     # ──────────────────────────────────────────────
-    def _cookie_path(self, site_id: str) -> str:
-        return os.path.join(COOKIE_DIR, f"{site_id}_cookies.pkl")
-
     def save_cookies(self, site_id: str):
         try:
-            cookies = self.driver.get_cookies()
-            with open(self._cookie_path(site_id), 'wb') as f:
-                pickle.dump(cookies, f)
+            get_cookie_store(site_id).save(self.driver.get_cookies())
             print(f"[AutoCommenter] {site_id} 쿠키 저장 완료", file=sys.stderr)
         except Exception as e:
             print(f"[AutoCommenter] 쿠키 저장 실패: {e}", file=sys.stderr)
 
     def load_cookies(self, site_id: str, base_url: str) -> bool:
-        path = self._cookie_path(site_id)
-        if not os.path.exists(path):
+        store = get_cookie_store(site_id)
+        # 저장된 쿠키가 없거나 모두 만료됐으면 페이지를 열지 않고 바로 로그인 절차로
+        if not store.is_valid():
             return False
         try:
             self.driver.get(base_url)
             self._human_wait(1, 2)
-            with open(path, 'rb') as f:
-                cookies = pickle.load(f)
-            for cookie in cookies:
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception:
-                    pass
+            store.apply_to_driver(self.driver)
             self.driver.refresh()
             self._human_wait(1.5, 3)
             print(f"[AutoCommenter] {site_id} 쿠키 로드 완료", file=sys.stderr)
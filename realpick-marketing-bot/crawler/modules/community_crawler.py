@@ -8,6 +8,8 @@ import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+from modules.show_matcher import keyword_matcher
+
 try:
     import undetected_chromedriver as uc
     from selenium.webdriver.common.by import By
@@ -490,15 +492,8 @@ class CommunityCrawler:
         if not title or not content:
             return False
         
-        # 제목과 본문을 합쳐서 검색
-        combined_text = (title + " " + content).lower()
-        
-        # 키워드 중 하나라도 포함되어 있으면 관련 게시글
-        for keyword in keywords:
-            if keyword.lower() in combined_text:
-                return True
-        
-        return False
+        # 제목과 본문을 합쳐서 키워드 중 하나라도 포함되어 있으면 관련 게시글
+        return keyword_matcher(tuple(keywords)).matches(title + " " + content)
 
     def _parse_search_results(self, site_id: str, soup: BeautifulSoup, kw: str) -> List[tuple]:
         """사이트별 검색결과 HTML에서 (url, title) 리스트 반환"""
@@ -0,0 +1,146 @@
+"""
+로그인 쿠키 저장소
+Selenium get_cookies() 형식의 쿠키를 cookies/<site>_cookies.json에 만료 시각과 함께 저장합니다.
+  - pickle 대신 JSON (파일을 읽을 때 코드가 실행될 일이 없음)
+  - 만료된 쿠키는 읽을 때 걸러내고, 필수 로그인 쿠키가 모두 살아 있는지 브라우저 없이 확인
+  - requests.Session에 바로 채워 넣을 수 있어 API만 쓰는 작업은 Chrome을 띄우지 않아도 됨
+  - 예전 pickle 쿠키(*.pkl)는 읽지 않음 → 처음 한 번 manual-login으로 다시 로그인해 JSON으로 저장
+  - 다른 프로세스(manual-login 등)가 파일을 갱신하면 수정 시각이 바뀐 것을 보고 다시 읽음
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from modules.json_store import JsonFileStore
+
+COOKIE_DIR = Path(__file__).parent.parent / 'cookies'
+
+# 브라우저/requests에 넘길 때 유지하는 쿠키 필드 (Selenium add_cookie가 받는 키)
+_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'expiry', 'secure', 'httpOnly', 'sameSite')
+
+
+def _normalize(cookie: Dict) -> Optional[Dict]:
+    """쿠키 딕셔너리 정리 (name/value 없는 항목은 버리고 expiry는 정수로)"""
+    if not isinstance(cookie, dict) or not cookie.get('name') or cookie.get('value') is None:
+        return None
+    normalized = {key: cookie[key] for key in _COOKIE_FIELDS if cookie.get(key) is not None}
+    if 'expiry' in normalized:
+        try:
+            normalized['expiry'] = int(normalized['expiry'])
+        except (TypeError, ValueError):
+            normalized.pop('expiry')
+    return normalized
+
+
+class CookieStore:
+    """사이트 하나의 로그인 쿠키 (스레드 안전, 파일이 바뀌었을 때만 다시 읽음)
+
+    저장 형식:
+        {"site": "naver", "saved_at": 1700000000, "cookies": [{"name", "value", "domain", "expiry", ...}]}
+
+    Args:
+        site_id: 사이트 이름 (파일명 cookies/<site_id>_cookies.json)
+        required: 로그인 상태 판단에 필요한 쿠키 이름 (예: 네이버 NID_AUT, NID_SES)
+    """
+
+    def __init__(self, site_id: str, path: Optional[Path] = None, required: Iterable[str] = ()):
+        self.site_id = site_id
+        self.required = tuple(required)
+        # 세션 쿠키이므로 소유자만 읽을 수 있게 (임시 파일을 만들 때부터 0600)
+        self._store = JsonFileStore(path or COOKIE_DIR / f'{site_id}_cookies.json', mode=0o600)
+        self._lock = threading.Lock()
+        self._cookies: Optional[List[Dict]] = None
+        self._mtime: Optional[int] = None
+
+    @property
+    def path(self) -> Path:
+        return self._store.path
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _write(self, cookies: List[Dict]):
+        self._store.save({'site': self.site_id, 'saved_at': int(time.time()), 'cookies': cookies})
+        self._cookies = cookies
+        self._mtime = self._file_mtime()
+
+    def _all(self) -> List[Dict]:
+        mtime = self._file_mtime()
+        if self._cookies is None or mtime != self._mtime:
+            if mtime is not None:
+                self._cookies = [c for c in map(_normalize, self._store.load().get('cookies', [])) if c]
+                self._mtime = mtime
+            elif self._cookies is None:
+                self._cookies = []
+        return self._cookies
+
+    def save(self, cookies: Iterable[Dict]):
+        """쿠키 저장 (driver.get_cookies() 결과를 그대로 넘기면 됨)"""
+        with self._lock:
+            self._write([c for c in map(_normalize, cookies) if c])
+
+    def cookies(self, now: Optional[float] = None) -> List[Dict]:
+        """만료되지 않은 쿠키 (expiry 없는 세션 쿠키 포함)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return [dict(c) for c in self._all() if c.get('expiry', now + 1) > now]
+
+    def expires_at(self) -> Optional[int]:
+        """필수 쿠키 중 가장 먼저 만료되는 시각 (epoch 초, 만료 정보가 없으면 None)"""
+        with self._lock:
+            expiries = [c['expiry'] for c in self._all()
+                        if 'expiry' in c and (not self.required or c['name'] in self.required)]
+        return min(expiries) if expiries else None
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        """저장된 쿠키로 로그인 상태를 복원할 수 있는지 (필수 쿠키가 모두 만료 전인지)"""
+        names = {c['name'] for c in self.cookies(now)}
+        if not names:
+            return False
+        return all(name in names for name in self.required)
+
+    def apply_to_session(self, session) -> int:
+        """requests.Session 쿠키 저장소에 채움 (브라우저 없이 API 호출용). 넣은 개수 반환"""
+        cookies = self.cookies()
+        for cookie in cookies:
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False), expires=cookie.get('expiry'),
+            )
+        return len(cookies)
+
+    def apply_to_driver(self, driver) -> int:
+        """현재 페이지 도메인에 맞는 쿠키를 브라우저에 추가 (먼저 해당 사이트를 열어 둬야 함). 넣은 개수 반환"""
+        added = 0
+        for cookie in self.cookies():
+            try:
+                driver.add_cookie(cookie)
+                added += 1
+            except Exception:
+                # 현재 페이지와 도메인이 다른 쿠키 등은 추가 실패할 수 있음
+                pass
+        return added
+
+    def clear(self):
+        """저장된 쿠키 삭제 (세션이 만료된 것이 확인됐을 때)"""
+        with self._lock:
+            self._write([])
+
+
+_stores: Dict[str, CookieStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_cookie_store(site_id: str, required: Iterable[str] = ()) -> CookieStore:
+    """사이트별 공용 CookieStore (같은 프로세스에서 파일은 한 번만 읽음)"""
+    with _stores_lock:
+        store = _stores.get(site_id)
+        if store is None:
+            store = _stores[site_id] = CookieStore(site_id, required=required)
+        return store
@@ -0,0 +1,102 @@
+"""
+증분 크롤링 커서 모듈
+키워드/채널별로 마지막으로 본 영상의 게시 시각과 이미 처리한 영상 ID를 기록해
+다음 크롤링에서는 새로 올라온 영상만 상세 조회·분석하도록 합니다.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from modules.json_store import DATA_DIR, JsonFileStore
+
+try:
+    from config.settings import CRAWL_SETTINGS
+except ImportError:
+    CRAWL_SETTINGS = {}
+
+DEFAULT_CURSOR_FILE = DATA_DIR / 'youtube_crawl_cursors.json'
+
+
+def parse_published_at(value: str) -> Optional[datetime]:
+    """'2024-01-01T12:00:00Z' 형식 → UTC datetime (형식이 다르면 None)"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(timezone.utc)
+    except (AttributeError, ValueError):
+        return None
+
+
+class CrawlCursorStore:
+    """키워드/채널별 크롤링 커서
+
+    저장 형식:
+        {"keyword:나는솔로": {"last_published_at": "...",
+                              "seen": {"<video_id>": {"published_at": "...", "relevant": true}}}}
+    """
+
+    def __init__(self, path: Optional[Path] = None, overlap_minutes: Optional[int] = None,
+                 retention_days: Optional[int] = None):
+        self._store = JsonFileStore(path or DEFAULT_CURSOR_FILE)
+        self.overlap = timedelta(minutes=overlap_minutes if overlap_minutes is not None
+                                 else CRAWL_SETTINGS.get('cursor_overlap_minutes', 60))
+        self.retention = timedelta(days=retention_days if retention_days is not None
+                                   else CRAWL_SETTINGS.get('seen_retention_days', 7))
+
+    def published_after(self, key: str, window_start: datetime) -> datetime:
+        """조회 시작 시각: 기본 창(window_start)과 마지막 게시 시각(- overlap) 중 늦은 쪽"""
+        cursor = self._store.load().get(key) or {}
+        last = parse_published_at(cursor.get('last_published_at', ''))
+        if last is None:
+            return window_start
+        return max(window_start, last - self.overlap)
+
+    def split_new(self, key: str, videos: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """(처음 보는 영상, 이미 처리한 영상)으로 분리"""
+        seen = (self._store.load().get(key) or {}).get('seen', {})
+        new, known = [], []
+        for video in videos:
+            (known if video['video_id'] in seen else new).append(video)
+        return new, known
+
+    def known_ids(self, key: str) -> List[str]:
+        """보관 기간 안에 처리한 관련 영상 ID (조회수 갱신 대상)"""
+        seen = (self._store.load().get(key) or {}).get('seen', {})
+        return [video_id for video_id, entry in seen.items() if entry.get('relevant')]
+
+    def advance(self, key: str, videos: Iterable[Dict], relevant_ids: Iterable[str],
+                unseen: Iterable[Dict] = ()):
+        """이번에 본 영상을 기록하고 마지막 게시 시각을 갱신 (보관 기간이 지난 ID는 정리)
+
+        Args:
+            unseen: 검색됐지만 결과 개수 제한으로 잘린 영상 - 본 것으로 기록하지 않고,
+                    다음 실행 검색 구간에 다시 들어오도록 마지막 게시 시각도 이 영상들을 넘기지 않음
+        """
+        unseen_ids = {video['video_id'] for video in unseen}
+        videos = [video for video in videos if video['video_id'] not in unseen_ids]
+        relevant_ids = set(relevant_ids)
+        cutoff = datetime.now(timezone.utc) - self.retention
+        unseen_published = [p for p in (parse_published_at(v.get('published_at', '')) for v in unseen) if p]
+
+        def apply(data):
+            cursor = data.setdefault(key, {})
+            seen = cursor.setdefault('seen', {})
+            for video in videos:
+                entry = seen.setdefault(video['video_id'], {'published_at': video.get('published_at', '')})
+                entry['relevant'] = entry.get('relevant', False) or video['video_id'] in relevant_ids
+
+            published = [p for p in (parse_published_at(v.get('published_at', '')) for v in videos) if p]
+            last = parse_published_at(cursor.get('last_published_at', ''))
+            if published:
+                newest = max(published)
+                if unseen_published:
+                    newest = min(newest, min(unseen_published))
+                if last is None or newest > last:
+                    cursor['last_published_at'] = newest.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+            cursor['seen'] = {
+                video_id: entry for video_id, entry in seen.items()
+                if (parse_published_at(entry.get('published_at', '')) or cutoff) >= cutoff
+            }
+            return data
+
+        self._store.update(apply)
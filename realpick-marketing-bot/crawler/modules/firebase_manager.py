@@ -12,6 +12,19 @@ import sys
 from collections import Counter
 from typing import Optional
 
+from google.api_core.exceptions import AlreadyExists
+
+try:
+    from config.settings import VOTE_COUNTER_SETTINGS
+except ImportError:
+    VOTE_COUNTER_SETTINGS = {}
+
+
+def pick_document_id(mission_id, user_id):
+    """pickresult1 문서 ID (웹 앱 submitVote1과 같은 {userId}_{missionId} → 유저당 미션 1표를 DB가 보장)"""
+    return f"{user_id}_{mission_id}"
+
+
 class FirebaseManager:
     _instance = None
 
@@ -151,45 +164,110 @@ class FirebaseManager:
         except Exception as e:
             return False, str(e)
     
-    def create_notification_for_all_users(self, notification_data):
-        """모든 사용자에게 알림 생성 (알림 배지 표시용)"""
+    def create_notification_for_all_users(self, notification_data, fanout_id=None):
+        """
+        모든 사용자에게 알림 생성 (알림 배지 표시용)
+        사용자 수 제한 없이 커서 페이징 + 병렬 batch commit으로 생성합니다.
+        사용자별 문서가 필요 없는 전체 공지는 publish_broadcast (쓰기 1회)를 사용하세요.
+        Args:
+            notification_data: 알림 데이터
+            fanout_id: 이전에 중단/일부 실패한 팬아웃 ID (주면 이어서 진행)
+        Returns:
+            (성공 여부, 메시지)
+        """
         if not self.db:
             return False, "DB가 연결되지 않았습니다."
         try:
-            # 모든 사용자 가져오기
-            users_ref = self.db.collection('users').limit(1000)  # 최대 1000명
-            users = list(users_ref.stream())
-            
-            if not users:
+            report = self.fan_out_notification(notification_data, fanout_id=fanout_id)
+            if report['sent'] == 0 and report['failed'] == 0:
                 return False, "사용자가 없습니다."
-            
-            success_count = 0
-            error_count = 0
-            
-            # 각 사용자에게 알림 생성
-            for user_doc in users:
-                try:
-                    user_data = user_doc.to_dict()
-                    user_id = user_doc.id  # document ID가 userId
-                    
-                    # 각 사용자별 알림 데이터 생성
-                    user_notification = notification_data.copy()
-                    user_notification['userId'] = user_id
-                    user_notification['isRead'] = False  # 반드시 false
-                    user_notification['createdAt'] = firestore.SERVER_TIMESTAMP
-                    
-                    # notifications 컬렉션에 저장
-                    notif_ref = self.db.collection('notifications').document()
-                    notif_ref.set(user_notification)
-                    success_count += 1
-                except Exception as e:
-                    error_count += 1
-                    continue
-            
-            return True, f"{success_count}명에게 알림 생성 완료 (실패: {error_count}명)"
+            message = f"{report['sent']}명에게 알림 생성 완료 (실패: {report['failed']}명)"
+            if report['status'] != 'done':
+                message += f" - fanout_id={report['fanout_id']}로 다시 실행하면 실패분만 재시도합니다."
+            return True, message
+        except Exception as e:
+            return False, str(e)
+
+    def fan_out_notification(self, notification_data=None, fanout_id=None):
+        """
+        전체 사용자 알림 팬아웃 실행 (batch별 실패 보고 포함)
+        Returns:
+            NotificationFanout.run() 보고서 {'fanout_id', 'status', 'sent', 'failed', 'failed_batches', ...}
+        """
+        from modules.notification_fanout import NotificationFanout
+        return NotificationFanout(self.db).run(notification_data, fanout_id=fanout_id)
+
+    def publish_broadcast(self, notification_data):
+        """
+        전체 공지 알림 발행 (사용자별 문서 복사 없이 broadcastNotifications 문서 1개)
+        클라이언트는 notificationReads/{userId}의 읽음 워터마크와 비교해 안 읽은 공지를 표시합니다.
+        Returns:
+            (성공 여부, 공지 문서 ID 또는 오류 메시지)
+        """
+        if not self.db:
+            return False, "DB가 연결되지 않았습니다."
+        try:
+            doc_ref = self.db.collection('broadcastNotifications').document()
+            broadcast = dict(notification_data)
+            broadcast['createdAt'] = firestore.SERVER_TIMESTAMP
+            doc_ref.set(broadcast)
+            return True, doc_ref.id
+        except Exception as e:
+            return False, str(e)
+
+    def mark_broadcast_read(self, user_id, broadcast_id):
+        """공지 하나를 읽음 처리 (워터마크 이후 공지를 개별로 읽은 경우)"""
+        if not self.db:
+            return False, "DB가 연결되지 않았습니다."
+        try:
+            self.db.collection('notificationReads').document(user_id).set({
+                'readBroadcastIds': firestore.ArrayUnion([broadcast_id]),
+                'updatedAt': firestore.SERVER_TIMESTAMP
+            }, merge=True)
+            return True, "읽음 처리되었습니다."
         except Exception as e:
             return False, str(e)
 
+    def mark_all_broadcasts_read(self, user_id):
+        """지금까지의 공지를 모두 읽음 처리 (워터마크를 현재 시각으로 올리고 개별 읽음 목록 비움)"""
+        if not self.db:
+            return False, "DB가 연결되지 않았습니다."
+        try:
+            self.db.collection('notificationReads').document(user_id).set({
+                'broadcastReadAt': firestore.SERVER_TIMESTAMP,
+                'readBroadcastIds': [],
+                'updatedAt': firestore.SERVER_TIMESTAMP
+            }, merge=True)
+            return True, "모든 공지를 읽음 처리했습니다."
+        except Exception as e:
+            return False, str(e)
+
+    def get_unread_broadcasts(self, user_id, limit=20):
+        """사용자가 아직 읽지 않은 공지 (워터마크 이후 + 개별 읽음 제외, 최신순)"""
+        if not self.db:
+            return []
+        try:
+            read_doc = self.db.collection('notificationReads').document(user_id).get()
+            read_state = (read_doc.to_dict() or {}) if read_doc.exists else {}
+            read_ids = set(read_state.get('readBroadcastIds') or [])
+
+            query = self.db.collection('broadcastNotifications')
+            if read_state.get('broadcastReadAt'):
+                query = query.where('createdAt', '>', read_state['broadcastReadAt'])
+            query = query.order_by('createdAt', direction=firestore.Query.DESCENDING).limit(limit)
+
+            broadcasts = []
+            for doc in query.stream():
+                if doc.id in read_ids:
+                    continue
+                broadcast = doc.to_dict()
+                broadcast['_id'] = doc.id
+                broadcasts.append(broadcast)
+            return broadcasts
+        except Exception as e:
+            print(f"공지 조회 오류: {e}", file=sys.stderr)
+            return []
+
     def get_all_missions(self):
         """저장된 모든 미션 불러오기 (missions1 컬렉션에서, document ID 포함)"""
         if not self.db:
@@ -228,14 +306,15 @@ class FirebaseManager:
     
     def update_mission_votes(self, mission_id, option_index, user_id):
         """
-        미션 투표 업데이트 (2단계 방식)
-        1. 중복 확인 및 pickresult1에 투표 저장
-        2. missions1의 optionVoteCounts, participants, stats.totalVotes 증가
+        미션 투표 업데이트 (batch 1회)
+        - pickresult1/{userId}_{missionId} 문서를 create()로 저장 → 이미 있으면 DB가 거부 (중복 투표)
+        - 같은 batch에서 투표 샤드(missions1/{id}/voteShards)의 optionVoteCounts, participants, totalVotes 증가
+          → rollup_mission_votes가 missions1의 optionVoteCounts, participants, stats.totalVotes로 옮김
         """
         if not self.db:
             return False, "DB가 연결되지 않았습니다."
         try:
-            # 1단계: 미션 정보 가져오기 및 중복 확인
+            # 1단계: 미션 정보 가져오기 (선택지 확인)
             mission_ref = self.db.collection('missions1').document(mission_id)
             mission_doc = mission_ref.get()
             
@@ -244,15 +323,6 @@ class FirebaseManager:
             
             mission_data = mission_doc.to_dict() or {}
             
-            # 중복 투표 확인
-            existing_pick = list(self.db.collection('pickresult1')\
-                .where('missionId', '==', mission_id)\
-                .where('userId', '==', user_id)\
-                .limit(1).stream())
-            
-            if len(existing_pick) > 0:
-                return False, "이미 투표한 유저입니다."
-            
             # 선택지 유효성 확인
             options = mission_data.get('options', [])
             if option_index < 0 or option_index >= len(options):
@@ -260,7 +330,16 @@ class FirebaseManager:
             
             option_value = options[option_index]
             
-            # 2단계: pickresult1에 투표 저장 (choice 필드 사용)
+            # 고정 ID 도입 전(.add()로 임의 ID) 픽까지 확인 (기존 픽을 옮긴 뒤 설정으로 끔)
+            if VOTE_COUNTER_SETTINGS.get('legacy_duplicate_check', True):
+                existing_pick = list(self.db.collection('pickresult1')\
+                    .where('missionId', '==', mission_id)\
+                    .where('userId', '==', user_id)\
+                    .limit(1).stream())
+                if existing_pick:
+                    return False, "이미 투표한 유저입니다."
+            
+            # 2단계: 픽 저장 + 집계 증가를 한 batch로 (둘 다 되거나 둘 다 안 됨)
             pick_data = {
                 'missionId': mission_id,
                 'userId': user_id,
@@ -268,51 +347,21 @@ class FirebaseManager:
                 'createdAt': firestore.SERVER_TIMESTAMP,
                 'updatedAt': firestore.SERVER_TIMESTAMP
             }
-            self.db.collection('pickresult1').add(pick_data)
-            
-            # 3단계: missions1 통계 업데이트
-            # 먼저 최신 데이터를 다시 가져오기 (동시성 문제 방지)
-            mission_doc = mission_ref.get()
-            mission_data = mission_doc.to_dict() or {}
-            
-            # optionVoteCounts 전체 객체 가져와서 업데이트
-            option_vote_counts = mission_data.get('optionVoteCounts', {})
-            
-            # 옵션 텍스트를 키로 사용 (기존 시스템과 일치)
-            # 모든 선택지에 대해 초기화 (없으면 0으로)
-            for opt in options:
-                if opt not in option_vote_counts:
-                    option_vote_counts[opt] = 0
-            
-            # 현재 선택된 옵션의 카운트 증가
-            current_option_count = int(option_vote_counts.get(option_value, 0))
-            option_vote_counts[option_value] = current_option_count + 1
-            
-            print(f"✅ 투표 업데이트: {option_value} = {option_vote_counts[option_value]}", file=sys.stderr)
-            
-            # participants와 totalVotes 증가
-            current_participants = int(mission_data.get('participants', 0))
-            stats = mission_data.get('stats', {})
-            current_total_votes = int(stats.get('totalVotes', 0))
-            
-            # 업데이트 데이터 구성 (전체 optionVoteCounts 객체 저장)
-            update_data = {
-                'optionVoteCounts': option_vote_counts,
-                'participants': current_participants + 1,
-                'stats': {'totalVotes': current_total_votes + 1},
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            }
-            
-            mission_ref.update(update_data)
+            pick_ref = self.db.collection('pickresult1').document(pick_document_id(mission_id, user_id))
+            shard_ref, shard_data = self.vote_counter.increment_write(mission_id, option_value)
+            
+            batch = self.db.batch()
+            batch.create(pick_ref, pick_data)
+            batch.set(shard_ref, shard_data, merge=True)
+            try:
+                batch.commit()
+            except AlreadyExists:
+                return False, "이미 투표한 유저입니다."
             
             print(f"✅ 투표 완료!", file=sys.stderr)
             print(f"   미션 ID: {mission_id}", file=sys.stderr)
             print(f"   유저 ID: {user_id}", file=sys.stderr)
             print(f"   선택지: {option_index} ({option_value})", file=sys.stderr)
-            print(f"   선택지 투표수: {current_option_count}표 → {option_vote_counts[option_value]}표", file=sys.stderr)
-            print(f"   총 참여자: {current_participants}명 → {current_participants + 1}명", file=sys.stderr)
-            print(f"   총 투표수: {current_total_votes}표 → {current_total_votes + 1}표", file=sys.stderr)
-            print(f"   전체 optionVoteCounts: {option_vote_counts}", file=sys.stderr)
             
             return True, f"투표 완료: {option_value}"
             
@@ -322,6 +371,38 @@ class FirebaseManager:
             traceback.print_exc(file=sys.stderr)
             return False, f"투표 실패: {str(e)}"
     
+    @property
+    def vote_counter(self):
+        """미션 투표 샤드 카운터 (처음 사용할 때 생성)"""
+        if getattr(self, '_vote_counter', None) is None:
+            from modules.vote_counter import ShardedVoteCounter
+            self._vote_counter = ShardedVoteCounter(self.db)
+        return self._vote_counter
+
+    def rollup_mission_votes(self, mission_ids=None):
+        """
+        투표 샤드 값을 missions1 집계로 롤업
+        Args:
+            mission_ids: 롤업할 미션 ID 목록 (None이면 롤업 대기 중인 미션 전체)
+        Returns:
+            {'missions', 'votes', 'failed'} 보고서
+        """
+        if not self.db:
+            return {'missions': 0, 'votes': 0, 'failed': {}, 'error': "DB가 연결되지 않았습니다."}
+        try:
+            return self.vote_counter.rollup_all(mission_ids)
+        except Exception as e:
+            return {'missions': 0, 'votes': 0, 'failed': {}, 'error': str(e)}
+
+    def get_mission_vote_totals(self, mission_id):
+        """롤업 전 샤드 값까지 더한 실시간 투표 집계"""
+        if not self.db:
+            return None
+        try:
+            return self.vote_counter.totals(mission_id)
+        except Exception:
+            return None
+
     def get_bot_picks(self, limit=100):
         """가짜 유저들의 픽 조회 (pickresult1 컬렉션에서)"""
         if not self.db:
@@ -350,45 +431,100 @@ class FirebaseManager:
         except Exception as e:
             return []
     
+    @staticmethod
+    def _count(query, transaction=None):
+        """
+        쿼리 결과 개수 (집계 쿼리 count() - 문서를 내려받지 않음)
+        count()가 없는 예전 SDK나 집계를 지원하지 않는 환경이면 ID만 받아 세기
+        """
+        if hasattr(query, 'count'):
+            try:
+                result = query.count(alias='count').get(transaction=transaction)
+                return int(result[0][0].value)
+            except Exception as e:
+                print(f"[Firebase] count() 집계 실패 - 문서 조회로 대체: {e}", file=sys.stderr)
+        return sum(1 for _ in query.select([]).stream(transaction=transaction))
+
     def get_mission_pick_count(self, mission_id):
         """특정 미션의 실제 픽 개수 조회 (pickresult1 컬렉션에서)"""
         if not self.db:
             return 0
         try:
             picks_ref = self.db.collection('pickresult1').where('missionId', '==', mission_id)
-            picks = list(picks_ref.stream())
-            return len(picks)
+            return self._count(picks_ref)
         except Exception as e:
             return 0
 
+    @staticmethod
+    def _tally_picks(picks_ref, options, text_mission=False, transaction=None):
+        """
+        픽 수와 선택지별 투표 수 (선택 필드만 받아 한 번에 세기)
+        웹 앱 updateOptionVoteCounts(lib/firebase/missions.ts)와 같은 규칙:
+          - 선택값은 choice 또는 selectedOption (문자열 또는 복수 선택 배열)
+          - 선택지와 앞뒤 공백/대소문자를 무시하고 비교, 주관식(text) 미션은 입력값 그대로 셈
+        Returns:
+            (픽 수, {선택지: 투표 수})
+        """
+        by_normalized = {}
+        for opt in options:
+            by_normalized.setdefault(opt.strip().lower(), opt)
+        counts = Counter() if text_mission else Counter({opt: 0 for opt in options})
+        participants = 0
+        for doc in picks_ref.select(['choice', 'selectedOption']).stream(transaction=transaction):
+            participants += 1
+            data = doc.to_dict() or {}
+            selected = data.get('choice') or data.get('selectedOption')
+            if selected is None:
+                continue
+            for opt in (selected if isinstance(selected, list) else [str(selected)]):
+                if not opt or not isinstance(opt, str):
+                    continue
+                matched = opt if text_mission else by_normalized.get(opt.strip().lower())
+                if matched is not None:
+                    counts[matched] += 1
+        return participants, counts
+
     def recount_mission_votes(self, mission_id):
-        """pickresult1 기준으로 미션의 투표 집계 재계산"""
+        """
+        pickresult1 기준으로 미션의 투표 집계 재계산 (선택 필드만 한 번 조회)
+        픽 조회와 샤드 정리를 한 트랜잭션에서 처리 - 재계산에 포함된 샤드 값만 빼므로
+        그 사이 들어온 투표가 사라지거나 두 번 세어지지 않음
+        """
         if not self.db:
             return False
         try:
-            picks_ref = self.db.collection('pickresult1').where('missionId', '==', mission_id)
-            picks = list(picks_ref.stream())
-            if not picks:
-                return True
+            from modules.vote_counter import sanitize_field_key
 
-            counts = Counter()
-            for doc in picks:
-                data = doc.to_dict()
-                idx = str(data.get('optionIndex', ''))
-                counts[idx] += 1
+            picks_ref = self.db.collection('pickresult1').where('missionId', '==', mission_id)
+            mission = self.get_mission(mission_id) or {}
+            options = [str(opt) for opt in mission.get('options', [])]
+            text_mission = mission.get('submissionType') == 'text'
+            mission_ref = self.db.collection('missions1').document(mission_id)
 
-            participants = len(picks)
-            total_votes = sum(counts.values())
+            @firestore.transactional
+            def recount(transaction):
+                participants, option_counts = self._tally_picks(picks_ref, options, text_mission, transaction)
+                if not participants:
+                    return None
+                counts = {sanitize_field_key(opt): n for opt, n in option_counts.items()}
+                # 웹 앱과 같이 총 투표 수는 픽 수 (복수 선택도 1표)
+                total_votes = participants
+                # 롤업 전 샤드 값은 위 재계산에 이미 포함됨 → 읽은 만큼만 샤드에서 뺌
+                self.vote_counter.drain(transaction, mission_id)
+                transaction.update(mission_ref, {
+                    'optionVoteCounts': counts,
+                    'participants': participants,
+                    'stats': {'totalVotes': total_votes},
+                    'updatedAt': firestore.SERVER_TIMESTAMP
+                })
+                return counts, participants, total_votes
 
-            mission_ref = self.db.collection('missions1').document(mission_id)
-            mission_ref.update({
-                'optionVoteCounts': dict(counts),
-                'participants': participants,
-                'stats': {'totalVotes': total_votes},
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            })
+            result = recount(self.db.transaction())
+            if result is None:
+                return True
+            counts, participants, total_votes = result
             print(f"🔄 미션 재집계 완료: {mission_id}")
-            print(f"   optionVoteCounts: {dict(counts)}")
+            print(f"   optionVoteCounts: {counts}")
             print(f"   참여자: {participants}명, 총 투표: {total_votes}표")
             return True
         except Exception:
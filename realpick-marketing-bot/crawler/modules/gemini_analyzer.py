@@ -1,34 +1,78 @@
 import google.generativeai as genai
+import asyncio
 import json
-import re
+import random
 import sys
+import threading
 import time
-from typing import Optional
+from concurrent.futures import Future
+from typing import Awaitable, Dict, List, Optional, Tuple
+
+from modules.json_response import (
+    MISSIONS_SCHEMA,
+    aparse_with_fix,
+    get_parse_metrics,
+    is_complete_mission,
+    json_generation_config,
+    packed_missions_schema,
+    parse_json_response,
+    parse_with_fix,
+)
+from modules.prompt_cache import get_prompt_cache
+from modules.rate_limiter import estimate_tokens, get_gemini_limiter
+from modules.show_matcher import get_show_matcher, get_user_keyword_matcher
+from modules.transcript_condenser import condense_transcript, title_terms
+
+try:
+    from config.settings import AI_SETTINGS
+except ImportError:
+    AI_SETTINGS = {}
+
+# 미션 유형/작성 지침 (단일 영상 프롬프트와 여러 영상 묶음 프롬프트가 공유)
+MISSION_GUIDE = """[리얼픽 미션 유형 가이드]
+        1. 예측 픽 (kind: PREDICT) - "정답이 있는 게임"
+           - 목적: 방송의 결과나 출연자의 선택을 맞히는 것.
+           - 질문 예시: "~할까요?", "누가 선택될까요?", "최종 우승자는 누구?"
+           - 유형: Binary(2개 선택지), Multi(3~5개 선택지)
+           - **핵심 원칙: '누구'를 묻는 질문에는 반드시 구체적인 출연자 이름이나 대상이 답변 후보(options)가 되어야 합니다.**
+
+        2. 공감 픽 (kind: MAJORITY) - "정답 없는 의견"
+           - 목적: 시청자들의 선호도, 트렌드, 여론 수집.
+           - 질문 예시: "가장 응원하는 커플은?", "누구의 대처가 더 성숙했나요?"
+           - **핵심 원칙: 질문에서 묻는 대상과 답변 항목이 논리적으로 100% 일치해야 합니다.**
+
+        [중요: 미션 생성 및 논리 지침]
+        - **미션 제목 길이**: 미션 제목은 반드시 **20자에서 25자 사이**로 상세하고 흥미진진하게 작성하세요. (예: "영철은 영자에게 데이트 신청을 할까?" 대신 "영철은 과연 영자에게 직진하며 데이트 신청을 하게 될까요?")
+        - **질문-답변 일치**: 질문이 "누구일까요?"인데 답변이 "놀라운 반전!" 같은 문장이면 안 됩니다. 반드시 "영수", "영숙" 등 구체적인 이름이 나와야 합니다.
+        - **구체적 이름 추출**: 반드시 위 '자막 요약'에 등장하는 출연진 이름만 선택지로 사용하세요. 자막에 없는 이름은 사용하지 마세요.
+        - **어그로성 문장 금지**: 선택지에 감탄사나 추상적인 문장을 넣지 마세요. 유저가 명확하게 대상을 고를 수 있게 하세요.
+        - **다양성**: 영상 내용을 분석하여 가장 흥미로운 1개의 미션을 생성하되, 매번 똑같은 형태가 반복되지 않도록 하세요."""
 
 class GeminiAnalyzer:
     def __init__(self, api_key):
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model_name = 'gemini-2.0-flash'
+        self.model = genai.GenerativeModel(self.model_name)
+        # 같은 프롬프트 재분석 시 API 호출 없이 이전 응답 재사용
+        self.response_cache = get_prompt_cache()
+        # 분당 요청/토큰 한도 (RecruitAnalyzer 등 다른 호출자와 공유)
+        self.limiter = get_gemini_limiter()
     
-    def _call_with_retry(self, prompt: str, max_retries: int = 10, base_delay: float = 5.0) -> Optional[str]:
-        """재시도 로직이 포함된 Gemini API 호출 (429 에러 처리)"""
+    def _call_with_retry(self, prompt: str, max_retries: int = 10, base_delay: float = 5.0,
+                         generation_config: Optional[dict] = None) -> Optional[str]:
+        """재시도 로직이 포함된 Gemini API 호출 (429 에러 처리)
+        호출 전 공용 rate limiter에서 요청/토큰을 받아 한도 안에서만 호출"""
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(prompt)
+                self.limiter.acquire(estimate_tokens(prompt))
+                response = self.model.generate_content(prompt, generation_config=generation_config)
                 return response.text.strip()
             except Exception as e:
                 error_str = str(e)
                 # 429 에러인 경우에만 재시도
-                if "429" in error_str or "Resource exhausted" in error_str:
+                if _is_rate_limited(error_str):
                     if attempt < max_retries - 1:
-                        # Exponential backoff with jitter
-                        import random
-                        delay = min(base_delay * (2 ** attempt), 60.0) # 최대 60초 대기
-                        jitter = random.uniform(0, 1.0)
-                        final_delay = delay + jitter
-                        
-                        print(f"⚠️ Gemini API 429 에러 발생. {final_delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})...", file=sys.stderr)
-                        time.sleep(final_delay)
+                        self._back_off(attempt, max_retries, base_delay)
                         continue
                     else:
                         print(f"❌ Gemini API 429 에러: 최대 재시도 횟수 초과. {error_str}", file=sys.stderr)
@@ -40,6 +84,55 @@ class GeminiAnalyzer:
         
         return None
 
+    def _back_off(self, attempt: int, max_retries: int, base_delay: float):
+        """429 재시도 대기 시간 계산 후 공용 limiter에 알림 (재시도 시 acquire에서 대기)"""
+        # Exponential backoff with jitter
+        delay = min(base_delay * (2 ** attempt), 60.0) # 최대 60초 대기
+        jitter = random.uniform(0, 1.0)
+        final_delay = delay + jitter
+        
+        print(f"⚠️ Gemini API 429 에러 발생. {final_delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})...", file=sys.stderr)
+        # 다른 스레드/프로세스도 같은 시간 동안 호출을 멈추도록 limiter에 알림
+        self.limiter.penalize(final_delay)
+
+    async def _acall_with_retry(self, prompt: str, max_retries: int = 10, base_delay: float = 5.0,
+                                generation_config: Optional[dict] = None,
+                                deadline: Optional[float] = None) -> Optional[str]:
+        """_call_with_retry의 비동기 버전 (generate_content_async)
+        호출마다 AI_SETTINGS['call_timeout_seconds'] 제한, deadline(time.monotonic 기준)이 지나면 재시도 없이 None.
+        작업이 취소되면 진행 중인 호출도 함께 취소됨"""
+        call_timeout = float(AI_SETTINGS.get('call_timeout_seconds', 60))
+        for attempt in range(max_retries):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                print("⏱️ Gemini 호출 시간 예산 초과: 재시도하지 않습니다.", file=sys.stderr)
+                return None
+            try:
+                # 토큰 버킷 대기는 블로킹이므로 스레드에서 (남은 시간까지만 대기)
+                await asyncio.to_thread(self.limiter.acquire, estimate_tokens(prompt), remaining)
+            except TimeoutError:
+                print("⏱️ Gemini 호출 한도 대기 중 시간 예산 초과", file=sys.stderr)
+                return None
+            timeout = call_timeout if deadline is None else min(call_timeout, deadline - time.monotonic())
+            try:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(prompt, generation_config=generation_config),
+                    timeout=max(timeout, 0.1),
+                )
+                return response.text.strip()
+            except asyncio.TimeoutError:
+                print(f"⏱️ Gemini 응답 시간 초과 ({timeout:.0f}초, {attempt + 1}/{max_retries})", file=sys.stderr)
+                continue
+            except Exception as e:
+                error_str = str(e)
+                if _is_rate_limited(error_str) and attempt < max_retries - 1:
+                    self._back_off(attempt, max_retries, base_delay)
+                    continue
+                print(f"❌ Gemini API 오류: {error_str}", file=sys.stderr)
+                return None
+        
+        return None
+
     def generate_viral_comment(self, post_content: str, post_title: str) -> str:
         """커뮤니티 게시글 내용을 분석하여 자연스러운 바이럴 댓글 생성"""
         prompt = f"""
@@ -68,101 +161,105 @@ class GeminiAnalyzer:
             return result
         return "댓글 생성 실패 (API 제한 초과)"
 
-    def analyze_with_transcript(self, video_info: dict, transcript: str) -> dict:
-        """영상 정보와 자막을 분석하여 미션 생성"""
-        
+    @staticmethod
+    def _condense(video_info: dict, transcript: str, max_chars: Optional[int] = None) -> str:
+        """프롬프트용 자막 (출연진/프로그램 언급이 많은 구간 위주로 max_chars 이내)"""
+        condensed = condense_transcript(transcript, max_chars, terms=title_terms(video_info.get('title', '')))
+        if len(condensed) < len(transcript):
+            print(f"[Gemini] 자막 압축 {len(transcript)} → {len(condensed)}자 (video_id: {video_info.get('video_id', '')})",
+                  file=sys.stderr)
+        return condensed
+
+    def _classify_show(self, video_info: dict, transcript: str):
+        """영상의 프로그램 (category, showId) 분류 (transcript는 압축된 자막)"""
         # 크롤링 시 선택한 프로그램 키워드가 있으면 우선 사용 (자막과 일치하는 프로그램 분류)
         user_keyword = (video_info.get('keyword') or '').strip().lower()
-        full_text = f"{user_keyword} {video_info.get('title', '')} {video_info.get('description', '')} {transcript[:3000]}".lower()
+        full_text = f"{user_keyword} {video_info.get('title', '')} {video_info.get('description', '')} {transcript}".lower()
         
         category = "LOVE"  # 기본값
         showId = "nasolo"  # 기본값
         
         # 1) 사용자가 선택한 키워드로 먼저 매핑 (솔로지옥 영상인데 나는솔로로 잡히는 것 방지)
         if user_keyword:
-            if any(kw in user_keyword for kw in ['솔로지옥', 'single\'s inferno', 'singles inferno']):
-                category, showId = "LOVE", "solojihuk5"
-            elif any(kw in user_keyword for kw in ['합숙맞선', '합숙 맞선']):
-                category, showId = "LOVE", "habsuk-matseon"
-            elif any(kw in user_keyword for kw in ['나솔사계', '나는 솔로 그 후', '사랑은 계속된다']):
-                category, showId = "LOVE", "nasolsagye"
-            elif any(kw in user_keyword for kw in ['나는솔로', '나는 솔로', 'i am solo', '나솔']):
-                category, showId = "LOVE", "nasolo"
-            elif any(kw in user_keyword for kw in ['환승연애', '환연', '환글']):
-                category, showId = "LOVE", "hwanseung4"
-            elif any(kw in user_keyword for kw in ['돌싱글즈', '돌싱']):
-                category, showId = "LOVE", "dolsingles6"
-            elif any(kw in user_keyword for kw in ['끝사랑']):
-                category, showId = "LOVE", "kkeut-sarang"
-            elif any(kw in user_keyword for kw in ['연애남매']):
-                category, showId = "LOVE", "yeonae-nammae"
-            elif any(kw in user_keyword for kw in ['골때녀', '골 때리는', '골때리는']):
-                category, showId = "VICTORY", "goal-girls-8"
-            elif any(kw in user_keyword for kw in ['최강야구']):
-                category, showId = "VICTORY", "choegang-yagu-2025"
-            elif any(kw in user_keyword for kw in ['흑백요리사']):
-                category, showId = "VICTORY", "culinary-class-wars2"
-            elif any(kw in user_keyword for kw in ['피의게임', '피의 게임']):
-                category, showId = "VICTORY", "blood-game3"
-            elif any(kw in user_keyword for kw in ['미스터트롯', '미스트롯', '현역가왕', '유니버스리그', '쇼미더머니']):
-                category, showId = "STAR", "mr-trot3"  # STAR는 하위 매핑 생략
+            hit = get_user_keyword_matcher().best(user_keyword)
+            if hit:
+                category, showId = hit['category'], hit['show_id']
         
         # 2) 키워드가 없거나 매칭 실패 시 full_text(제목+설명+자막) 기반 매핑 (더 구체적인 프로그램 먼저)
         if not user_keyword or (showId == "nasolo" and "솔로" in user_keyword):
-            # 1. LOVE - 구체적 프로그램 먼저 (솔로지옥이 나는솔로보다 먼저)
-            if any(kw in full_text for kw in ['합숙맞선', '합숙 맞선']):
-                category, showId = "LOVE", "habsuk-matseon"
-            elif any(kw in full_text for kw in ['나솔사계', '나는 솔로 그 후', '사랑은 계속된다']):
-                category, showId = "LOVE", "nasolsagye"
-            elif any(kw in full_text for kw in ['솔로지옥', 'single\'s inferno', 'singles inferno']):
-                category, showId = "LOVE", "solojihuk5"
-            elif any(kw in full_text for kw in ['나는솔로', '나는 솔로', 'i am solo', '나솔']):
-                category, showId = "LOVE", "nasolo"
-            elif any(kw in full_text for kw in ['환승연애', '환연', '환글']):
-                category, showId = "LOVE", "hwanseung4"
-            elif any(kw in full_text for kw in ['돌싱글즈', '돌싱']):
-                category, showId = "LOVE", "dolsingles6"
-            elif any(kw in full_text for kw in ['끝사랑']):
-                category, showId = "LOVE", "kkeut-sarang"
-            elif any(kw in full_text for kw in ['연애남매']):
-                category, showId = "LOVE", "yeonae-nammae"
-            else:
-                # 2. VICTORY 카테고리
-                if any(kw in full_text for kw in ['골때녀', '골 때리는 그녀들', '골때리는', 'fc탑걸', '발라드림', '액셔니스타', '구척장신', '개벤져스', '월드클라쓰']):
-                    category, showId = "VICTORY", "goal-girls-8"
-                elif any(kw in full_text for kw in ['최강야구', '최강 몬스터즈']):
-                    category, showId = "VICTORY", "choegang-yagu-2025"
-                elif any(kw in full_text for kw in ['강철부대']):
-                    category, showId = "VICTORY", "steel-troops-w"
-                elif any(kw in full_text for kw in ['피의게임', '피의 게임']):
-                    category, showId = "VICTORY", "blood-game3"
-                elif any(kw in full_text for kw in ['대학전쟁']):
-                    category, showId = "VICTORY", "univ-war2"
-                elif any(kw in full_text for kw in ['흑백요리사']):
-                    category, showId = "VICTORY", "culinary-class-wars2"
-                elif any(kw in full_text for kw in ['뭉쳐야찬다', '뭉쳐야 찬다', '뭉쳐야']):
-                    category, showId = "VICTORY", "kick-together3"
-                elif any(kw in full_text for kw in ['무쇠소녀단', '무쇠소녀']):
-                    category, showId = "VICTORY", "iron-girls"
-                elif any(kw in full_text for kw in ['노엑싯게임룸', '노엑싯']):
-                    category, showId = "VICTORY", "no-exit-gameroom"
-                # 3. STAR 카테고리
-                elif any(kw in full_text for kw in ['쇼미더머니', 'show me the money', 'smtm', '쇼미']):
-                    category, showId = "STAR", "show-me-the-money-12"
-                elif any(kw in full_text for kw in ['미스터트롯']):
-                    category, showId = "STAR", "mr-trot3"
-                elif any(kw in full_text for kw in ['미스트롯']):
-                    category, showId = "STAR", "mistrot4"
-                elif any(kw in full_text for kw in ['현역가왕']):
-                    category, showId = "STAR", "active-king2"
-                elif any(kw in full_text for kw in ['프로젝트7', 'project 7', '프로젝트']):
-                    category, showId = "STAR", "project7"
-                elif any(kw in full_text for kw in ['유니버스리그', '유니버스 리그']):
-                    category, showId = "STAR", "universe-league"
-                elif any(kw in full_text for kw in ['싱어게인']):
-                    category, showId = "STAR", "sing-again"
-                elif any(kw in full_text for kw in ['랩퍼블릭']):
-                    category, showId = "STAR", "rap-public"
+            hit = get_show_matcher().best(full_text)
+            if hit:
+                category, showId = hit['category'], hit['show_id']
+        return category, showId
+
+    def _cached_json(self, prompt: str, label: str) -> Optional[dict]:
+        """캐시된 응답 JSON (없거나 파싱 안 되면 None)"""
+        cached = self.response_cache.get(self.model_name, prompt)
+        if not cached:
+            return None
+        parsed, _ = parse_json_response(cached)
+        if not isinstance(parsed, dict):
+            return None
+        print(f"[Gemini] 캐시된 응답 사용 ({label})", file=sys.stderr)
+        get_parse_metrics().record('mission', 'cache', 1, estimate_tokens(prompt))
+        return parsed
+
+    def _accept_json(self, prompt: str, label: str, result: str, parsed, outcome: str,
+                     cacheable=None) -> Optional[dict]:
+        """파싱 결과 확인 후 (cacheable이 있으면 그 검사도 통과한 경우만) 정리된 JSON으로 캐시
+        복구/수정한 응답은 잘린 뒷부분이 빠졌을 수 있어 이번 요청에만 쓰고 캐시하지 않음"""
+        if not isinstance(parsed, dict):
+            print(f"❌ Gemini JSON 파싱 오류 ({label}): {result[:200]}", file=sys.stderr)
+            return None
+        if outcome in ('repaired', 'fixed'):
+            print(f"[Gemini] 깨진 JSON 응답 복구 ({outcome}, {label})", file=sys.stderr)
+            return parsed
+        if cacheable is None or cacheable(parsed):
+            self.response_cache.set(self.model_name, prompt, json.dumps(parsed, ensure_ascii=False))
+        return parsed
+
+    def _generate_json(self, prompt: str, label: str, schema: Optional[dict] = None,
+                       cacheable=None) -> Optional[dict]:
+        """캐시 우선으로 프롬프트를 JSON 모드(schema)로 실행해 응답 JSON 객체 반환
+        파싱이 안 되면 잘린 JSON 복구 → 짧은 수정 요청 순으로 살려 전체 재생성을 피함"""
+        cached = self._cached_json(prompt, label)
+        if cached is not None:
+            return cached
+        
+        config = json_generation_config(schema)
+        result = self._call_with_retry(prompt, generation_config=config)
+        if not result:
+            return None
+        
+        parsed, outcome = parse_with_fix(
+            result, 'mission', estimate_tokens(prompt),
+            fix_call=lambda fix_prompt: self._call_with_retry(fix_prompt, max_retries=3, generation_config=config),
+        )
+        return self._accept_json(prompt, label, result, parsed, outcome, cacheable)
+
+    async def _agenerate_json(self, prompt: str, label: str, schema: Optional[dict] = None,
+                              cacheable=None, deadline: Optional[float] = None) -> Optional[dict]:
+        """_generate_json의 비동기 버전 (deadline까지만 호출/수정 요청)"""
+        cached = self._cached_json(prompt, label)
+        if cached is not None:
+            return cached
+        
+        config = json_generation_config(schema)
+        result = await self._acall_with_retry(prompt, generation_config=config, deadline=deadline)
+        if not result:
+            return None
+        
+        parsed, outcome = await aparse_with_fix(
+            result, 'mission', estimate_tokens(prompt),
+            fix_call=lambda fix_prompt: self._acall_with_retry(fix_prompt, max_retries=3, generation_config=config,
+                                                               deadline=deadline),
+        )
+        return self._accept_json(prompt, label, result, parsed, outcome, cacheable)
+
+    def _mission_prompt(self, video_info: dict, transcript: str) -> str:
+        """영상 1개 미션 생성 프롬프트"""
+        transcript = self._condense(video_info, transcript)
+        category, showId = self._classify_show(video_info, transcript)
         
         prompt = f"""
         당신은 예능 프로그램 전문 마케팅 분석가입니다. 
@@ -173,29 +270,12 @@ class GeminiAnalyzer:
         2. **프로그램 일치**: 자막 내용이 '솔로지옥'이면 솔로지옥 출연진/상황으로, '나는솔로'면 나는솔로 출연진/상황으로만 미션을 만드세요. 다른 프로그램 내용을 섞지 마세요.
         3. 프로그램 카테고리({category})와 ID({showId})는 참고용입니다. 자막 내용과 다르면, 자막에 나온 프로그램·출연진을 기준으로 미션만 생성하면 됩니다.
 
-        [리얼픽 미션 유형 가이드]
-        1. 예측 픽 (kind: PREDICT) - "정답이 있는 게임"
-           - 목적: 방송의 결과나 출연자의 선택을 맞히는 것.
-           - 질문 예시: "~할까요?", "누가 선택될까요?", "최종 우승자는 누구?"
-           - 유형: Binary(2개 선택지), Multi(3~5개 선택지)
-           - **핵심 원칙: '누구'를 묻는 질문에는 반드시 구체적인 출연자 이름이나 대상이 답변 후보(options)가 되어야 합니다.**
-
-        2. 공감 픽 (kind: MAJORITY) - "정답 없는 의견"
-           - 목적: 시청자들의 선호도, 트렌드, 여론 수집.
-           - 질문 예시: "가장 응원하는 커플은?", "누구의 대처가 더 성숙했나요?"
-           - **핵심 원칙: 질문에서 묻는 대상과 답변 항목이 논리적으로 100% 일치해야 합니다.**
-
-        [중요: 미션 생성 및 논리 지침]
-        - **미션 제목 길이**: 미션 제목은 반드시 **20자에서 25자 사이**로 상세하고 흥미진진하게 작성하세요. (예: "영철은 영자에게 데이트 신청을 할까?" 대신 "영철은 과연 영자에게 직진하며 데이트 신청을 하게 될까요?")
-        - **질문-답변 일치**: 질문이 "누구일까요?"인데 답변이 "놀라운 반전!" 같은 문장이면 안 됩니다. 반드시 "영수", "영숙" 등 구체적인 이름이 나와야 합니다.
-        - **구체적 이름 추출**: 반드시 위 '자막 요약'에 등장하는 출연진 이름만 선택지로 사용하세요. 자막에 없는 이름은 사용하지 마세요.
-        - **어그로성 문장 금지**: 선택지에 감탄사나 추상적인 문장을 넣지 마세요. 유저가 명확하게 대상을 고를 수 있게 하세요.
-        - **다양성**: 영상 내용을 분석하여 가장 흥미로운 1개의 미션을 생성하되, 매번 똑같은 형태가 반복되지 않도록 하세요.
+        {MISSION_GUIDE}
 
         [영상 정보]
         - 제목: {video_info.get('title', '')}
         - 설명: {video_info.get('description', '없음')}
-        - 자막 요약: {transcript[:3000]}... (중략)
+        - 자막 요약: {transcript}... (중략)
         - 프로그램 카테고리: {category}
         - 프로그램 ID: {showId}
 
@@ -225,16 +305,208 @@ class GeminiAnalyzer:
          예: '무조건 직진이다!' / '철벽 수비 예상..' / '아직은 간보는 중?')
         """
         
-        result = self._call_with_retry(prompt)
-        if not result:
-            return None
+        return prompt
+
+    def analyze_with_transcript(self, video_info: dict, transcript: str) -> dict:
+        """영상 정보와 자막을 분석하여 미션 생성"""
+        label = f"video_id: {video_info.get('video_id', '')}"
+        return _complete_result(self._generate_json(self._mission_prompt(video_info, transcript), label,
+                                                    schema=MISSIONS_SCHEMA, cacheable=_has_complete_missions),
+                                label)
+
+    async def aanalyze_with_transcript(self, video_info: dict, transcript: str,
+                                       deadline: Optional[float] = None) -> Optional[dict]:
+        """analyze_with_transcript의 비동기 버전 (deadline: time.monotonic 기준 마감 시각)"""
+        label = f"video_id: {video_info.get('video_id', '')}"
+        return _complete_result(await self._agenerate_json(self._mission_prompt(video_info, transcript), label,
+                                                           schema=MISSIONS_SCHEMA, cacheable=_has_complete_missions,
+                                                           deadline=deadline),
+                                label)
+
+    def _packed_prompt(self, entries: List[Dict]) -> str:
+        """여러 영상을 한 번에 분석하는 프롬프트 (지침은 한 번만, 결과는 video_id별 JSON)"""
+        blocks = []
+        for index, entry in enumerate(entries, 1):
+            info = entry['video_info']
+            blocks.append(f"""[영상 {index}]
+        - video_id: {info['video_id']}
+        - 제목: {info.get('title', '')}
+        - 설명: {info.get('description', '없음')}
+        - 자막 요약: {entry['condensed']}... (중략)
+        - 프로그램 카테고리: {entry['category']}
+        - 프로그램 ID: {entry['showId']}""")
+        videos_text = "\n\n        ".join(blocks)
         
-        try:
-            # JSON 추출
-            json_match = re.search(r'\{.*\}', result, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            return None
-        except json.JSONDecodeError as e:
-            print(f"❌ Gemini JSON 파싱 오류: {e}", file=sys.stderr)
-            return None
+        return f"""
+        당신은 예능 프로그램 전문 마케팅 분석가입니다. 
+        아래 {len(entries)}개 영상 각각에 대해 미션을 생성하세요. **각 영상의 미션은 반드시 그 영상의 '자막 요약'에 적힌 내용만을 기준으로 하세요.** 제목·설명·가이드 프로그램명은 참고용이며, 자막에 없는 프로그램·출연진·상황은 사용하지 마세요.
+
+        [필수 원칙]
+        1. **자막 우선**: 미션 제목, 선택지, 출연진 이름은 모두 해당 영상 자막에 실제로 등장한 내용만 사용하세요. 다른 영상의 출연진이나 상황을 섞지 마세요.
+        2. **프로그램 일치**: 자막 내용이 '솔로지옥'이면 솔로지옥 출연진/상황으로, '나는솔로'면 나는솔로 출연진/상황으로만 미션을 만드세요.
+        3. 영상별 프로그램 카테고리와 ID는 참고용입니다. 자막 내용과 다르면, 자막에 나온 프로그램·출연진을 기준으로 미션만 생성하면 됩니다.
+
+        {MISSION_GUIDE}
+
+        {videos_text}
+
+        [출력 형식 (JSON)]
+        반드시 아래 형식을 지켜 JSON으로만 출력하세요. "videos"의 키는 위 영상들의 video_id이며, 모든 영상이 빠짐없이 있어야 합니다:
+        {{
+          "videos": {{
+            "<video_id>": {{
+              "missions": [
+                {{
+                  "title": "미션 제목",
+                  "description": "미션 참여 독려 문구 (유머러스하고 재치있게)",
+                  "kind": "PREDICT 또는 MAJORITY",
+                  "form": "binary 또는 multiple",
+                  "options": ["재치있는 보기1", "재치있는 보기2", ...],
+                  "category": "해당 영상의 프로그램 카테고리",
+                  "showId": "해당 영상의 프로그램 ID"
+                }}
+              ]
+            }}
+          }}
+        }}
+        
+        (단순한 '예/아니오' 대신 영상의 분위기를 살린 재미있는 표현을 사용하세요. 
+         예: '무조건 직진이다!' / '철벽 수비 예상..' / '아직은 간보는 중?')
+        """
+
+    def _pack_entries(self, items: List[Tuple[dict, str]], pack_size: Optional[int]) -> List[List[Dict]]:
+        """(video_info, 자막) 목록 → 프로그램 분류/자막 압축을 마친 pack_size개씩의 묶음"""
+        pack_size = max(1, int(pack_size or AI_SETTINGS.get('pack_size', 4)))
+        transcript_chars = int(AI_SETTINGS.get('packed_transcript_chars', 2000))
+        entries = []
+        for video_info, transcript in items:
+            condensed = self._condense(video_info, transcript, transcript_chars)
+            category, showId = self._classify_show(video_info, condensed)
+            entries.append({'video_info': video_info, 'transcript': transcript, 'condensed': condensed,
+                            'category': category, 'showId': showId})
+        return [entries[start:start + pack_size] for start in range(0, len(entries), pack_size)]
+
+    def _packed_request(self, pack: List[Dict]) -> Dict:
+        """묶음 1개의 _generate_json 인자"""
+        ids = [entry['video_info']['video_id'] for entry in pack]
+        return {
+            'prompt': self._packed_prompt(pack),
+            'label': f"{len(pack)}개 영상 묶음",
+            'schema': packed_missions_schema(ids),
+            # 모든 영상의 미션이 있어야 캐시 (일부 누락 응답은 다음에 다시 생성)
+            'cacheable': lambda parsed: all(_packed_missions(parsed, video_id) for video_id in ids),
+        }
+
+    @staticmethod
+    def _split_pack(pack: List[Dict], packed: Optional[dict]) -> Tuple[Dict[str, dict], List[Dict]]:
+        """묶음 응답 → (video_id별 결과, 개별 분석이 필요한 영상)"""
+        if packed is None and len(pack) > 1:
+            print(f"⚠️ 묶음 응답 파싱 실패: {len(pack)}개 영상을 개별 분석합니다.", file=sys.stderr)
+        results, fallback = {}, []
+        for entry in pack:
+            video_id = entry['video_info']['video_id']
+            missions = _packed_missions(packed, video_id) if packed is not None else None
+            if missions:
+                for mission in missions:
+                    mission.setdefault('category', entry['category'])
+                    mission.setdefault('showId', entry['showId'])
+                results[video_id] = {'missions': missions}
+            else:
+                if packed is not None:
+                    print(f"⚠️ 묶음 응답에 {video_id} 결과가 없어 개별 분석합니다.", file=sys.stderr)
+                fallback.append(entry)
+        return results, fallback
+
+    def analyze_batch(self, items: List[Tuple[dict, str]], pack_size: Optional[int] = None) -> Dict[str, Optional[dict]]:
+        """여러 영상을 pack_size개씩 한 프롬프트로 묶어 미션 생성 (video_id → analyze_with_transcript와 같은 형식)
+        지침 블록을 영상마다 반복하지 않아 토큰과 요청 수가 줄어듦.
+        묶음 응답을 파싱하지 못하거나 빠진 영상은 단일 영상 호출로 다시 분석"""
+        results = {}
+        for pack in self._pack_entries(items, pack_size):
+            packed = self._generate_json(**self._packed_request(pack)) if len(pack) > 1 else None
+            pack_results, fallback = self._split_pack(pack, packed)
+            results.update(pack_results)
+            for entry in fallback:
+                results[entry['video_info']['video_id']] = self.analyze_with_transcript(entry['video_info'], entry['transcript'])
+        return results
+
+    async def aanalyze_batch(self, items: List[Tuple[dict, str]], pack_size: Optional[int] = None,
+                             deadline: Optional[float] = None) -> Dict[str, Optional[dict]]:
+        """analyze_batch의 비동기 버전 (묶음들과 개별 재분석을 동시에 진행, deadline까지만)"""
+        async def run_pack(pack):
+            packed = None
+            if len(pack) > 1:
+                packed = await self._agenerate_json(**self._packed_request(pack), deadline=deadline)
+            pack_results, fallback = self._split_pack(pack, packed)
+            singles = await asyncio.gather(*(
+                self.aanalyze_with_transcript(entry['video_info'], entry['transcript'], deadline=deadline)
+                for entry in fallback
+            ))
+            for entry, result in zip(fallback, singles):
+                pack_results[entry['video_info']['video_id']] = result
+            return pack_results
+        
+        results = {}
+        for pack_results in await asyncio.gather(*(run_pack(pack) for pack in self._pack_entries(items, pack_size))):
+            results.update(pack_results)
+        return results
+
+
+def _packed_missions(parsed: Optional[dict], video_id: str) -> Optional[list]:
+    """묶음 응답에서 영상 하나의 미션 목록
+    (없거나 형식이 다르거나 필수 필드가 빠진 미션이 섞여 있으면 None → 단일 영상 분석으로 다시 생성)"""
+    if not isinstance(parsed, dict) or not isinstance(parsed.get('videos'), dict):
+        return None
+    entry = parsed['videos'].get(video_id)
+    missions = entry.get('missions') if isinstance(entry, dict) else None
+    if isinstance(missions, list) and missions and all(is_complete_mission(m) for m in missions):
+        return missions
+    return None
+
+
+def _has_complete_missions(parsed: dict) -> bool:
+    """단일 영상 응답의 미션이 모두 완전한지 (캐시 조건)"""
+    missions = parsed.get('missions')
+    return isinstance(missions, list) and bool(missions) and all(is_complete_mission(m) for m in missions)
+
+
+def _complete_result(parsed: Optional[dict], label: str) -> Optional[dict]:
+    """단일 영상 응답에서 필수 필드가 빠진 미션을 버림 (남는 미션이 없으면 None)"""
+    if not isinstance(parsed, dict) or not isinstance(parsed.get('missions'), list):
+        return parsed
+    missions = [m for m in parsed['missions'] if is_complete_mission(m)]
+    dropped = len(parsed['missions']) - len(missions)
+    if dropped:
+        print(f"⚠️ 필수 필드가 빠진 미션 {dropped}개를 버립니다 ({label})", file=sys.stderr)
+    return {**parsed, 'missions': missions} if missions else None
+
+
+def _is_rate_limited(error_str: str) -> bool:
+    """429 에러인 경우에만 재시도"""
+    return "429" in error_str or "Resource exhausted" in error_str
+
+
+class _BackgroundLoop:
+    """비동기 Gemini 호출 전용 이벤트 루프 (프로세스당 1개, 별도 스레드에서 계속 실행)
+    gRPC aio 클라이언트는 처음 사용한 이벤트 루프에 묶이므로 요청마다 asyncio.run으로 새 루프를 만들지 않음"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name='gemini-async-loop', daemon=True).start()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """코루틴 실행 예약 (현재 contextvars가 복사되어 요청별 로그 라우팅 유지). 반환된 Future.cancel()로 취소"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def run_in_gemini_loop(coro: Awaitable) -> Future:
+    """공용 Gemini 이벤트 루프에서 코루틴 실행"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = _BackgroundLoop()
+    return _background_loop.submit(coro)
@@ -0,0 +1,293 @@
+"""
+Gemini JSON 응답 처리 모듈
+  - 응답 스키마: JSON 모드(response_mime_type + response_schema)로 요청할 때 쓰는 스키마
+  - 관대한 파서: 코드 블록/설명이 섞이거나 출력 한도에서 잘린 JSON도 최대한 복구
+  - 파싱 경로별 기록: 복구/수정 요청으로 전체 재생성을 몇 번 아꼈는지 (data/gemini_parse_metrics.json)
+"""
+
+import json
+import re
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from modules.json_store import DATA_DIR, JsonFileStore
+from modules.rate_limiter import estimate_tokens
+
+DEFAULT_METRICS_FILE = DATA_DIR / 'gemini_parse_metrics.json'
+
+# 파싱 실패 시 원래 프롬프트 대신 보내는 짧은 수정 요청 (자막 등 긴 입력 없이 깨진 응답만 전달)
+FIX_JSON_PROMPT = """아래 텍스트는 JSON 출력이 깨지거나 중간에 잘린 것입니다.
+내용은 바꾸지 말고 문법만 고쳐 올바른 JSON 하나만 출력하세요. 잘린 마지막 항목은 버려도 됩니다.
+
+{broken}"""
+
+# ── 응답 스키마 ──────────────────────────────────────────
+
+MISSION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'title': {'type': 'string'},
+        'description': {'type': 'string'},
+        'kind': {'type': 'string', 'enum': ['PREDICT', 'MAJORITY']},
+        'form': {'type': 'string', 'enum': ['binary', 'multiple']},
+        'options': {'type': 'array', 'items': {'type': 'string'}},
+        'category': {'type': 'string'},
+        'showId': {'type': 'string'},
+    },
+    'required': ['title', 'kind', 'form', 'options'],
+}
+
+MISSIONS_SCHEMA = {
+    'type': 'object',
+    'properties': {'missions': {'type': 'array', 'items': MISSION_SCHEMA}},
+    'required': ['missions'],
+}
+
+RECRUIT_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'programId': {'type': 'string'},
+        'category': {'type': 'string', 'enum': ['LOVE', 'VICTORY', 'STAR']},
+        'type': {'type': 'string', 'enum': ['cast', 'audience']},
+        'title': {'type': 'string'},
+        'description': {'type': 'string'},
+        'target': {'type': 'string'},
+        'startDate': {'type': 'string'},
+        'endDate': {'type': 'string'},
+        'officialUrl': {'type': 'string'},
+        'thumbnailUrl': {'type': 'string', 'nullable': True},
+        'source': {'type': 'string'},
+        'isVerified': {'type': 'boolean'},
+    },
+    'required': ['programId', 'category', 'type', 'title'],
+}
+
+
+def is_complete_mission(mission: Any) -> bool:
+    """MISSION_SCHEMA 필수 필드가 모두 채워진 미션인지 (선택지는 2개 이상)
+    잘린 응답을 복구하면 마지막 미션의 뒷부분 필드가 빠진 채 객체가 닫힐 수 있어 저장/캐시 전에 확인"""
+    if not isinstance(mission, dict):
+        return False
+    if any(mission.get(key) in (None, '', []) for key in MISSION_SCHEMA['required']):
+        return False
+    options = mission['options']
+    return isinstance(options, list) and len(options) >= 2 and all(isinstance(o, str) and o for o in options)
+
+
+def packed_missions_schema(video_ids: Iterable[str]) -> Dict:
+    """여러 영상 묶음 응답 스키마 ({"videos": {<video_id>: {"missions": [...]}}})"""
+    video_ids = list(video_ids)
+    return {
+        'type': 'object',
+        'properties': {
+            'videos': {
+                'type': 'object',
+                'properties': {video_id: MISSIONS_SCHEMA for video_id in video_ids},
+                'required': video_ids,
+            },
+        },
+        'required': ['videos'],
+    }
+
+
+def json_generation_config(schema: Optional[Dict] = None) -> Dict:
+    """JSON 모드 generation_config (schema가 있으면 구조까지 강제)"""
+    config = {'response_mime_type': 'application/json'}
+    if schema is not None:
+        config['response_schema'] = schema
+    return config
+
+
+# ── 관대한 파서 ──────────────────────────────────────────
+
+_FENCE_PATTERN = re.compile(r'^```[a-zA-Z]*\s*|\s*```$')
+_TRAILING_COMMA_PATTERN = re.compile(r',\s*([}\]])')
+
+
+def _loads(text: str) -> Optional[Any]:
+    """json.loads, 실패하면 닫는 괄호 앞 쉼표를 지우고 한 번 더 (실패 시 None)"""
+    for candidate in (text, _TRAILING_COMMA_PATTERN.sub(r'\1', text)):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_json_response(text: Optional[str]) -> Tuple[Optional[Any], str]:
+    """응답 텍스트에서 첫 JSON 객체를 꺼냄
+
+    Returns:
+        (값, 경로) - 경로는 'direct'(그대로 파싱), 'extracted'(앞뒤 텍스트 제거),
+        'repaired'(잘린 부분 복구/문법 보정), 'failed'(값은 None)
+    """
+    if not text:
+        return None, 'failed'
+    body = _FENCE_PATTERN.sub('', text.strip())
+    try:
+        return json.loads(body), 'direct'
+    except ValueError:
+        pass
+
+    start = body.find('{')
+    if start < 0:
+        return None, 'failed'
+
+    # 문자열/이스케이프를 따라가며 괄호 짝을 맞춰 첫 객체의 끝을 찾음
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    commas: List[Tuple[int, str]] = []  # (쉼표 위치, 그 시점에 닫아야 할 괄호)
+    for i in range(start, len(body)):
+        char = body[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]':
+            if not stack or stack[-1] != char:
+                break
+            stack.pop()
+            if not stack:
+                span = body[start:i + 1]
+                try:
+                    return json.loads(span), 'extracted'
+                except ValueError:
+                    value = _loads(span)
+                    return (value, 'repaired') if value is not None else (None, 'failed')
+        elif char == ',':
+            commas.append((i, ''.join(reversed(stack))))
+
+    # 객체가 닫히지 않음 (출력 한도에서 잘림): 마지막 쉼표까지 되돌려 괄호를 닫고,
+    # 그래도 안 되면 열린 문자열/괄호를 그대로 닫음 (잘린 값이 섞이지 않도록 되돌리기 우선)
+    # 쉼표가 객체 안에 있으면 그 객체는 앞쪽 키만 남으므로 호출자가 필수 필드를 확인해야 함
+    head = body[start:]
+    closers = ''.join(reversed(stack))
+    candidates = [head.rstrip().rstrip(',') + closers] if not in_string else []
+    candidates.extend(body[start:pos] + closing for pos, closing in reversed(commas[-20:]))
+    if in_string and not escaped:
+        candidates.append(head + '"' + closers)
+    for candidate in candidates:
+        value = _loads(candidate)
+        if value is not None:
+            return value, 'repaired'
+    return None, 'failed'
+
+
+# ── 파싱 경로 기록 ───────────────────────────────────────
+
+class ParseMetrics:
+    """응답 파싱 경로별 횟수와 아낀 호출/토큰 추정치 (일별, 최근 keep_days일)
+
+    경로:
+        cache     - 캐시된 응답 사용 (호출 없음)
+        direct    - 응답을 그대로 파싱 (JSON 모드 효과)
+        extracted - 앞뒤 텍스트를 걷어내고 파싱
+        repaired  - 잘린/깨진 JSON을 로컬에서 복구 → 재생성 1회 절약
+        fixed     - 짧은 수정 요청으로 복구 → 재생성 대신 저렴한 호출 1회
+        failed    - 복구 실패
+    """
+
+    def __init__(self, path=None, keep_days: int = 30):
+        self._store = JsonFileStore(path or DEFAULT_METRICS_FILE)
+        self.keep_days = keep_days
+
+    def record(self, source: str, outcome: str, saved_calls: int = 0, saved_tokens: int = 0):
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        def add(data):
+            days = data.setdefault('days', {})
+            day = days.setdefault(today, {'saved_calls': 0, 'saved_tokens': 0, 'by_source': {}})
+            counts = day['by_source'].setdefault(source, {})
+            counts[outcome] = int(counts.get(outcome, 0)) + 1
+            day['saved_calls'] = int(day.get('saved_calls', 0)) + saved_calls
+            day['saved_tokens'] = int(day.get('saved_tokens', 0)) + saved_tokens
+            for old in sorted(days)[:-self.keep_days]:
+                days.pop(old, None)
+            return data
+        self._store.update(add)
+
+    def summary(self) -> Dict:
+        days = self._store.load().get('days', {})
+        today = datetime.now().strftime('%Y-%m-%d')
+        return {
+            'today': days.get(today, {'saved_calls': 0, 'saved_tokens': 0, 'by_source': {}}),
+            'total_saved_calls': sum(int(day.get('saved_calls', 0)) for day in days.values()),
+            'total_saved_tokens': sum(int(day.get('saved_tokens', 0)) for day in days.values()),
+        }
+
+
+_default_metrics = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_parse_metrics() -> ParseMetrics:
+    """프로세스 공용 ParseMetrics"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = ParseMetrics()
+        return _default_metrics
+
+
+def _record_outcome(source: str, outcome: str, prompt_tokens: int, fix_prompt: Optional[str] = None):
+    """파싱 경로 기록 (복구는 재생성 1회, 수정 요청은 재생성과 수정 요청의 토큰 차이만큼 절약)"""
+    saved_calls = saved_tokens = 0
+    if outcome == 'repaired':
+        saved_calls, saved_tokens = 1, prompt_tokens
+    elif outcome == 'fixed' and fix_prompt:
+        saved_calls, saved_tokens = 1, max(prompt_tokens - estimate_tokens(fix_prompt), 0)
+    get_parse_metrics().record(source, outcome, saved_calls, saved_tokens)
+
+
+def parse_with_fix(text: Optional[str], source: str, prompt_tokens: int,
+                   fix_call: Optional[Callable[[str], Optional[str]]] = None) -> Tuple[Optional[Any], str]:
+    """응답 파싱 → 실패하면 fix_call(FIX_JSON_PROMPT)로 한 번만 수정 요청. 경로를 기록하고 (값, 경로) 반환
+
+    Args:
+        source: 기록용 호출자 이름 ('mission', 'recruit' 등)
+        prompt_tokens: 원래 프롬프트 토큰 추정치 (재생성을 피했을 때 아낀 양)
+        fix_call: 수정 프롬프트를 보내고 응답 텍스트를 받는 함수 (None이면 수정 요청 없음)
+    """
+    value, outcome = parse_json_response(text)
+    fix_prompt = None
+    if outcome == 'failed' and text and fix_call is not None:
+        fix_prompt = FIX_JSON_PROMPT.format(broken=text)
+        try:
+            fixed_text = fix_call(fix_prompt)
+        except Exception as e:
+            print(f"[JSON] 수정 요청 실패 ({source}): {e}", file=sys.stderr)
+            fixed_text = None
+        value, _ = parse_json_response(fixed_text)
+        outcome = 'fixed' if value is not None else 'failed'
+    _record_outcome(source, outcome, prompt_tokens, fix_prompt)
+    return value, outcome
+
+
+async def aparse_with_fix(text: Optional[str], source: str, prompt_tokens: int,
+                          fix_call: Optional[Callable[[str], Awaitable[Optional[str]]]] = None
+                          ) -> Tuple[Optional[Any], str]:
+    """parse_with_fix의 비동기 버전 (fix_call이 코루틴 함수)"""
+    value, outcome = parse_json_response(text)
+    fix_prompt = None
+    if outcome == 'failed' and text and fix_call is not None:
+        fix_prompt = FIX_JSON_PROMPT.format(broken=text)
+        try:
+            fixed_text = await fix_call(fix_prompt)
+        except Exception as e:
+            print(f"[JSON] 수정 요청 실패 ({source}): {e}", file=sys.stderr)
+            fixed_text = None
+        value, _ = parse_json_response(fixed_text)
+        outcome = 'fixed' if value is not None else 'failed'
+    _record_outcome(source, outcome, prompt_tokens, fix_prompt)
+    return value, outcome
@@ -0,0 +1,116 @@
+"""
+로컬 JSON 상태 파일 저장소
+크롤러가 실행 간에 유지해야 하는 작은 상태(할당량 사용량, 채널 캐시, 크롤링 커서 등)를
+data/ 아래 JSON 파일에 원자적으로 저장합니다.
+"""
+
+import json
+import os
+import sys
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+class FileLock:
+    """프로세스 간 배타 잠금 (POSIX: fcntl.flock, Windows: msvcrt.locking)
+
+    같은 프로세스 안에서도 FileLock 객체끼리는 서로 막으므로 중첩해서 잡지 말 것
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 약 10초 동안 재시도한 뒤 실패하므로 다시 시도
+                    continue
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class JsonFileStore:
+    """JSON 파일 하나를 딕셔너리로 읽고 쓰는 저장소 (원자적 쓰기)
+
+    쓰기(save/update)는 <파일>.lock 파일 잠금으로 보호되어 같은 파일을 쓰는 다른 인스턴스/프로세스
+    (상주 브릿지 + CLI로 띄운 브릿지 등)와 겹치지 않습니다.
+
+    Args:
+        mode: 새로 만드는 파일 권한 (기본 0o666에서 umask 적용, 쿠키처럼 민감한 파일은 0o600)
+    """
+
+    def __init__(self, path, mode: int = 0o666):
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.RLock()
+
+    def _file_lock(self) -> FileLock:
+        return FileLock(self.path.with_suffix(self.path.suffix + '.lock'))
+
+    def load(self) -> Dict:
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                return data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                return {}
+
+    def _write(self, data: Dict):
+        """임시 파일(쓰는 쪽마다 다른 이름, 처음부터 self.mode 권한)에 쓴 뒤 교체 - 파일 잠금을 잡은 상태에서 호출"""
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp')
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, self.mode)
+            with open(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[JsonFileStore] 저장 실패 ({self.path.name}): {e}", file=sys.stderr)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def save(self, data: Dict):
+        with self._lock, self._file_lock():
+            self._write(data)
+
+    def update(self, fn: Callable[[Dict], Dict]) -> Dict:
+        """파일 잠금을 잡고 다시 읽어 fn(data)를 적용한 뒤 저장 (다른 프로세스의 기록을 덮어쓰지 않도록)"""
+        with self._lock, self._file_lock():
+            data = fn(self.load())
+            self._write(data)
+            return data
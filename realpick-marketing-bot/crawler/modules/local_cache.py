@@ -0,0 +1,129 @@
+"""
+로컬 디스크 캐시 모듈
+자막, AI 응답처럼 다시 받기 비싼 값을 data/ 아래 SQLite 파일에 저장합니다.
+항목별 만료(TTL)와 전체 용량 제한(LRU 방식 삭제)을 지원합니다.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from modules.json_store import DATA_DIR
+
+
+class SqliteCache:
+    """문자열 키 → 문자열 값 캐시 (zlib 압축, TTL, 최근 사용 순 용량 제한)
+
+    값은 항상 문자열로 저장하므로 구조화된 값은 호출하는 쪽에서 JSON으로 직렬화합니다.
+    같은 파일을 여러 프로세스(CLI 실행 + 상주 브릿지)가 함께 써도 되도록 SQLite 잠금에 맡깁니다.
+    """
+
+    def __init__(self, path, table: str = 'cache', max_bytes: int = 100 * 1024 * 1024,
+                 default_ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.table = table
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                ' key TEXT PRIMARY KEY,'
+                ' value BLOB NOT NULL,'
+                ' size INTEGER NOT NULL,'
+                ' expires_at REAL,'
+                ' accessed_at REAL NOT NULL)'
+            )
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 값 (없거나 만료되면 None). 읽을 때마다 최근 사용 시각 갱신"""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires_at = row
+                if expires_at is not None and expires_at <= now:
+                    conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                    conn.commit()
+                    return None
+                conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+                conn.commit()
+                return zlib.decompress(value).decode('utf-8')
+            except (sqlite3.Error, zlib.error) as e:
+                print(f"[SqliteCache] 조회 실패 ({self.path.name}): {e}", file=sys.stderr)
+                return None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """값 저장 (ttl 초 후 만료, None이면 default_ttl). 용량을 넘으면 오래 안 쓴 항목부터 삭제"""
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        blob = zlib.compress(value.encode('utf-8'))
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, value, size, expires_at, accessed_at)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    (key, blob, len(blob), expires_at, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[SqliteCache] 저장 실패 ({self.path.name}): {e}", file=sys.stderr)
+
+    def delete(self, key: str):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[SqliteCache] 삭제 실패 ({self.path.name}): {e}", file=sys.stderr)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """만료 항목 삭제 후 max_bytes를 넘는 만큼 최근 사용 순서가 오래된 항목 삭제"""
+        conn.execute(f'DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        total = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.table}').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        overflow = total - self.max_bytes
+        victims = []
+        for key, size in conn.execute(f'SELECT key, size FROM {self.table} ORDER BY accessed_at'):
+            victims.append((key,))
+            overflow -= size
+            if overflow <= 0:
+                break
+        conn.executemany(f'DELETE FROM {self.table} WHERE key = ?', victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            try:
+                count, total = self._connect().execute(
+                    f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}'
+                ).fetchone()
+                return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
+            except sqlite3.Error:
+                return {'entries': 0, 'bytes': 0, 'max_bytes': self.max_bytes}
+
+
+DEFAULT_CACHE_FILE = DATA_DIR / 'cache.sqlite3'
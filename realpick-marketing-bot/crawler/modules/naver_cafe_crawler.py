@@ -8,12 +8,9 @@ import time
 import re
 import json
 import random
-import os
-import pickle
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
-from pathlib import Path
 
 try:
     from selenium import webdriver
@@ -34,24 +31,90 @@ except ImportError as e:
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from modules.cookie_store import CookieStore, get_cookie_store
+
+try:
+    from config.settings import NAVER_CAFE_SETTINGS
+except ImportError:
+    NAVER_CAFE_SETTINGS = {}
+
+# 네이버 로그인 상태를 나타내는 쿠키 (둘 다 살아 있어야 로그인 유지)
+NAVER_LOGIN_COOKIES = ('NID_AUT', 'NID_SES')
+
+# 목록 페이지 하나에 예전 고정 대기가 쓰던 시간 (절약량 보고용)
+# SPA: 로딩 8초 + 안정화 3초 + 스크롤 2초 + 렌더링 5초 / iframe: 3~6초(평균 4.5) + 스크롤 2초
+LEGACY_SPA_PAGE_WAIT = 18.0
+LEGACY_IFRAME_PAGE_WAIT = 6.5
+
+# 목록 준비 상태 확인 스크립트: [readyState, 게시글 링크 수, 결과 없음 표시 수, 목록 컨테이너 수, 리소스 요청 수]
+# (리소스 요청 수가 idle 시간 동안 그대로면 네트워크가 잠잠해진 것으로 봄)
+_LIST_READY_SCRIPT = """
+if (!window.__realpickTimingBuffer) { performance.setResourceTimingBufferSize(5000); window.__realpickTimingBuffer = true; }
+return [
+    document.readyState,
+    document.querySelectorAll("a[href*='articles']").length,
+    document.querySelectorAll(".nodata, .no_result, .empty, .no-data, .search_no_result").length,
+    document.querySelectorAll("div[class*='ArticleList'], ul[class*='article'], div.article-board").length,
+    performance.getEntriesByType('resource').length
+];
+"""
 
 
 class NaverCafeCrawler:
     """네이버 카페 크롤러 - Selenium + API 하이브리드"""
     
-    def __init__(self, headless: bool = False, visible: bool = True):
+    def __init__(self, headless: bool = False, visible: bool = True,
+                 cookie_store: Optional[CookieStore] = None):
         """
         Args:
             headless: 헤드리스 모드 (비권장)
             visible: 브라우저 표시 (권장)
+            cookie_store: 로그인 쿠키 저장소 (기본 cookies/naver_cookies.json)
         """
         self.driver = None
         self.headless = headless
         self.visible = visible
+        self.cookie_store = cookie_store or get_cookie_store('naver', required=NAVER_LOGIN_COOKIES)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        # 게시글/댓글 API를 연달아 호출하므로 연결을 재사용
+        max_connections = int(NAVER_CAFE_SETTINGS.get('max_connections', 4))
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=max_connections))
+        self._session_hydrated = False
+        # 마지막 crawl_article_detail이 어떤 경로로 수집했는지 ('api' / 'browser' / None)
+        self.last_detail_source: Optional[str] = None
+        # 마지막 crawl_article_list의 페이지 대기 통계 (pages, waited_seconds, saved_seconds)
+        self.last_list_wait_stats: Dict = {}
+        # 마지막 _wait_for_list_ready에서 본 목록 상태 (links, empty, lists 개수)
+        self._list_state: Dict = {}
+    
+    def has_saved_login(self) -> bool:
+        """저장된 로그인 쿠키가 만료 전인지 (브라우저 없이 확인)"""
+        return self.cookie_store.is_valid()
+    
+    def api_session(self) -> requests.Session:
+        """API 호출용 세션 (로그인 쿠키 포함)
+        
+        브라우저가 떠 있으면 브라우저 쿠키를 그대로 쓰고,
+        없으면 저장된 쿠키로 한 번만 채움 → API만 필요한 작업은 Chrome 없이 실행
+        """
+        if self.driver:
+            try:
+                for cookie in self.driver.get_cookies():
+                    self.session.cookies.set(cookie['name'], cookie['value'],
+                                             domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+            except Exception as e:
+                print(f"[Naver Cafe Crawler] 브라우저 쿠키 동기화 실패: {e}", file=sys.stderr)
+        elif not self._session_hydrated:
+            count = self.cookie_store.apply_to_session(self.session)
+            self._session_hydrated = True
+            if count:
+                print(f"[Naver Cafe Crawler] 🍪 저장된 쿠키 {count}개로 API 세션 준비 (브라우저 없음)", file=sys.stderr)
+        return self.session
     
     def start_browser(self) -> bool:
         """브라우저 시작 (수동 로그인 대기)"""
@@ -188,19 +251,12 @@ class NaverCafeCrawler:
         try:
             api_url = f"https://apis.naver.com/cafe-web/cafe-article/v1/articles/{articleid}?useCafeId=false&buid={clubid}"
             
-            # 로그인 쿠키 사용
-            cookies = {}
-            if self.driver:
-                for cookie in self.driver.get_cookies():
-                    cookies[cookie['name']] = cookie['value']
-            
             headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Referer': f'https://cafe.naver.com/ArticleRead.nhn?clubid={clubid}&articleid={articleid}'
             }
             
-            import requests
-            response = requests.get(api_url, headers=headers, cookies=cookies, timeout=10)
+            # 로그인 쿠키가 담긴 세션 사용 (브라우저 쿠키 또는 저장된 쿠키)
+            response = self.api_session().get(api_url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -248,44 +304,37 @@ class NaverCafeCrawler:
         except Exception as e:
             print(f"[Naver Cafe Crawler] HTML 저장 실패: {e}", file=sys.stderr)
     
-    def save_login_cookies(self, filepath: str = "naver_cookies.pkl"):
-        """로그인 쿠키 저장"""
+    def save_login_cookies(self):
+        """로그인 쿠키 저장 (cookies/naver_cookies.json, 만료 시각 포함)"""
         if not self.driver:
             return
         
         try:
-            cookies = self.driver.get_cookies()
-            with open(filepath, 'wb') as f:
-                pickle.dump(cookies, f)
-            print(f"[Naver Cafe Crawler] 🍪 쿠키 저장: {filepath}", file=sys.stderr)
+            self.cookie_store.save(self.driver.get_cookies())
+            self._session_hydrated = False
+            expires_at = self.cookie_store.expires_at()
+            expires_text = datetime.fromtimestamp(expires_at).strftime('%Y-%m-%d %H:%M') if expires_at else '세션 종료 시'
+            print(f"[Naver Cafe Crawler] 🍪 쿠키 저장: {self.cookie_store.path} (만료: {expires_text})", file=sys.stderr)
         except Exception as e:
             print(f"[Naver Cafe Crawler] 쿠키 저장 실패: {e}", file=sys.stderr)
     
-    def load_login_cookies(self, filepath: str = "naver_cookies.pkl") -> bool:
+    def load_login_cookies(self) -> bool:
         """저장된 쿠키 로드 (로그인 세션 재사용)"""
         if not self.driver:
             return False
         
         try:
-            if not os.path.exists(filepath):
-                print(f"[Naver Cafe Crawler] 저장된 쿠키 없음: {filepath}", file=sys.stderr)
+            # 로그인 쿠키가 없거나 만료됐으면 페이지를 열어 볼 필요 없이 바로 수동 로그인으로
+            if not self.cookie_store.is_valid():
+                print(f"[Naver Cafe Crawler] 저장된 로그인 쿠키 없음/만료: {self.cookie_store.path}", file=sys.stderr)
                 return False
             
             # 네이버 메인 페이지 먼저 방문 (쿠키 도메인 설정)
             self.driver.get("https://www.naver.com")
             time.sleep(2)
             
-            with open(filepath, 'rb') as f:
-                cookies = pickle.load(f)
-            
-            for cookie in cookies:
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    # 일부 쿠키는 추가 실패할 수 있음 (도메인 불일치 등)
-                    pass
-            
-            print(f"[Naver Cafe Crawler] 🍪 쿠키 로드 완료: {len(cookies)}개", file=sys.stderr)
+            count = self.cookie_store.apply_to_driver(self.driver)
+            print(f"[Naver Cafe Crawler] 🍪 쿠키 로드 완료: {count}개", file=sys.stderr)
             
             # 로그인 상태 확인
             self.driver.get("https://www.naver.com")
@@ -351,7 +400,7 @@ class NaverCafeCrawler:
         """
         try:
             api_url = f"https://apis.naver.com/cafe-web/cafe-article/v1/articles/{articleid}?useCafeId=false&buid={clubid}"
-            response = self.session.get(api_url, timeout=10)
+            response = self.api_session().get(api_url, timeout=10)
             
             if response.status_code != 200:
                 return None
@@ -563,6 +612,51 @@ class NaverCafeCrawler:
         
         return None
     
+    def _wait_for_list_ready(self, timeout: float = None, idle_ms: int = None) -> float:
+        """
+        목록 페이지가 준비될 때까지 대기 (고정 sleep 대신 DOM/네트워크 조건)
+        
+        준비 조건: readyState == complete 이고 게시글 링크/결과 없음 표시/목록 컨테이너 중 하나가 있으며,
+        idle_ms 동안 게시글 링크 수와 리소스 요청 수가 변하지 않음 (비동기 로딩이 끝남)
+        
+        Returns:
+            실제로 기다린 시간 (초, timeout을 넘으면 timeout)
+        """
+        timeout = timeout if timeout is not None else float(NAVER_CAFE_SETTINGS.get('list_wait_timeout', 20))
+        idle = (idle_ms if idle_ms is not None else NAVER_CAFE_SETTINGS.get('network_idle_ms', 500)) / 1000
+        started = time.monotonic()
+        deadline = started + timeout
+        last_seen = None
+        last_change = started
+        while True:
+            now = time.monotonic()
+            try:
+                state, links, empty, lists, resources = self.driver.execute_script(_LIST_READY_SCRIPT)
+            except Exception:
+                state = None
+                links = empty = lists = resources = 0
+            self._list_state = {'links': links, 'empty': empty, 'lists': lists}
+            if (links, resources) != last_seen:
+                last_seen = (links, resources)
+                last_change = now
+            if state == 'complete' and (links or empty or lists) and now - last_change >= idle:
+                return now - started
+            if now >= deadline:
+                print(f"[Naver Cafe Crawler] ⚠️ 목록 준비 대기 {timeout:.0f}초 초과 (그대로 진행)", file=sys.stderr)
+                return now - started
+            time.sleep(0.1)
+    
+    def _record_page_wait(self, page: int, waited: float, spa: bool):
+        """페이지 대기 시간과 예전 고정 대기 대비 절약한 시간 기록/출력"""
+        baseline = LEGACY_SPA_PAGE_WAIT if spa else LEGACY_IFRAME_PAGE_WAIT
+        saved = baseline - waited
+        stats = self.last_list_wait_stats
+        stats['pages'] = stats.get('pages', 0) + 1
+        stats['waited_seconds'] = round(stats.get('waited_seconds', 0) + waited, 1)
+        stats['saved_seconds'] = round(stats.get('saved_seconds', 0) + saved, 1)
+        print(f"[Naver Cafe Crawler] ⏱️ 페이지 {page} 대기 {waited:.1f}초 "
+              f"(고정 대기 {baseline:.1f}초 대비 {saved:+.1f}초 절약)", file=sys.stderr)
+    
     def crawl_article_list(
         self,
         cafe_url: str,
@@ -621,6 +715,7 @@ class NaverCafeCrawler:
         print(f"[Naver Cafe Crawler] ✅ clubid: {clubid} (카페: {cafe_id})", file=sys.stderr)
         
         all_posts = []
+        self.last_list_wait_stats = {'pages': 0, 'waited_seconds': 0.0, 'saved_seconds': 0.0}
         
         try:
             # 각 키워드별로 검색
@@ -648,26 +743,12 @@ class NaverCafeCrawler:
                 
                 # SPA 방식은 iframe이 없을 수 있음 (URL에 /f-e/ 포함 여부로 판단)
                 if '/f-e/' not in search_url:
-                    # 구식 iframe 방식만 iframe 전환 시도
-                    time.sleep(random.uniform(3, 6))
+                    # 구식 iframe 방식만 iframe 전환 시도 (프레임이 준비될 때까지 명시적 대기)
                     self.switch_to_iframe_if_needed()
                 else:
-                    print("[Naver Cafe Crawler] SPA 방식 - JavaScript 로딩 대기 중...", file=sys.stderr)
-                    # SPA는 JavaScript 실행 시간이 필요함 - 충분히 대기
-                    time.sleep(8)  # 기본 대기 (JavaScript 실행)
-                    
-                    # 페이지 완전 로드 대기
-                    try:
-                        # document.readyState가 complete가 될 때까지 대기
-                        WebDriverWait(self.driver, 15).until(
-                            lambda d: d.execute_script("return document.readyState") == "complete"
-                        )
-                        print("[Naver Cafe Crawler] ✅ 페이지 로드 완료", file=sys.stderr)
-                    except:
-                        pass
-                    
-                    # 추가 안정화 대기
-                    time.sleep(3)
+                    print("[Naver Cafe Crawler] SPA 방식 - 게시글 목록 로딩 대기 중...", file=sys.stderr)
+                # 게시글 링크(또는 결과 없음 표시)가 뜨고 네트워크가 잠잠해질 때까지
+                page_wait = self._wait_for_list_ready()
                 
                 # should_continue_page 변수 초기화 (키워드 레벨)
                 should_continue_page = True
@@ -676,14 +757,10 @@ class NaverCafeCrawler:
                 page_source = self.driver.page_source
                 print(f"[Naver Cafe Crawler] 페이지 로드 완료. 페이지 길이: {len(page_source)}", file=sys.stderr)
                 
-                # 검색 결과 확인
-                try:
-                    no_result = self.driver.find_elements(By.CSS_SELECTOR, ".nodata, .no_result, .empty, .no-data, .search_no_result")
-                    if no_result:
-                        print(f"[Naver Cafe Crawler] 키워드 '{keyword}': 검색 결과 없음", file=sys.stderr)
-                        continue
-                except:
-                    pass  # 검색 결과가 있음
+                # 검색 결과 확인 (대기 중 확인한 상태 사용 - find_elements는 결과가 없으면 implicit wait만큼 멈춤)
+                if self._list_state.get('empty'):
+                    print(f"[Naver Cafe Crawler] 키워드 '{keyword}': 검색 결과 없음", file=sys.stderr)
+                    continue
                 
                 # 페이지별로 크롤링
                 for page in range(1, max_pages + 1):
@@ -704,23 +781,18 @@ class NaverCafeCrawler:
                         
                         # iframe 전환 (구식 방식만)
                         if '/f-e/' not in page_url:
-                            time.sleep(random.uniform(3, 6))
                             self.switch_to_iframe_if_needed()
                         else:
                             # SPA 페이지 로딩 대기
                             print(f"[Naver Cafe Crawler] SPA 페이지 {page} 로딩 대기...", file=sys.stderr)
-                            time.sleep(8)  # JavaScript 실행
-                            try:
-                                WebDriverWait(self.driver, 15).until(
-                                    lambda d: d.execute_script("return document.readyState") == "complete"
-                                )
-                            except:
-                                pass
-                            time.sleep(3)  # 안정화
+                        page_wait = self._wait_for_list_ready()
                     
-                    # 스크롤 (SPA는 스크롤이 중요함)
+                    # 스크롤 (SPA는 스크롤이 중요함) → 지연 로딩되는 행이 붙을 때까지만 대기
                     self.driver.execute_script("window.scrollTo(0, 1000);")
-                    time.sleep(2)
+                    page_wait += self._wait_for_list_ready(
+                        timeout=float(NAVER_CAFE_SETTINGS.get('scroll_wait_timeout', 3))
+                    )
+                    self._record_page_wait(page, page_wait, '/f-e/' in self.driver.current_url)
                     
                     # [중요] 테이블 헤더에서 "작성일" 컬럼 인덱스 찾기
                     date_column_index = None
@@ -738,36 +810,8 @@ class NaverCafeCrawler:
                     except:
                         pass
                     
-                    # SPA 방식: 게시글 로딩 대기 (비동기 로딩)
+                    # SPA 방식: 게시글 로딩은 _wait_for_list_ready에서 확인 (링크/목록 컨테이너 + 네트워크 idle)
                     if '/f-e/' in self.driver.current_url:
-                        print("[Naver Cafe Crawler] SPA 게시글 로딩 대기 중 (최대 20초)...", file=sys.stderr)
-                        
-                        # 여러 방법으로 게시글 로드 확인
-                        loaded = False
-                        try:
-                            # 방법 1: 게시글 링크가 나타날 때까지 대기
-                            WebDriverWait(self.driver, 20).until(
-                                lambda d: len(d.find_elements(By.CSS_SELECTOR, "a[href*='articles']")) > 0
-                            )
-                            loaded = True
-                            print("[Naver Cafe Crawler] ✅ SPA 게시글 로드 완료 (링크 발견)", file=sys.stderr)
-                        except TimeoutException:
-                            print("[Naver Cafe Crawler] ⚠️ 방법 1 실패 - 다른 셀렉터 시도", file=sys.stderr)
-                        
-                        if not loaded:
-                            try:
-                                # 방법 2: 리스트 컨테이너가 나타날 때까지 대기
-                                WebDriverWait(self.driver, 10).until(
-                                    lambda d: len(d.find_elements(By.CSS_SELECTOR, "div[class*='ArticleList'], ul[class*='article'], div.article-board")) > 0
-                                )
-                                loaded = True
-                                print("[Naver Cafe Crawler] ✅ SPA 게시글 로드 완료 (리스트 발견)", file=sys.stderr)
-                            except TimeoutException:
-                                print("[Naver Cafe Crawler] ⚠️ 방법 2 실패 - 강제 대기", file=sys.stderr)
-                        
-                        # 최종 안정화 대기
-                        time.sleep(5)  # JavaScript 렌더링 완료 대기
-                        
                         # 페이지 소스 길이 확인 (디버깅)
                         page_length = len(self.driver.page_source)
                         print(f"[Naver Cafe Crawler] 페이지 소스 길이: {page_length}자", file=sys.stderr)
@@ -1389,6 +1433,10 @@ class NaverCafeCrawler:
                 time.sleep(random.uniform(2, 4))
             
             print(f"[Naver Cafe Crawler] ✅ 총 {len(all_posts)}개 게시글 수집 완료 (24시간 이내)", file=sys.stderr)
+            stats = self.last_list_wait_stats
+            if stats.get('pages'):
+                print(f"[Naver Cafe Crawler] ⏱️ 목록 {stats['pages']}페이지 대기 {stats['waited_seconds']:.1f}초 "
+                      f"(고정 대기 대비 {stats['saved_seconds']:.1f}초 절약)", file=sys.stderr)
             
             if len(all_posts) == 0:
                 print(f"[Naver Cafe Crawler] ⚠️ 수집된 게시글이 없습니다. 다음을 확인해주세요:", file=sys.stderr)
@@ -1412,45 +1460,147 @@ class NaverCafeCrawler:
             print(f"[Naver Cafe Crawler] 트레이스백: {traceback.format_exc()}", file=sys.stderr)
             return all_posts
     
-    def crawl_article_detail(self, article_url: str, post_id: str = None) -> Optional[Dict]:
+    def _article_ids(self, article_url: str, post_id: str = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """게시글 URL → (정규화 URL, clubid, articleid). 추출 실패 시 값이 None"""
+        # URL 정규화
+        normalized_url = self.normalize_article_url(article_url)
+        if not normalized_url:
+            return None, None, None
+        
+        # clubid, articleid 추출 (SPA 및 PC 표준 모두 지원)
+        clubid = None
+        articleid = None
+        
+        # SPA 형식: /f-e/cafes/123456/articles/789012
+        spa_match = re.search(r'/cafes/(\d+)/articles/(\d+)', normalized_url)
+        if spa_match:
+            clubid, articleid = spa_match.groups()
+        else:
+            # PC 표준 형식: clubid=123456&articleid=789012
+            match = re.search(r'clubid=(\d+)', normalized_url)
+            clubid = match.group(1) if match else None
+            
+            match = re.search(r'articleid=(\d+)', normalized_url)
+            articleid = match.group(1) if match else post_id
+        
+        return normalized_url, clubid, articleid
+    
+    @staticmethod
+    def _clean_content(content: str) -> str:
+        """치유일기 고정 안내문 제거 (옵션)"""
+        if '치유일기' in content[:200] and '고정' in content[:200]:
+            lines = content.split('\n')
+            content = '\n'.join([l for l in lines if '고정' not in l and '안내' not in l])
+        return content
+    
+    @staticmethod
+    def _format_api_date(value) -> str:
+        """API 날짜(밀리초 타임스탬프 또는 문자열) → 상세 페이지 표기와 같은 'YYYY.MM.DD. HH:MM'"""
+        if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+            timestamp = float(value)
+            if timestamp > 1e11:  # 밀리초
+                timestamp /= 1000
+            return datetime.fromtimestamp(timestamp).strftime('%Y.%m.%d. %H:%M')
+        return str(value or '')
+    
+    def crawl_article_detail_via_api(self, clubid: str, articleid: str) -> Optional[Dict]:
+        """
+        게시글 API 한 번 + 댓글 API 한 번으로 상세 수집 (브라우저 불필요)
+        
+        Returns:
+            crawl_article_detail과 같은 형식. 본문을 받지 못하면(권한 없음, 삭제 등) None
+        """
+        try:
+            api_url = f"https://apis.naver.com/cafe-web/cafe-article/v1/articles/{articleid}?useCafeId=false&buid={clubid}"
+            headers = {'Referer': f'https://cafe.naver.com/ArticleRead.nhn?clubid={clubid}&articleid={articleid}'}
+            response = self.api_session().get(api_url, headers=headers,
+                                              timeout=NAVER_CAFE_SETTINGS.get('api_timeout', 10))
+            if response.status_code != 200:
+                print(f"[Naver Cafe Crawler] ⚠️ 상세 API HTTP 오류: status={response.status_code}", file=sys.stderr)
+                return None
+            
+            data = response.json()
+            article = (data.get('result') or {}).get('article') or data.get('article') or {}
+            html = article.get('content') or ''
+            if not html:
+                return None
+            
+            # 브라우저 elem.text와 같은 형태가 되도록 HTML → 줄 단위 텍스트
+            content = BeautifulSoup(html, 'html.parser').get_text('\n', strip=True)
+            if not content:
+                return None
+            content = self._clean_content(content)
+            
+            writer = article.get('writer') or {}
+            member_id = (
+                writer.get('id') or
+                writer.get('memberKey') or
+                writer.get('memberId') or
+                article.get('writerId') or
+                None
+            )
+            nickname = (
+                writer.get('nick') or
+                writer.get('nickname') or
+                writer.get('nickName') or
+                article.get('writerNickname') or
+                'Unknown'
+            )
+            write_date = article.get('writeDate') or article.get('writeDateTimestamp') or article.get('createdAt')
+            view_count = article.get('readCount') or article.get('viewCount') or 0
+            
+            return {
+                'content': content,
+                'date': self._format_api_date(write_date),
+                'viewCount': int(view_count) if str(view_count).isdigit() else 0,
+                'member_id': str(member_id) if member_id else None,
+                'nickname': nickname,
+                'comments': self.crawl_comments_via_api(clubid, articleid),
+                'clubid': clubid,
+                'articleid': articleid
+            }
+        except Exception as e:
+            print(f"[Naver Cafe Crawler] ⚠️ 상세 API 오류: {e}", file=sys.stderr)
+            return None
+    
+    def crawl_article_detail(self, article_url: str, post_id: str = None, mode: str = None) -> Optional[Dict]:
         """
         게시글 상세 수집 (본문 + 댓글)
         
         Args:
             article_url: 정규화된 게시글 URL
             post_id: 게시글 ID (없으면 URL에서 추출)
+            mode: 'api' = 게시글 API 우선, 실패 시 브라우저 / 'browser' = 브라우저만
+                  (기본 NAVER_CAFE_SETTINGS['detail_mode'])
         
         Returns:
             {'content': '...', 'member_id': '...', 'comments': [...]}
         """
+        self.last_detail_source = None
+        normalized_url, clubid, articleid = self._article_ids(article_url, post_id)
+        if not clubid or not articleid:
+            return None
+        
+        mode = mode or NAVER_CAFE_SETTINGS.get('detail_mode', 'api')
+        if mode == 'api':
+            detail = self.crawl_article_detail_via_api(clubid, articleid)
+            if detail:
+                self.last_detail_source = 'api'
+                return detail
+            if self.driver:
+                print(f"[Naver Cafe Crawler] 상세 API 실패 → 브라우저로 수집: {articleid}", file=sys.stderr)
+        
+        detail = self._crawl_article_detail_browser(normalized_url, clubid, articleid)
+        if detail:
+            self.last_detail_source = 'browser'
+        return detail
+    
+    def _crawl_article_detail_browser(self, normalized_url: str, clubid: str, articleid: str) -> Optional[Dict]:
+        """브라우저로 상세 페이지를 열어 수집 (API로 본문을 받지 못할 때)"""
         if not self.driver:
             return None
         
         try:
-            # URL 정규화
-            normalized_url = self.normalize_article_url(article_url)
-            if not normalized_url:
-                return None
-            
-            # clubid, articleid 추출 (SPA 및 PC 표준 모두 지원)
-            clubid = None
-            articleid = None
-            
-            # SPA 형식: /f-e/cafes/123456/articles/789012
-            spa_match = re.search(r'/cafes/(\d+)/articles/(\d+)', normalized_url)
-            if spa_match:
-                clubid, articleid = spa_match.groups()
-            else:
-                # PC 표준 형식: clubid=123456&articleid=789012
-                match = re.search(r'clubid=(\d+)', normalized_url)
-                clubid = match.group(1) if match else None
-                
-                match = re.search(r'articleid=(\d+)', normalized_url)
-                articleid = match.group(1) if match else post_id
-            
-            if not clubid or not articleid:
-                return None
-            
             # 상세 페이지 이동
             self.driver.get(normalized_url)
             time.sleep(random.uniform(3, 7))
@@ -1504,9 +1654,7 @@ class NaverCafeCrawler:
                     continue
             
             # 치유일기 고정 안내문 제거 (옵션)
-            if '치유일기' in content[:200] and '고정' in content[:200]:
-                lines = content.split('\n')
-                content = '\n'.join([l for l in lines if '고정' not in l and '안내' not in l])
+            content = self._clean_content(content)
             
             # 조회수 추출
             view_count = 0
@@ -1596,7 +1744,7 @@ class NaverCafeCrawler:
         comments = []
         try:
             comment_url = f"https://cafe.naver.com/CommentView.nhn?search.clubid={clubid}&search.articleid={articleid}"
-            response = self.session.get(comment_url, timeout=10)
+            response = self.api_session().get(comment_url, timeout=10)
             
             if response.status_code != 200:
                 return comments
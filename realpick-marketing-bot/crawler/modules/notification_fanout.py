@@ -0,0 +1,215 @@
+"""
+전체 사용자 알림 팬아웃 모듈
+users 컬렉션을 문서 ID 순서로 커서 페이징하며 끝까지 훑고, 알림 문서를 500개 단위 batch commit으로
+여러 스레드에서 동시에 씁니다. (사용자 1000명 제한 + 문서마다 set() 한 번씩 하던 방식 대체)
+
+  - 알림 문서 ID는 {fanout_id}_{userId}로 고정하고 create()로만 씀 → 재시도/재개해도 이미 받은 사용자의
+    알림(읽음 여부, 생성 시각)을 다시 쓰지 않고 중복 생성되지도 않음
+  - batch 실패는 사용자 ID 범위와 오류를 보고하고, 진행 상황(커서, 실패 batch)은 data/notification_fanouts.json에 저장
+  - 같은 fanout_id로 다시 실행하면 실패한 batch부터 재시도한 뒤 마지막 커서 다음부터 이어서 진행
+"""
+
+import sys
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+
+from modules.json_store import DATA_DIR, JsonFileStore
+
+try:
+    from config.settings import NOTIFICATION_FANOUT_SETTINGS
+except ImportError:
+    NOTIFICATION_FANOUT_SETTINGS = {}
+
+DEFAULT_STATE_FILE = DATA_DIR / 'notification_fanouts.json'
+# Firestore batch 한 번에 쓸 수 있는 최대 문서 수
+MAX_BATCH_SIZE = 500
+
+
+class NotificationFanout:
+    """전체 사용자 알림 팬아웃 (커서 페이징 + 병렬 batch commit + 재개)
+
+    Args:
+        db: firestore.client()
+        batch_size: batch 하나에 쓸 알림 수 (최대 500)
+        max_workers: 동시에 commit할 batch 수
+        max_retries: batch commit 실패 시 재시도 횟수 (지수 백오프)
+    """
+
+    def __init__(self, db, batch_size: Optional[int] = None, max_workers: Optional[int] = None,
+                 max_retries: Optional[int] = None, state_path=None):
+        settings = NOTIFICATION_FANOUT_SETTINGS
+        self.db = db
+        self.batch_size = min(int(batch_size or settings.get('batch_size', MAX_BATCH_SIZE)), MAX_BATCH_SIZE)
+        self.max_workers = int(max_workers or settings.get('max_workers', 8))
+        self.max_retries = int(max_retries if max_retries is not None else settings.get('max_retries', 3))
+        self.keep_runs = int(settings.get('keep_runs', 20))
+        # 한 페이지 = 동시에 commit할 batch 전체 분량
+        self.page_size = self.batch_size * self.max_workers
+        self._store = JsonFileStore(state_path or DEFAULT_STATE_FILE)
+
+    # ── 상태 저장 ──────────────────────────────────────────
+
+    def _save_state(self, fanout_id: str, state: Dict):
+        def put(data):
+            data[fanout_id] = state
+            # 끝난 실행은 최근 keep_runs개만 보관
+            finished = sorted((k for k, v in data.items() if v.get('status') == 'done'),
+                              key=lambda k: data[k].get('updated_at', ''))
+            for old in finished[:-self.keep_runs]:
+                data.pop(old, None)
+            return data
+        state['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._store.update(put)
+
+    def get_state(self, fanout_id: str) -> Optional[Dict]:
+        """저장된 팬아웃 진행 상황 (없으면 None)"""
+        return self._store.load().get(fanout_id)
+
+    # ── 쓰기 ──────────────────────────────────────────────
+
+    def _unsent(self, fanout_id: str, user_ids: List[str]) -> List[str]:
+        """아직 알림 문서가 없는 사용자 (문서 존재 여부만 한 번에 조회)"""
+        notifications = self.db.collection('notifications')
+        refs = [notifications.document(f'{fanout_id}_{user_id}') for user_id in user_ids]
+        existing = {snapshot.id for snapshot in self.db.get_all(refs, field_paths=[]) if snapshot.exists}
+        return [user_id for user_id in user_ids if f'{fanout_id}_{user_id}' not in existing]
+
+    def _commit_batch(self, fanout_id: str, notification_data: Dict, user_ids: List[str]) -> Optional[str]:
+        """사용자 ID 묶음에 알림 batch commit (실패 시 재시도). 성공하면 None, 실패하면 오류 메시지
+        이미 알림이 있는 사용자(이전 실행에서 commit됨)는 건너뛰고 보낸 것으로 침"""
+        notifications = self.db.collection('notifications')
+        check_existing = False
+        attempt = conflicts = 0
+        while True:
+            try:
+                if check_existing:
+                    user_ids = self._unsent(fanout_id, user_ids)
+                    check_existing = False
+                    if not user_ids:
+                        return None
+                batch = self.db.batch()
+                for user_id in user_ids:
+                    user_notification = dict(notification_data)
+                    user_notification['userId'] = user_id
+                    user_notification['isRead'] = False  # 반드시 false
+                    user_notification['fanoutId'] = fanout_id
+                    user_notification['createdAt'] = firestore.SERVER_TIMESTAMP
+                    batch.create(notifications.document(f'{fanout_id}_{user_id}'), user_notification)
+                batch.commit()
+                return None
+            except AlreadyExists as e:
+                # batch 전체가 거절됨 → 이미 있는 문서를 빼고 바로 다시 시도 (재시도 횟수와 별도)
+                conflicts += 1
+                if conflicts > self.max_retries + 1:
+                    return str(e)
+                check_existing = True
+            except Exception as e:
+                # 응답만 못 받고 commit은 됐을 수 있음 → 다음 시도의 create가 거절되면 위에서 걸러짐
+                if attempt >= self.max_retries:
+                    return str(e)
+                time.sleep(min(2 ** attempt, 30))
+                attempt += 1
+
+    def _submit(self, pool: ThreadPoolExecutor, fanout_id: str, notification_data: Dict,
+                user_ids: List[str]) -> List[Tuple[List[str], Future]]:
+        chunks = [user_ids[i:i + self.batch_size] for i in range(0, len(user_ids), self.batch_size)]
+        return [(chunk, pool.submit(self._commit_batch, fanout_id, notification_data, chunk)) for chunk in chunks]
+
+    def _settle(self, fanout_id: str, state: Dict, jobs: List[Tuple[List[str], Future]],
+                cursor: Optional[str] = None):
+        """batch 결과를 모아 상태에 반영하고 저장 (cursor가 있으면 그 사용자까지 처리 완료로 기록)"""
+        for user_ids, future in jobs:
+            error = future.result()
+            state['batches'] += 1
+            if error is None:
+                state['sent'] += len(user_ids)
+                continue
+            state['failed_batches'].append({
+                'batch': state['batches'],
+                'count': len(user_ids),
+                'first_user': user_ids[0],
+                'last_user': user_ids[-1],
+                'error': error,
+                'user_ids': user_ids,
+            })
+            print(f"[Notification Fanout] ⚠️ batch {state['batches']} 실패 ({len(user_ids)}명, "
+                  f"{user_ids[0]} ~ {user_ids[-1]}): {error}", file=sys.stderr)
+        if cursor is not None:
+            state['cursor'] = cursor
+        self._save_state(fanout_id, state)
+
+    def _fetch_user_ids(self, cursor: Optional[str]) -> List[str]:
+        """문서 ID 순서로 다음 페이지 사용자 ID (필드는 받지 않음)"""
+        query = self.db.collection('users').order_by('__name__').select([]).limit(self.page_size)
+        if cursor:
+            query = query.start_after({'__name__': cursor})
+        return [doc.id for doc in query.stream()]
+
+    # ── 실행 ──────────────────────────────────────────────
+
+    def run(self, notification_data: Optional[Dict] = None, fanout_id: Optional[str] = None) -> Dict:
+        """전체 사용자에게 알림 생성 (fanout_id가 이전 실행이면 이어서 진행)
+
+        Returns:
+            {'fanout_id', 'status'('done'|'partial'), 'sent', 'failed', 'batches',
+             'failed_batches': [{'batch', 'count', 'first_user', 'last_user', 'error'}], 'elapsed_seconds'}
+        """
+        started = time.monotonic()
+        fanout_id = fanout_id or f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        state = self.get_state(fanout_id)
+        if state is None:
+            if notification_data is None:
+                raise ValueError(f"알 수 없는 팬아웃입니다: {fanout_id}")
+            state = {'notification': dict(notification_data), 'cursor': None, 'sent': 0,
+                     'batches': 0, 'failed_batches': [], 'status': 'running'}
+        elif state.get('status') == 'done':
+            return self._report(fanout_id, state, started)
+        else:
+            print(f"[Notification Fanout] 🔁 {fanout_id} 이어서 진행 (완료 {state['sent']}명, "
+                  f"재시도 batch {len(state['failed_batches'])}개)", file=sys.stderr)
+        data = state['notification']
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # 1. 이전 실행에서 실패한 batch 재시도
+            retry = [user_id for failed in state['failed_batches'] for user_id in failed['user_ids']]
+            if retry:
+                state['failed_batches'] = []
+                self._settle(fanout_id, state, self._submit(pool, fanout_id, data, retry))
+
+            # 2. 커서 다음부터 페이지 단위로 진행 (commit하는 동안 다음 페이지 조회)
+            cursor = state.get('cursor')
+            pending = None
+            while True:
+                user_ids = self._fetch_user_ids(cursor)
+                jobs = self._submit(pool, fanout_id, data, user_ids) if user_ids else []
+                if pending is not None:
+                    self._settle(fanout_id, state, *pending)
+                pending = (jobs, user_ids[-1]) if user_ids else None
+                if len(user_ids) < self.page_size:
+                    break
+                cursor = user_ids[-1]
+            if pending is not None:
+                self._settle(fanout_id, state, *pending)
+
+        state['status'] = 'partial' if state['failed_batches'] else 'done'
+        self._save_state(fanout_id, state)
+        return self._report(fanout_id, state, started)
+
+    @staticmethod
+    def _report(fanout_id: str, state: Dict, started: float) -> Dict:
+        failed_batches = [{k: v for k, v in failed.items() if k != 'user_ids'} for failed in state['failed_batches']]
+        return {
+            'fanout_id': fanout_id,
+            'status': state['status'],
+            'sent': state['sent'],
+            'failed': sum(failed['count'] for failed in failed_batches),
+            'batches': state['batches'],
+            'failed_batches': failed_batches,
+            'elapsed_seconds': round(time.monotonic() - started, 2),
+        }
@@ -0,0 +1,60 @@
+"""
+AI 응답 캐시 모듈
+(모델명 + 최종 프롬프트)의 해시를 키로 Gemini 응답 원문을 로컬 캐시에 저장해
+같은 영상/게시글을 같은 프롬프트로 다시 분석할 때 API를 호출하지 않도록 합니다.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from modules.local_cache import DEFAULT_CACHE_FILE, SqliteCache
+
+try:
+    from config.settings import AI_SETTINGS
+except ImportError:
+    AI_SETTINGS = {}
+
+
+def prompt_cache_key(model_name: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode('utf-8')).hexdigest()
+
+
+class PromptResponseCache:
+    """프롬프트 → 응답 원문 캐시 (TTL + 용량 제한, GEMINI_RESPONSE_CACHE=off면 비활성)"""
+
+    def __init__(self, cache: Optional[SqliteCache] = None, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = (AI_SETTINGS.get('response_cache_enabled', True)
+                       and os.getenv('GEMINI_RESPONSE_CACHE', 'on').lower() not in ('off', '0', 'false'))
+        self.enabled = enabled
+        self._cache = cache or SqliteCache(
+            DEFAULT_CACHE_FILE,
+            table='gemini_responses',
+            max_bytes=int(AI_SETTINGS.get('response_cache_max_mb', 50)) * 1024 * 1024,
+            default_ttl=AI_SETTINGS.get('response_cache_ttl_days', 14) * 86400,
+        )
+
+    def get(self, model_name: str, prompt: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self._cache.get(prompt_cache_key(model_name, prompt))
+
+    def set(self, model_name: str, prompt: str, response_text: str):
+        """파싱까지 성공한 응답만 저장할 것 (실패한 응답을 캐시하면 재시도해도 같은 실패가 반복됨)"""
+        if self.enabled and response_text:
+            self._cache.set(prompt_cache_key(model_name, prompt), response_text)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_prompt_cache() -> PromptResponseCache:
+    """프로세스 공용 응답 캐시"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PromptResponseCache()
+        return _default_cache
@@ -0,0 +1,173 @@
+"""
+요청 속도 제한 모듈
+여러 스레드가 같은 호스트를 호출할 때 초당 요청 수를 넘지 않도록 조절하고,
+Gemini처럼 분당 요청/토큰 한도가 있는 API는 토큰 버킷으로 한도까지만 보내도록 합니다.
+"""
+
+import contextlib
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from modules.json_store import DATA_DIR, FileLock
+
+
+class RateLimiter:
+    """최소 호출 간격 기반 rate limiter (스레드 간 공유)"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """다음 호출 가능 시점까지 대기"""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+_host_limiters: Dict[str, RateLimiter] = {}
+_host_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(host: str, requests_per_second: float) -> RateLimiter:
+    """호스트별 공용 RateLimiter (처음 요청한 속도로 생성)"""
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_second)
+            _host_limiters[host] = limiter
+        return limiter
+
+
+class TokenBucket:
+    """분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷
+
+    한도까지는 바로 통과시키고, 버킷이 비면 필요한 만큼만 기다립니다.
+    state_path를 주면 상태를 파일에 두고 파일 잠금으로 보호해 여러 브릿지 프로세스가 같은 한도를 나눠 씁니다.
+    429 등으로 서버가 한도 초과를 알려 오면 penalize()로 모든 호출자를 잠시 멈춥니다.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None,
+                 state_path: Optional[Path] = None):
+        self.rpm = float(requests_per_minute)
+        self.tpm = float(tokens_per_minute) if tokens_per_minute else None
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._state = None  # 프로세스 내 전용 상태 (state_path가 없을 때)
+
+    def _load(self, now: float) -> Dict:
+        if self.state_path is None:
+            state = self._state
+        else:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = None
+        if not isinstance(state, dict):
+            state = {'requests': self.rpm, 'tokens': self.tpm or 0.0, 'updated_at': now, 'blocked_until': 0.0}
+        # 마지막 갱신 이후 흐른 시간만큼 채움 (최대 1분치)
+        elapsed = max(0.0, now - float(state.get('updated_at', now)))
+        state['requests'] = min(self.rpm, float(state.get('requests', 0.0)) + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            state['tokens'] = min(self.tpm, float(state.get('tokens', 0.0)) + elapsed * self.tpm / 60.0)
+        state['updated_at'] = now
+        return state
+
+    def _save(self, state: Dict):
+        if self.state_path is None:
+            self._state = state
+            return
+        try:
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        except OSError as e:
+            print(f"[RateLimiter] 상태 저장 실패 ({self.state_path.name}): {e}", file=sys.stderr)
+
+    def _locked(self):
+        if self.state_path is None:
+            return contextlib.nullcontext()
+        return FileLock(self.state_path.with_suffix(self.state_path.suffix + '.lock'))
+
+    def _try_take(self, tokens: float) -> float:
+        """지금 가져갈 수 있으면 차감 후 0, 아니면 기다려야 할 초"""
+        # 한 번에 TPM보다 큰 요청은 버킷이 가득 찼을 때 통과시킴 (영원히 막히지 않도록)
+        tokens = min(tokens, self.tpm) if self.tpm else 0.0
+        with self._lock, self._locked():
+            now = time.time()
+            state = self._load(now)
+            wait = max(0.0, float(state.get('blocked_until', 0.0)) - now)
+            if state['requests'] < 1:
+                wait = max(wait, (1 - state['requests']) * 60.0 / self.rpm)
+            if self.tpm and state['tokens'] < tokens:
+                wait = max(wait, (tokens - state['tokens']) * 60.0 / self.tpm)
+            if wait <= 0:
+                state['requests'] -= 1
+                if self.tpm:
+                    state['tokens'] -= tokens
+            self._save(state)
+            return wait
+
+    def acquire(self, tokens: float = 0, timeout: Optional[float] = None) -> float:
+        """요청 1건 + tokens만큼 가져올 때까지 대기하고 기다린 시간(초)을 반환
+        timeout 안에 못 가져오면 TimeoutError"""
+        started = time.monotonic()
+        while True:
+            wait = self._try_take(tokens)
+            if wait <= 0:
+                return time.monotonic() - started
+            if timeout is not None and time.monotonic() - started + wait > timeout:
+                raise TimeoutError(f"rate limit 대기 시간 초과 ({wait:.1f}초 더 필요)")
+            # 다른 프로세스가 먼저 가져갈 수 있으므로 짧게 나눠 자고 다시 확인
+            time.sleep(min(wait, 1.0))
+
+    def penalize(self, seconds: float):
+        """서버가 한도 초과(429)를 알려 온 경우 모든 호출자를 seconds 동안 멈춤"""
+        with self._lock, self._locked():
+            now = time.time()
+            state = self._load(now)
+            state['blocked_until'] = max(float(state.get('blocked_until', 0.0)), now + seconds)
+            state['requests'] = 0.0
+            self._save(state)
+
+
+def estimate_tokens(text: str) -> int:
+    """Gemini 입력 토큰 수 대략 추정 (한국어는 글자당 약 1토큰, 영문은 4글자당 약 1토큰)"""
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4 + 1
+
+
+_gemini_limiter = None
+_gemini_limiter_lock = threading.Lock()
+
+
+def get_gemini_limiter() -> TokenBucket:
+    """모든 Gemini 호출자가 공유하는 RPM/TPM 제한기 (설정에 따라 프로세스 간 공유)"""
+    global _gemini_limiter
+    with _gemini_limiter_lock:
+        if _gemini_limiter is None:
+            try:
+                from config.settings import GEMINI_RATE_LIMIT
+            except ImportError:
+                GEMINI_RATE_LIMIT = {}
+            state_path = None
+            if GEMINI_RATE_LIMIT.get('shared_across_processes', True):
+                state_path = DATA_DIR / 'gemini_rate_limit.json'
+            _gemini_limiter = TokenBucket(
+                GEMINI_RATE_LIMIT.get('requests_per_minute', 15),
+                GEMINI_RATE_LIMIT.get('tokens_per_minute', 1000000),
+                state_path=state_path,
+            )
+        return _gemini_limiter
@@ -11,6 +11,16 @@ import sys
 from datetime import datetime
 from typing import Dict, Optional
 
+from modules.json_response import (
+    RECRUIT_SCHEMA,
+    get_parse_metrics,
+    json_generation_config,
+    parse_json_response,
+    parse_with_fix,
+)
+from modules.prompt_cache import get_prompt_cache
+from modules.rate_limiter import estimate_tokens, get_gemini_limiter
+
 
 class RecruitAnalyzer:
     """방송국 모집 공고 데이터를 AI로 분석하여 JSON으로 변환하는 클래스"""
@@ -28,7 +38,12 @@ class RecruitAnalyzer:
             raise ValueError("Gemini API 키가 필요합니다. 환경변수 GEMINI_API_KEY를 설정하거나 api_key 파라미터를 제공하세요.")
         
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model_name = 'gemini-2.0-flash'
+        self.model = genai.GenerativeModel(self.model_name)
+        # 같은 공고를 다시 분석할 때 API 호출 없이 이전 응답 재사용
+        self.response_cache = get_prompt_cache()
+        # GeminiAnalyzer와 같은 분당 요청/토큰 한도를 공유
+        self.limiter = get_gemini_limiter()
         
         # 프롬프트 파일 로드
         self.prompt_template = self._load_prompt_template()
@@ -96,38 +111,49 @@ programId 매핑 (중요):
         
         # 프롬프트에 원문 삽입
         prompt = self.prompt_template.format(raw_text=raw_text)
+        prompt_tokens = estimate_tokens(prompt)
         
         try:
-            # AI 분석 요청
-            response = self.model.generate_content(prompt)
-            
-            # JSON 추출 (마크다운 코드 블록 제거)
-            response_text = response.text.strip()
-            
-            # JSON 부분만 추출
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if not json_match:
-                print(f"❌ JSON을 찾을 수 없습니다. 응답: {response_text[:200]}")
-                return None
+            # AI 분석 요청 (캐시된 응답이 있으면 재사용)
+            cached = self.response_cache.get(self.model_name, prompt)
+            data = parse_json_response(cached)[0] if cached else None
+            outcome = 'cache'
+            if isinstance(data, dict):
+                get_parse_metrics().record('recruit', 'cache', 1, prompt_tokens)
+            else:
+                cached = None
+                response_text = self._generate(prompt)
+                
+                # JSON 파싱 (잘린 JSON 복구 → 실패 시 짧은 수정 요청 1회)
+                data, outcome = parse_with_fix(response_text, 'recruit', prompt_tokens, fix_call=self._generate)
+                if not isinstance(data, dict):
+                    print(f"❌ JSON을 찾을 수 없습니다. 응답: {response_text[:200]}")
+                    return None
             
-            json_str = json_match.group(0)
-            data = json.loads(json_str)
+            # 보정 전 응답 (오늘 날짜 같은 기본값이 캐시에 굳지 않도록)
+            parsed_text = json.dumps(data, ensure_ascii=False)
             
             # 필수 필드 검증 및 보정
             data = self._validate_and_fix_data(data, official_url, thumbnail_url)
             
+            # 파싱/검증까지 성공한 응답만 캐시 (복구/수정한 응답은 잘린 필드가 있을 수 있어 제외)
+            if not cached and outcome not in ('repaired', 'fixed'):
+                self.response_cache.set(self.model_name, prompt, parsed_text)
+            
             return data
             
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON 파싱 오류: {e}")
-            print(f"응답 텍스트: {response_text[:500] if 'response_text' in locals() else 'N/A'}")
-            return None
         except Exception as e:
             print(f"❌ 분석 오류: {e}")
             import traceback
             traceback.print_exc()
             return None
     
+    def _generate(self, prompt: str) -> str:
+        """JSON 모드(RECRUIT_SCHEMA)로 Gemini 호출 (공용 rate limiter 한도 안에서)"""
+        self.limiter.acquire(estimate_tokens(prompt))
+        response = self.model.generate_content(prompt, generation_config=json_generation_config(RECRUIT_SCHEMA))
+        return response.text.strip()
+    
     def _validate_and_fix_data(self, data: Dict, official_url: str, thumbnail_url: str) -> Dict:
         """
         데이터 검증 및 보정
@@ -0,0 +1,166 @@
+"""
+프로그램(쇼) 키워드 매칭 모듈
+프로그램별 키워드 목록(레지스트리)으로 정규식 하나를 미리 컴파일해 두고,
+텍스트를 한 번만 훑어 어떤 프로그램 키워드가 어디에 등장하는지 모두 찾습니다.
+(키워드마다 `kw in text`를 반복하던 if/elif 체인 대체)
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 본문(제목+설명+자막) 기반 프로그램 분류 레지스트리 - 앞에 있을수록 우선순위가 높음
+# (더 구체적인 프로그램 먼저: 나솔사계/솔로지옥이 나는솔로보다 앞)
+SHOW_REGISTRY = [
+    # 1. LOVE
+    {'show_id': 'habsuk-matseon', 'category': 'LOVE', 'keywords': ['합숙맞선', '합숙 맞선']},
+    {'show_id': 'nasolsagye', 'category': 'LOVE', 'keywords': ['나솔사계', '나는 솔로 그 후', '사랑은 계속된다']},
+    {'show_id': 'solojihuk5', 'category': 'LOVE', 'keywords': ['솔로지옥', 'single\'s inferno', 'singles inferno']},
+    {'show_id': 'nasolo', 'category': 'LOVE', 'keywords': ['나는솔로', '나는 솔로', 'i am solo', '나솔']},
+    {'show_id': 'hwanseung4', 'category': 'LOVE', 'keywords': ['환승연애', '환연', '환글']},
+    {'show_id': 'dolsingles6', 'category': 'LOVE', 'keywords': ['돌싱글즈', '돌싱']},
+    {'show_id': 'kkeut-sarang', 'category': 'LOVE', 'keywords': ['끝사랑']},
+    {'show_id': 'yeonae-nammae', 'category': 'LOVE', 'keywords': ['연애남매']},
+    # 2. VICTORY
+    {'show_id': 'goal-girls-8', 'category': 'VICTORY',
+     'keywords': ['골때녀', '골 때리는 그녀들', '골때리는', 'fc탑걸', '발라드림', '액셔니스타', '구척장신', '개벤져스', '월드클라쓰']},
+    {'show_id': 'choegang-yagu-2025', 'category': 'VICTORY', 'keywords': ['최강야구', '최강 몬스터즈']},
+    {'show_id': 'steel-troops-w', 'category': 'VICTORY', 'keywords': ['강철부대']},
+    {'show_id': 'blood-game3', 'category': 'VICTORY', 'keywords': ['피의게임', '피의 게임']},
+    {'show_id': 'univ-war2', 'category': 'VICTORY', 'keywords': ['대학전쟁']},
+    {'show_id': 'culinary-class-wars2', 'category': 'VICTORY', 'keywords': ['흑백요리사']},
+    {'show_id': 'kick-together3', 'category': 'VICTORY', 'keywords': ['뭉쳐야찬다', '뭉쳐야 찬다', '뭉쳐야']},
+    {'show_id': 'iron-girls', 'category': 'VICTORY', 'keywords': ['무쇠소녀단', '무쇠소녀']},
+    {'show_id': 'no-exit-gameroom', 'category': 'VICTORY', 'keywords': ['노엑싯게임룸', '노엑싯']},
+    # 3. STAR
+    {'show_id': 'show-me-the-money-12', 'category': 'STAR', 'keywords': ['쇼미더머니', 'show me the money', 'smtm', '쇼미']},
+    {'show_id': 'mr-trot3', 'category': 'STAR', 'keywords': ['미스터트롯']},
+    {'show_id': 'mistrot4', 'category': 'STAR', 'keywords': ['미스트롯']},
+    {'show_id': 'active-king2', 'category': 'STAR', 'keywords': ['현역가왕']},
+    {'show_id': 'project7', 'category': 'STAR', 'keywords': ['프로젝트7', 'project 7', '프로젝트']},
+    {'show_id': 'universe-league', 'category': 'STAR', 'keywords': ['유니버스리그', '유니버스 리그']},
+    {'show_id': 'sing-again', 'category': 'STAR', 'keywords': ['싱어게인']},
+    {'show_id': 'rap-public', 'category': 'STAR', 'keywords': ['랩퍼블릭']},
+]
+
+# 크롤링 시 선택한 키워드 → 프로그램 매핑 레지스트리 (사용자 키워드는 본문보다 먼저 적용)
+USER_KEYWORD_REGISTRY = [
+    {'show_id': 'solojihuk5', 'category': 'LOVE', 'keywords': ['솔로지옥', 'single\'s inferno', 'singles inferno']},
+    {'show_id': 'habsuk-matseon', 'category': 'LOVE', 'keywords': ['합숙맞선', '합숙 맞선']},
+    {'show_id': 'nasolsagye', 'category': 'LOVE', 'keywords': ['나솔사계', '나는 솔로 그 후', '사랑은 계속된다']},
+    {'show_id': 'nasolo', 'category': 'LOVE', 'keywords': ['나는솔로', '나는 솔로', 'i am solo', '나솔']},
+    {'show_id': 'hwanseung4', 'category': 'LOVE', 'keywords': ['환승연애', '환연', '환글']},
+    {'show_id': 'dolsingles6', 'category': 'LOVE', 'keywords': ['돌싱글즈', '돌싱']},
+    {'show_id': 'kkeut-sarang', 'category': 'LOVE', 'keywords': ['끝사랑']},
+    {'show_id': 'yeonae-nammae', 'category': 'LOVE', 'keywords': ['연애남매']},
+    {'show_id': 'goal-girls-8', 'category': 'VICTORY', 'keywords': ['골때녀', '골 때리는', '골때리는']},
+    {'show_id': 'choegang-yagu-2025', 'category': 'VICTORY', 'keywords': ['최강야구']},
+    {'show_id': 'culinary-class-wars2', 'category': 'VICTORY', 'keywords': ['흑백요리사']},
+    {'show_id': 'blood-game3', 'category': 'VICTORY', 'keywords': ['피의게임', '피의 게임']},
+    # STAR는 하위 매핑 생략
+    {'show_id': 'mr-trot3', 'category': 'STAR', 'keywords': ['미스터트롯', '미스트롯', '현역가왕', '유니버스리그', '쇼미더머니']},
+]
+
+
+class ShowMatcher:
+    """프로그램 레지스트리로 만든 다중 키워드 매처
+
+    Args:
+        registry: [{'show_id', 'category'(선택), 'keywords'}] 목록. 순서가 곧 우선순위(0이 가장 높음)
+    """
+
+    def __init__(self, registry: Iterable[Dict]):
+        self.registry = list(registry)
+        # 키워드(소문자) → [(우선순위, 프로그램 정보)]
+        self._keyword_shows: Dict[str, List[Tuple[int, Dict]]] = {}
+        self._show_patterns: Dict[str, re.Pattern] = {}
+        for priority, entry in enumerate(self.registry):
+            keywords = [kw.lower() for kw in entry.get('keywords', []) if kw]
+            for keyword in keywords:
+                self._keyword_shows.setdefault(keyword, []).append((priority, entry))
+            if keywords:
+                self._show_patterns.setdefault(entry['show_id'], self._compile(keywords))
+
+        keywords = list(self._keyword_shows)
+        # 긴 키워드부터 시도해야 같은 위치에서 가장 긴 키워드가 잡힘 ('나솔사계' vs '나솔')
+        self._any_pattern = self._compile(keywords) if keywords else None
+        # 같은 위치에서 시작하는 더 짧은 키워드 (가장 긴 키워드의 접두어인 키워드)
+        self._prefixes = {
+            keyword: [other for other in keywords if other != keyword and keyword.startswith(other)]
+            for keyword in keywords
+        }
+
+    @staticmethod
+    def _compile(keywords: Iterable[str]) -> re.Pattern:
+        ordered = sorted(set(keywords), key=len, reverse=True)
+        return re.compile('|'.join(re.escape(kw) for kw in ordered))
+
+    def find_all(self, text: str) -> List[Dict]:
+        """텍스트에 등장하는 모든 프로그램 키워드 (위치순)
+
+        Returns:
+            [{'show_id', 'category', 'keyword', 'start', 'end', 'priority'}]
+        """
+        if not text or self._any_pattern is None:
+            return []
+        text = text.lower()
+        hits = []
+        pos = 0
+        while True:
+            # 매치 끝이 아니라 시작 다음 글자부터 다시 찾아 겹치는 키워드도 모두 잡음
+            # (lookahead finditer는 모든 위치에서 멈춰 훨씬 느림)
+            match = self._any_pattern.search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            pos = start + 1
+            longest = match.group()
+            for keyword in [longest] + self._prefixes[longest]:
+                for priority, entry in self._keyword_shows[keyword]:
+                    hits.append({
+                        'show_id': entry['show_id'],
+                        'category': entry.get('category'),
+                        'keyword': keyword,
+                        'start': start,
+                        'end': start + len(keyword),
+                        'priority': priority,
+                    })
+        return hits
+
+    def best(self, text: str) -> Optional[Dict]:
+        """우선순위가 가장 높은 프로그램 히트 (같으면 먼저 등장한 것). 없으면 None"""
+        hits = self.find_all(text)
+        if not hits:
+            return None
+        return min(hits, key=lambda hit: (hit['priority'], hit['start']))
+
+    def shows(self, text: str) -> Set[str]:
+        """텍스트에 등장하는 프로그램 ID 집합"""
+        return {hit['show_id'] for hit in self.find_all(text)}
+
+    def matches(self, text: str) -> bool:
+        """레지스트리 키워드가 하나라도 있는지 (첫 히트에서 중단)"""
+        return bool(text) and self._any_pattern is not None and self._any_pattern.search(text.lower()) is not None
+
+    def contains(self, text: str, show_id: str) -> bool:
+        """특정 프로그램 키워드가 있는지 (첫 히트에서 중단)"""
+        pattern = self._show_patterns.get(show_id)
+        return bool(text) and pattern is not None and pattern.search(text.lower()) is not None
+
+
+@lru_cache(maxsize=None)
+def get_show_matcher() -> ShowMatcher:
+    """본문 기반 프로그램 분류 매처 (SHOW_REGISTRY, 프로세스당 1회 컴파일)"""
+    return ShowMatcher(SHOW_REGISTRY)
+
+
+@lru_cache(maxsize=None)
+def get_user_keyword_matcher() -> ShowMatcher:
+    """크롤링 키워드 기반 프로그램 분류 매처 (USER_KEYWORD_REGISTRY)"""
+    return ShowMatcher(USER_KEYWORD_REGISTRY)
+
+
+@lru_cache(maxsize=256)
+def keyword_matcher(keywords: Tuple[str, ...]) -> ShowMatcher:
+    """임의 키워드 목록용 매처 (같은 키워드 목록은 한 번만 컴파일)"""
+    return ShowMatcher([{'show_id': 'keywords', 'keywords': list(keywords)}])
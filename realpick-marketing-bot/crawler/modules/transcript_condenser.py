@@ -0,0 +1,115 @@
+"""
+자막 압축 모듈
+Gemini 프롬프트에 넣기 전에 자막에서 정보가 많은 구간만 골라 글자 수 예산 안으로 줄입니다.
+(앞부분 transcript[:3000]만 자르던 방식 대체 - 인트로 잡담 대신 출연진/프로그램 언급이 많은 구간을 보냄)
+
+처리 순서:
+  1. [음악], [박수] 같은 효과음 태그 제거, 연속으로 반복되는 자막 구절 하나로 합치기
+  2. 단어 window_words개씩 구간으로 나누고, 앞에서 본 구간과 같은 구간은 제외
+  3. 출연진 이름/프로그램 키워드 밀도 + 고유 단어 비율 + (약하게) 뒤쪽 위치로 점수 계산
+  4. 점수가 높은 구간부터 max_chars까지 고른 뒤 원래 순서대로 이어 붙임
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+from modules.show_matcher import get_show_matcher, keyword_matcher
+
+try:
+    from config.settings import TRANSCRIPT_CONDENSE_SETTINGS
+except ImportError:
+    TRANSCRIPT_CONDENSE_SETTINGS = {}
+
+# 자동 생성 자막의 효과음/상황 태그
+_TAG_PATTERN = re.compile(r'\[[^\]]{0,20}\]|\([^)]{0,20}\)')
+# 제목에서 출연진 이름 등 후보 단어 (2글자 이상)
+_TITLE_TERM_PATTERN = re.compile(r'[가-힣A-Za-z0-9]{2,}')
+# 구간 사이에 생략된 부분 표시
+GAP_MARKER = ' … '
+
+
+def _collapse_repeats(tokens: List[str], max_phrase: int = 6) -> List[str]:
+    """바로 앞과 같은 구절(1~max_phrase 단어)이 다시 나오면 건너뜀 ('네 네 네', 같은 자막 줄 반복 등)"""
+    out: List[str] = []
+    i = 0
+    while i < len(tokens):
+        for n in range(min(max_phrase, len(out), len(tokens) - i), 0, -1):
+            if out[-n:] == tokens[i:i + n]:
+                i += n
+                break
+        else:
+            out.append(tokens[i])
+            i += 1
+    return out
+
+
+def title_terms(title: str) -> List[str]:
+    """제목에서 뽑은 후보 단어 (출연진 이름, 사건 키워드 등)"""
+    return list(dict.fromkeys(_TITLE_TERM_PATTERN.findall((title or '').lower())))
+
+
+def condense_transcript(transcript: str, max_chars: Optional[int] = None,
+                        terms: Iterable[str] = ()) -> str:
+    """자막에서 정보가 많은 구간만 골라 max_chars 이내로 압축
+
+    Args:
+        transcript: 자막 전체 텍스트 (자막 조각을 공백으로 이어 붙인 형태)
+        max_chars: 결과 최대 길이 (기본 TRANSCRIPT_CONDENSE_SETTINGS['max_chars'])
+        terms: 점수에 더할 단어 (출연진 이름, 제목 단어 등). 프로그램 키워드와 설정의 출연진 이름은 항상 포함
+    """
+    settings = TRANSCRIPT_CONDENSE_SETTINGS
+    max_chars = int(max_chars or settings.get('max_chars', 3000))
+    window_words = int(settings.get('window_words', 40))
+    late_bias = float(settings.get('late_bias', 0.2))
+
+    tokens = _collapse_repeats(_TAG_PATTERN.sub(' ', transcript or '').split())
+    text = ' '.join(tokens)
+    if len(text) <= max_chars:
+        return text
+
+    # 구간 나누기 + 같은 구간 제외 (공백 차이 무시)
+    windows = []
+    seen = set()
+    for start in range(0, len(tokens), window_words):
+        chunk = tokens[start:start + window_words]
+        normalized = ''.join(chunk)
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        windows.append({'index': start // window_words, 'text': ' '.join(chunk), 'words': chunk})
+
+    cast = tuple(dict.fromkeys(
+        [name.lower() for name in settings.get('cast_names', [])] + [t.lower() for t in terms if t]
+    ))
+    cast_matcher = keyword_matcher(cast) if cast else None
+    show_matcher = get_show_matcher()
+    last_index = max(windows[-1]['index'], 1)
+
+    for window in windows:
+        hits = len(show_matcher.find_all(window['text']))
+        if cast_matcher is not None:
+            hits += len(cast_matcher.find_all(window['text']))
+        words = window['words']
+        density = hits / len(words)
+        unique_ratio = len(set(words)) / len(words)
+        window['score'] = density * 10 + unique_ratio + late_bias * window['index'] / last_index
+
+    # 점수 높은 구간부터 예산까지 선택 → 원래 순서로 복원
+    picked = []
+    used = 0
+    for window in sorted(windows, key=lambda w: w['score'], reverse=True):
+        cost = len(window['text']) + len(GAP_MARKER)
+        if used + cost > max_chars:
+            continue
+        picked.append(window)
+        used += cost
+    picked.sort(key=lambda w: w['index'])
+
+    parts = []
+    previous = None
+    for window in picked:
+        if previous is not None:
+            parts.append(' ' if window['index'] == previous + 1 else GAP_MARKER)
+        parts.append(window['text'])
+        previous = window['index']
+    return ''.join(parts)
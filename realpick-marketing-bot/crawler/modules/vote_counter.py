@@ -0,0 +1,209 @@
+"""
+미션 투표 분산 카운터 모듈
+투표마다 missions1 문서를 읽고 optionVoteCounts 전체를 다시 쓰면 동시 투표가 유실되고,
+문서 하나에 초당 1회 정도만 쓸 수 있어 생방송 중 투표가 몰리면 밀립니다.
+
+  - 투표는 missions1/{missionId}/voteShards/{0..N-1} 중 임의의 샤드에 Increment로만 기록 (읽기 없음)
+  - 주기적으로 샤드 값을 missions1 문서에 더하고 샤드에서는 같은 만큼 빼는 롤업 (트랜잭션)
+    → 웹 앱이 missions1에 직접 더한 투표와 섞여도 덮어쓰지 않음
+  - optionVoteCounts 키는 웹 앱(sanitizeFieldKey)과 같은 규칙으로 변환
+"""
+
+import random
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from firebase_admin import firestore
+from google.api_core.exceptions import FailedPrecondition
+
+try:
+    from config.settings import VOTE_COUNTER_SETTINGS
+except ImportError:
+    VOTE_COUNTER_SETTINGS = {}
+
+SHARD_COLLECTION = 'voteShards'
+
+# 이 프로세스에서 샤드 투표를 기록한 미션 (상주 브릿지가 없을 때 명령 끝에 바로 롤업하기 위함)
+_touched_missions = set()
+_touched_lock = threading.Lock()
+
+
+def pop_touched_mission_ids() -> List[str]:
+    """이 프로세스에서 샤드에 투표를 기록한 미션 ID (반환 후 비움)"""
+    with _touched_lock:
+        mission_ids = sorted(_touched_missions)
+        _touched_missions.clear()
+    return mission_ids
+
+# Firestore 필드 키로 쓸 수 없는 문자 치환 (lib/utils/sanitize-firestore-key.ts와 동일)
+_FIELD_KEY_REPLACEMENTS = (
+    ('.', '__dot__'),
+    ('$', '__dollar__'),
+    ('[', '__lbracket__'),
+    (']', '__rbracket__'),
+    ('#', '__hash__'),
+    ('/', '__slash__'),
+)
+
+
+def sanitize_field_key(key: str) -> str:
+    """선택지 텍스트 → optionVoteCounts 키"""
+    for char, replacement in _FIELD_KEY_REPLACEMENTS:
+        key = key.replace(char, replacement)
+    return key
+
+
+class ShardedVoteCounter:
+    """미션별 샤드 투표 카운터
+
+    샤드 문서 형식:
+        {"optionVoteCounts": {<key>: n}, "participants": n, "totalVotes": n}
+
+    Args:
+        db: firestore.client()
+        num_shards: 미션당 샤드 수 (샤드 하나당 초당 약 1회 쓰기 → 초당 num_shards표까지 수용)
+    """
+
+    def __init__(self, db, num_shards: Optional[int] = None):
+        self.db = db
+        self.num_shards = max(1, int(num_shards or VOTE_COUNTER_SETTINGS.get('num_shards', 10)))
+
+    def _shards(self, mission_id: str):
+        return self.db.collection('missions1').document(mission_id).collection(SHARD_COLLECTION)
+
+    def increment_write(self, mission_id: str, option_value: str, votes: int = 1) -> Tuple[object, Dict]:
+        """투표 1건을 기록할 (샤드 문서, 데이터) - batch/transaction에서 set(..., merge=True)로 사용"""
+        shard_ref = self._shards(mission_id).document(str(random.randrange(self.num_shards)))
+        with _touched_lock:
+            _touched_missions.add(mission_id)
+        return shard_ref, {
+            'optionVoteCounts': {sanitize_field_key(str(option_value)): firestore.Increment(votes)},
+            'participants': firestore.Increment(votes),
+            'totalVotes': firestore.Increment(votes),
+        }
+
+    def increment(self, mission_id: str, option_value: str, votes: int = 1):
+        """투표 기록 (읽기 없이 샤드 하나에 원자적 증가)"""
+        shard_ref, data = self.increment_write(mission_id, option_value, votes)
+        shard_ref.set(data, merge=True)
+
+    @staticmethod
+    def _sum(shard_docs) -> Tuple[Counter, int, int]:
+        option_counts = Counter()
+        participants = total_votes = 0
+        for doc in shard_docs:
+            data = doc.to_dict() or {}
+            for key, count in (data.get('optionVoteCounts') or {}).items():
+                option_counts[key] += int(count or 0)
+            participants += int(data.get('participants') or 0)
+            total_votes += int(data.get('totalVotes') or 0)
+        return option_counts, participants, total_votes
+
+    def pending(self, mission_id: str) -> Dict:
+        """아직 missions1에 롤업되지 않은 샤드 합계"""
+        option_counts, participants, total_votes = self._sum(self._shards(mission_id).stream())
+        return {'optionVoteCounts': dict(option_counts), 'participants': participants, 'totalVotes': total_votes}
+
+    def totals(self, mission_id: str) -> Dict:
+        """missions1 값 + 롤업 전 샤드 값 (실시간 집계 확인용)"""
+        mission_doc = self.db.collection('missions1').document(mission_id).get()
+        mission = (mission_doc.to_dict() or {}) if mission_doc.exists else {}
+        pending = self.pending(mission_id)
+        option_counts = Counter({key: int(count or 0) for key, count in (mission.get('optionVoteCounts') or {}).items()})
+        option_counts.update(pending['optionVoteCounts'])
+        return {
+            'optionVoteCounts': dict(option_counts),
+            'participants': int(mission.get('participants') or 0) + pending['participants'],
+            'totalVotes': int((mission.get('stats') or {}).get('totalVotes') or 0) + pending['totalVotes'],
+        }
+
+    def drain(self, transaction, mission_id: str) -> Dict:
+        """트랜잭션 안에서 샤드 값을 읽고 같은 만큼 샤드에서 빼는 쓰기를 추가
+        (읽은 뒤 들어온 증가분은 샤드에 남음, 트랜잭션의 다른 읽기를 모두 끝낸 뒤 호출)
+
+        Returns:
+            뺀 값 {'optionVoteCounts', 'participants', 'totalVotes'}
+        """
+        shard_docs = list(self._shards(mission_id).stream(transaction=transaction))
+        option_counts, participants, total_votes = self._sum(shard_docs)
+        for doc in shard_docs:
+            data = doc.to_dict() or {}
+            options = {key: int(n or 0) for key, n in (data.get('optionVoteCounts') or {}).items() if n}
+            shard_participants = int(data.get('participants') or 0)
+            shard_votes = int(data.get('totalVotes') or 0)
+            if not options and not shard_participants and not shard_votes:
+                continue
+            transaction.set(doc.reference, {
+                'optionVoteCounts': {key: firestore.Increment(-n) for key, n in options.items()},
+                'participants': firestore.Increment(-shard_participants),
+                'totalVotes': firestore.Increment(-shard_votes),
+            }, merge=True)
+        return {'optionVoteCounts': dict(option_counts), 'participants': participants, 'totalVotes': total_votes}
+
+    def rollup(self, mission_id: str) -> Dict:
+        """샤드 값을 missions1에 더하고 샤드에서 같은 만큼 빼기 (한 트랜잭션)
+
+        Returns:
+            옮긴 값 {'optionVoteCounts', 'participants', 'totalVotes'} (옮길 것이 없으면 totalVotes 0)
+        """
+        mission_ref = self.db.collection('missions1').document(mission_id)
+        shards = self._shards(mission_id)
+
+        @firestore.transactional
+        def move(transaction):
+            if not mission_ref.get(transaction=transaction).exists:
+                # 삭제된 미션: 샤드만 정리
+                for doc in shards.select([]).stream(transaction=transaction):
+                    transaction.delete(doc.reference)
+                return {'optionVoteCounts': {}, 'participants': 0, 'totalVotes': 0}
+            moved = self.drain(transaction, mission_id)
+            option_counts = {key: n for key, n in moved['optionVoteCounts'].items() if n}
+            if not moved['participants'] and not moved['totalVotes'] and not option_counts:
+                return moved
+            transaction.set(mission_ref, {
+                'optionVoteCounts': {key: firestore.Increment(n) for key, n in option_counts.items()},
+                'participants': firestore.Increment(moved['participants']),
+                'stats': {'totalVotes': firestore.Increment(moved['totalVotes'])},
+                'updatedAt': firestore.SERVER_TIMESTAMP,
+            }, merge=True)
+            return moved
+
+        return move(self.db.transaction())
+
+    def pending_mission_ids(self) -> List[str]:
+        """롤업할 투표가 남은 미션 ID (voteShards 컬렉션 그룹 조회)
+
+        voteShards.totalVotes 컬렉션 그룹 단일 필드 색인이 필요함 (기본으로 만들어지지 않음).
+        저장소 루트의 firestore.indexes.json에 정의 → firebase deploy --only firestore:indexes
+        """
+        query = self.db.collection_group(SHARD_COLLECTION).where('totalVotes', '>', 0).select([])
+        try:
+            return list(dict.fromkeys(doc.reference.parent.parent.id for doc in query.stream()))
+        except FailedPrecondition as e:
+            raise RuntimeError(
+                f"{SHARD_COLLECTION}.totalVotes 컬렉션 그룹 색인이 없습니다. "
+                f"firebase deploy --only firestore:indexes 로 firestore.indexes.json을 배포하세요. ({e})"
+            ) from e
+
+    def rollup_all(self, mission_ids: Optional[Iterable[str]] = None) -> Dict:
+        """여러 미션 롤업 (mission_ids가 없으면 대기 중인 미션 전체)
+
+        Returns:
+            {'missions': 롤업한 미션 수, 'votes': 옮긴 투표 수, 'failed': {mission_id: 오류}}
+        """
+        if mission_ids is None:
+            mission_ids = self.pending_mission_ids()
+        report = {'missions': 0, 'votes': 0, 'failed': {}}
+        for mission_id in mission_ids:
+            try:
+                moved = self.rollup(mission_id)
+            except Exception as e:
+                report['failed'][mission_id] = str(e)
+                print(f"[Vote Counter] ⚠️ 롤업 실패 ({mission_id}): {e}", file=sys.stderr)
+                continue
+            if moved['totalVotes']:
+                report['missions'] += 1
+                report['votes'] += moved['totalVotes']
+        return report
@@ -0,0 +1,306 @@
+"""
+YouTube Data API 공용 클라이언트
+호출마다 할당량(unit)을 계산하여 일별 사용량을 로컬 파일에 기록하고,
+남은 할당량이 부족하면 우선순위가 낮은 호출부터 미룹니다.
+동기(requests.Session) 클라이언트와 httpx 기반 비동기 클라이언트를 제공하며,
+둘 다 연결을 재사용하고 5xx / 속도 제한(403, 429) 응답은 지수 백오프로 재시도합니다.
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.json_store import DATA_DIR, JsonFileStore
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원용)
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+try:
+    from config.settings import YOUTUBE_QUOTA_SETTINGS
+except ImportError:
+    YOUTUBE_QUOTA_SETTINGS = {}
+
+try:
+    from config.settings import YOUTUBE_HTTP_SETTINGS
+except ImportError:
+    YOUTUBE_HTTP_SETTINGS = {}
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # zoneinfo/tzdata가 없으면 태평양 표준시 고정 오프셋 사용
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+# 엔드포인트별 호출 비용 (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'search': 100,
+    'videos': 1,
+    'channels': 1,
+    'playlistItems': 1,
+    'playlists': 1,
+    'commentThreads': 1,
+}
+
+PRIORITIES = ('high', 'medium', 'low')
+
+# 403이어도 잠시 후 재시도하면 되는 사유 (quotaExceeded는 일일 할당량이라 재시도하지 않음)
+RETRYABLE_403_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+DEFAULT_QUOTA_FILE = DATA_DIR / 'youtube_quota.json'
+
+
+class QuotaExceededError(Exception):
+    """남은 할당량이 부족해 호출을 미룬 경우"""
+
+
+def priority_rank(priority: Optional[str]) -> int:
+    """'high' → 0, 'medium' → 1, 'low' → 2 (알 수 없으면 medium)"""
+    try:
+        return PRIORITIES.index(priority)
+    except ValueError:
+        return PRIORITIES.index('medium')
+
+
+class QuotaTracker:
+    """YouTube API 일별 할당량 사용량 기록 (태평양 시간 자정 기준 초기화)"""
+
+    def __init__(self, path: Optional[Path] = None, daily_limit: Optional[int] = None,
+                 reserve: Optional[Dict[str, int]] = None):
+        self.path = Path(path or YOUTUBE_QUOTA_SETTINGS.get('usage_file') or DEFAULT_QUOTA_FILE)
+        self.daily_limit = int(daily_limit or YOUTUBE_QUOTA_SETTINGS.get('daily_limit', 10000))
+        # 우선순위별로 남겨둘 할당량 (low 크롤링이 high 몫까지 쓰지 않도록)
+        self.reserve = reserve or YOUTUBE_QUOTA_SETTINGS.get('reserve', {'high': 0, 'medium': 1000, 'low': 3000})
+        self._store = JsonFileStore(self.path)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(_QUOTA_TZ).strftime('%Y-%m-%d')
+
+    def _today_usage(self, data: Dict) -> Dict:
+        today = self._today()
+        if data.get('date') == today:
+            return data
+        return {'date': today, 'used': 0, 'by_endpoint': {}}
+
+    def used(self) -> int:
+        return int(self._today_usage(self._store.load()).get('used', 0))
+
+    def remaining(self) -> int:
+        return max(self.daily_limit - self.used(), 0)
+
+    def can_spend(self, units: int, priority: str = 'medium') -> bool:
+        """해당 우선순위로 units만큼 써도 예약분이 남는지 확인"""
+        reserve = int(self.reserve.get(priority, 0))
+        return self.remaining() - reserve >= units
+
+    def record(self, endpoint: str, units: int):
+        """호출 비용 기록"""
+        def add(data):
+            data = self._today_usage(data)
+            data['used'] = int(data.get('used', 0)) + units
+            by_endpoint = data.setdefault('by_endpoint', {})
+            by_endpoint[endpoint] = int(by_endpoint.get(endpoint, 0)) + units
+            return data
+        self._store.update(add)
+
+    def summary(self) -> Dict:
+        data = self._today_usage(self._store.load())
+        return {
+            'date': data['date'],
+            'used': data.get('used', 0),
+            'remaining': max(self.daily_limit - int(data.get('used', 0)), 0),
+            'daily_limit': self.daily_limit,
+            'by_endpoint': data.get('by_endpoint', {}),
+        }
+
+
+_default_tracker = None
+_default_tracker_lock = threading.Lock()
+
+
+def get_quota_tracker() -> QuotaTracker:
+    """프로세스 공용 QuotaTracker (상주 브릿지에서 요청 간 공유)"""
+    global _default_tracker
+    with _default_tracker_lock:
+        if _default_tracker is None:
+            _default_tracker = QuotaTracker()
+        return _default_tracker
+
+
+def should_retry(status_code: int, data: Dict) -> bool:
+    """일시적인 오류인지 판단 (5xx, 429, 속도 제한 403)"""
+    if status_code >= 500 or status_code == 429:
+        return True
+    if status_code == 403:
+        errors = (data.get('error') or {}).get('errors') or []
+        return any(e.get('reason') in RETRYABLE_403_REASONS for e in errors)
+    return False
+
+
+def backoff_delay(attempt: int, base: float) -> float:
+    """지수 백오프 + 지터 (최대 30초)"""
+    return min(base * (2 ** attempt), 30.0) + random.uniform(0, base)
+
+
+def _response_json(status_code: int, text_fn, json_fn) -> Dict:
+    """응답 본문을 딕셔너리로 (5xx 게이트웨이 오류처럼 JSON이 아니면 error 형태로 감쌈)"""
+    try:
+        data = json_fn()
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+    return {'error': {'code': status_code, 'message': text_fn()[:200]}}
+
+
+class YouTubeApiClient:
+    """할당량을 기록하며 YouTube Data API를 호출하는 클라이언트 (keep-alive 세션 재사용)"""
+
+    def __init__(self, api_key: str, tracker: Optional[QuotaTracker] = None,
+                 base_url: str = "https://www.googleapis.com/youtube/v3",
+                 timeout: Optional[float] = None, max_retries: Optional[int] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.tracker = tracker or get_quota_tracker()
+        self.timeout = timeout or YOUTUBE_HTTP_SETTINGS.get('timeout', 10)
+        self.max_retries = YOUTUBE_HTTP_SETTINGS.get('max_retries', 3) if max_retries is None else max_retries
+        self.backoff_base = YOUTUBE_HTTP_SETTINGS.get('backoff_base', 1.0)
+        # 호출마다 새 TLS 연결을 맺지 않도록 세션(연결 풀) 재사용
+        max_connections = YOUTUBE_HTTP_SETTINGS.get('max_connections', 10)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max_connections))
+
+    def _check_budget(self, endpoint: str, priority: str) -> int:
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        if not self.tracker.can_spend(cost, priority):
+            raise QuotaExceededError(
+                f"YouTube API 할당량 부족: {endpoint} ({cost} units, 우선순위 {priority}), "
+                f"남은 할당량 {self.tracker.remaining()}"
+            )
+        return cost
+
+    def get(self, endpoint: str, params: Dict, priority: str = 'medium') -> Dict:
+        """GET 호출. 할당량이 부족하면 QuotaExceededError"""
+        cost = self._check_budget(endpoint, priority)
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, params={**params, 'key': self.api_key}, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base)
+                print(f"[YouTube API] {endpoint} 연결 오류, {delay:.1f}초 후 재시도: {e}", file=sys.stderr)
+                time.sleep(delay)
+                continue
+
+            # 오류 응답도 할당량을 소모하므로 항상 기록
+            self.tracker.record(endpoint, cost)
+            data = _response_json(response.status_code, lambda: response.text, response.json)
+            if attempt < self.max_retries and should_retry(response.status_code, data):
+                delay = backoff_delay(attempt, self.backoff_base)
+                print(f"[YouTube API] {endpoint} {response.status_code} 응답, {delay:.1f}초 후 재시도", file=sys.stderr)
+                time.sleep(delay)
+                continue
+            return data
+
+    def remaining_budget(self) -> int:
+        return self.tracker.remaining()
+
+
+class AsyncYouTubeApiClient(YouTubeApiClient):
+    """httpx 기반 비동기 클라이언트 (HTTP/2 + 연결 풀, 하나의 이벤트 루프에서 여러 호출을 동시에 처리)
+
+    사용법:
+        async with AsyncYouTubeApiClient(api_key) as client:
+            data = await client.aget('search', params)
+    """
+
+    def __init__(self, api_key: str, tracker: Optional[QuotaTracker] = None,
+                 base_url: str = "https://www.googleapis.com/youtube/v3",
+                 timeout: Optional[float] = None, max_retries: Optional[int] = None):
+        if not HAS_HTTPX:
+            raise ImportError("httpx가 설치되지 않았습니다. pip install httpx")
+        super().__init__(api_key, tracker=tracker, base_url=base_url, timeout=timeout, max_retries=max_retries)
+        max_connections = YOUTUBE_HTTP_SETTINGS.get('max_connections', 10)
+        self.http = httpx.AsyncClient(
+            http2=HAS_H2,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.http.aclose()
+        self.session.close()
+
+    async def aget(self, endpoint: str, params: Dict, priority: str = 'medium') -> Dict:
+        """비동기 GET 호출. 할당량이 부족하면 QuotaExceededError"""
+        cost = self._check_budget(endpoint, priority)
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.http.get(url, params={**params, 'key': self.api_key})
+            except httpx.HTTPError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base)
+                print(f"[YouTube API] {endpoint} 연결 오류, {delay:.1f}초 후 재시도: {e}", file=sys.stderr)
+                await asyncio.sleep(delay)
+                continue
+
+            # 오류 응답도 할당량을 소모하므로 항상 기록
+            self.tracker.record(endpoint, cost)
+            data = _response_json(response.status_code, lambda: response.text, response.json)
+            if attempt < self.max_retries and should_retry(response.status_code, data):
+                delay = backoff_delay(attempt, self.backoff_base)
+                print(f"[YouTube API] {endpoint} {response.status_code} 응답, {delay:.1f}초 후 재시도", file=sys.stderr)
+                await asyncio.sleep(delay)
+                continue
+            return data
+
+
+def schedule_by_priority(tasks: List[Dict], tracker: QuotaTracker,
+                         cost_key: str = 'estimated_cost') -> Tuple[List[Dict], List[Dict]]:
+    """우선순위가 높은 작업부터 남은 할당량 안에서 실행 목록을 만들고 나머지는 미룸
+
+    Args:
+        tasks: 'priority'와 예상 비용(cost_key)을 가진 작업 목록
+    Returns:
+        (실행할 작업, 미룬 작업)
+    """
+    ordered = sorted(tasks, key=lambda t: priority_rank(t.get('priority')))
+    budget = tracker.remaining()
+    runnable, deferred = [], []
+    for task in ordered:
+        cost = int(task.get(cost_key, 0))
+        reserve = int(tracker.reserve.get(task.get('priority', 'medium'), 0))
+        if budget - reserve >= cost:
+            runnable.append(task)
+            budget -= cost
+        else:
+            deferred.append(task)
+    return runnable, deferred
@@ -3,21 +3,83 @@ YouTube 크롤링 모듈
 유튜브 채널의 최신 영상 정보를 수집합니다.
 """
 
+import asyncio
+import contextvars
 import os
-import requests
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import json
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 
+from modules.crawl_cursor import CrawlCursorStore
+from modules.json_store import DATA_DIR, JsonFileStore
+from modules.local_cache import DEFAULT_CACHE_FILE, SqliteCache
+from modules.rate_limiter import get_host_limiter
+from modules.show_matcher import ShowMatcher, keyword_matcher
+from modules.youtube_api_client import (
+    HAS_HTTPX,
+    QUOTA_COSTS,
+    AsyncYouTubeApiClient,
+    QuotaExceededError,
+    YouTubeApiClient,
+    schedule_by_priority,
+)
+
+try:
+    from config.settings import TRANSCRIPT_SETTINGS
+except ImportError:
+    TRANSCRIPT_SETTINGS = {}
+
+# 자막 선택 우선순위 (언어, 자동생성 여부)
+TRANSCRIPT_PRIORITY = [('ko', False), ('ko', True), ('en', False), ('en', True)]
+
+_transcript_cache = None
+_transcript_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> SqliteCache:
+    """프로세스 공용 자막 캐시 (video_id, 언어, 자동생성 여부 단위로 저장)"""
+    global _transcript_cache
+    with _transcript_cache_lock:
+        if _transcript_cache is None:
+            _transcript_cache = SqliteCache(
+                DEFAULT_CACHE_FILE,
+                table='transcripts',
+                max_bytes=int(TRANSCRIPT_SETTINGS.get('cache_max_mb', 200)) * 1024 * 1024,
+                default_ttl=TRANSCRIPT_SETTINGS.get('cache_ttl_days', 30) * 86400,
+            )
+        return _transcript_cache
+
+
 class YouTubeCrawler:
     """YouTube API를 사용한 채널 크롤링 클래스"""
     
-    def __init__(self, api_key: str):
+    # videos.list / channels.list의 id 파라미터 최대 개수
+    MAX_IDS_PER_REQUEST = 50
+    
+    def __init__(self, api_key: str, client: Optional[YouTubeApiClient] = None,
+                 transcript_workers: Optional[int] = None):
         self.api_key = api_key
         self.base_url = "https://www.googleapis.com/youtube/v3"
+        # 모든 API 호출은 할당량을 기록하는 공용 클라이언트를 거침
+        self.client = client or YouTubeApiClient(api_key, base_url=self.base_url)
+        # 할당량 부족으로 이번 실행에서 미룬 채널 (crawl_target_channels)
+        self.deferred_channels = []
+        # 채널명 → 채널 ID / 업로드 재생목록 ID 캐시 (채널은 한 번만 resolve)
+        self.channel_cache = JsonFileStore(DATA_DIR / 'youtube_channel_cache.json')
+        # 자막 조회 동시 작업 수 / youtube.com 초당 요청 수
+        self.transcript_workers = transcript_workers or TRANSCRIPT_SETTINGS.get('max_workers', 8)
+        self.transcript_limiter = get_host_limiter('www.youtube.com', TRANSCRIPT_SETTINGS.get('requests_per_second', 5))
+        # 자막은 디스크 캐시를 먼저 확인 (재분석 시 YouTube 재호출 방지)
+        self.transcript_cache = get_transcript_cache()
+        # 증분 크롤링 커서 (키워드/채널별 마지막 게시 시각 + 처리한 영상 ID)
+        self.cursors = CrawlCursorStore()
+        # 증분 크롤링에서 이미 처리한 영상의 최신 통계 (video_id → 조회수 등)
+        self.refreshed_stats = {}
         
         # 프로그램별 키워드 매핑 (정확한 필터링을 위해)
         self.program_keywords = {
@@ -33,49 +95,50 @@ class YouTubeCrawler:
             "현역가왕": ["현역가왕"],
             "쇼미더머니": ["쇼미더머니", "쇼미더머니12", "Show Me The Money", "SMTM"]
         }
+        # 위 키워드로 한 번만 컴파일한 매처 (프로그램명을 show_id로 사용)
+        self.program_matcher = ShowMatcher(
+            {'show_id': program, 'keywords': keywords} for program, keywords in self.program_keywords.items()
+        )
+        # 함께 잡히면 관련 없는 영상으로 보는 프로그램 (예: "나는솔로"로 검색했는데 "솔로지옥" 영상)
+        self.exclusive_programs = {
+            "나는솔로": ["솔로지옥"],
+            "솔로지옥": ["나는솔로"],
+        }
+    
+    def _program_hits(self, text: str, search_keyword: str) -> bool:
+        """텍스트에 검색 키워드에 해당하는 프로그램 키워드가 있는지"""
+        if search_keyword in self.program_keywords:
+            return self.program_matcher.contains(text, search_keyword)
+        return keyword_matcher((search_keyword,)).matches(text)
     
     def is_relevant_video(self, video_info: Dict, search_keyword: str) -> bool:
         """영상이 검색 키워드와 관련이 있는지 확인 (제목, 설명, 자막 확인)"""
-        title = video_info.get('title', '').lower()
-        description = video_info.get('description', '').lower()
-        
-        # 검색 키워드에 해당하는 프로그램 키워드 목록 가져오기
-        program_keywords_list = self.program_keywords.get(search_keyword, [search_keyword])
+        text = f"{video_info.get('title', '')}\n{video_info.get('description', '')}"
         
         # 제목이나 설명에 프로그램 키워드가 포함되어 있는지 확인
-        for keyword in program_keywords_list:
-            if keyword.lower() in title or keyword.lower() in description:
-                # 다른 프로그램 키워드와 겹치지 않는지 확인
-                # 예: "나는솔로"로 검색했는데 "솔로지옥"이 나오는 경우 방지
-                if search_keyword == "나는솔로":
-                    # "솔로지옥" 관련 키워드가 포함되어 있으면 제외
-                    if any(kw in title or kw in description for kw in ["솔로지옥", "Single's Inferno", "싱글즈 인페르노"]):
-                        return False
-                elif search_keyword == "솔로지옥":
-                    # "나는솔로" 관련 키워드가 포함되어 있으면 제외
-                    if any(kw in title or kw in description for kw in ["나는솔로", "나솔", "I am SOLO"]):
-                        return False
-                return True
-        
-        return False
+        if not self._program_hits(text, search_keyword):
+            return False
         
-    def get_channel_id(self, channel_name: str) -> Optional[str]:
+        # 다른 프로그램 키워드와 겹치지 않는지 확인
+        # 예: "나는솔로"로 검색했는데 "솔로지옥"이 나오는 경우 방지
+        exclusive = self.exclusive_programs.get(search_keyword)
+        if exclusive and self.program_matcher.shows(text) & set(exclusive):
+            return False
+        return True
+    
+    def get_channel_id(self, channel_name: str, priority: str = 'medium') -> Optional[str]:
         """채널명으로 채널 ID 검색"""
-        url = f"{self.base_url}/search"
         params = {
             'part': 'snippet',
             'q': channel_name,
             'type': 'channel',
-            'key': self.api_key,
             'maxResults': 1
         }
         
         try:
-            response = requests.get(url, params=params)
-            data = response.json()
+            data = self.client.get('search', params, priority=priority)
             
             if 'error' in data:
-                import sys
                 print(f"YouTube API 오류: {data['error'].get('message')}", file=sys.stderr)
                 return None
                 
@@ -83,14 +146,14 @@ class YouTubeCrawler:
                 return data['items'][0]['snippet']['channelId']
             return None
             
+        except QuotaExceededError:
+            raise
         except Exception as e:
-            import sys
             print(f"채널 ID 검색 오류: {e}", file=sys.stderr)
             return None
     
-    def get_recent_videos(self, channel_id: str, max_results: int = 10) -> List[Dict]:
+    def get_recent_videos(self, channel_id: str, max_results: int = 10, priority: str = 'medium') -> List[Dict]:
         """채널의 최근 영상 목록 가져오기"""
-        url = f"{self.base_url}/search"
         from datetime import timezone
         published_after = (datetime.now(timezone.utc) - timedelta(days=7)).strftime('%Y-%m-%dT%H:%M:%SZ')
         params = {
@@ -99,303 +162,687 @@ class YouTubeCrawler:
             'type': 'video',
             'order': 'date',
             'maxResults': max_results,
-            'key': self.api_key,
             'publishedAfter': published_after
         }
         
         try:
-            response = requests.get(url, params=params)
-            data = response.json()
+            data = self.client.get('search', params, priority=priority)
             
-            videos = []
-            if 'items' in data:
-                for item in data['items']:
-                    video_id = item['id']['videoId']
-                    video_info = {
-                        'video_id': video_id,
-                        'title': item['snippet']['title'],
-                        'description': item['snippet']['description'],
-                        'published_at': item['snippet']['publishedAt'],
-                        'thumbnail': item['snippet']['thumbnails']['medium']['url'],
-                        'channel_title': item['snippet']['channelTitle'],
-                        'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                        'channel_id': channel_id
-                    }
-                    
-                    # 영상 상세 정보 가져오기
-                    video_details = self.get_video_details(video_info['video_id'])
-                    if video_details:
-                        video_info.update(video_details)
-                    
-                    # 채널 정보 가져오기 (구독자 수 등)
-                    channel_info = self.get_channel_info(channel_id)
-                    if channel_info:
-                        video_info['subscriber_count'] = channel_info.get('subscriber_count', '0')
-                    else:
-                        video_info['subscriber_count'] = '0'
-                    
-                    # 자막 여부 실제 체크
-                    video_info['has_subtitle'] = self.check_subtitle_availability(video_id)
-                    video_info['email'] = ''
-                    
-                    videos.append(video_info)
+            videos = [self._video_info_from_search_item(item) for item in data.get('items', [])]
+            
+            # 영상 상세 정보 + 채널 정보(구독자 수) 일괄 병합
+            self.enrich_videos(videos, priority=priority)
+            
+            # 자막 여부 실제 체크 (동시 조회)
+            transcripts = self.fetch_transcripts([v['video_id'] for v in videos], with_text=False)
+            for video_info in videos:
+                video_info['has_subtitle'] = transcripts[video_info['video_id']]['has_subtitle']
+                video_info['email'] = ''
             
             return videos
             
+        except QuotaExceededError:
+            raise
         except Exception as e:
-            import sys
             print(f"영상 목록 가져오기 오류: {e}", file=sys.stderr)
             return []
     
-    def get_channel_info(self, channel_id: str) -> Optional[Dict]:
-        """채널 정보 가져오기 (구독자 수 등)"""
-        url = f"{self.base_url}/channels"
-        params = {
-            'part': 'statistics',
-            'id': channel_id,
-            'key': self.api_key
+    def resolve_channel(self, channel_name: str, priority: str = 'medium') -> Optional[Dict]:
+        """채널명(또는 @핸들, UC로 시작하는 채널 ID)을 채널 ID와 업로드 재생목록 ID로 변환
+        결과는 data/youtube_channel_cache.json에 저장되어 다음 실행부터는 API를 호출하지 않음"""
+        cached = self.channel_cache.load().get(channel_name)
+        if cached and cached.get('uploads_playlist_id'):
+            return cached
+        
+        params = {'part': 'contentDetails,snippet'}
+        if channel_name.startswith('@'):
+            params['forHandle'] = channel_name
+        elif channel_name.startswith('UC') and len(channel_name) == 24:
+            params['id'] = channel_name
+        else:
+            # 이름만 있으면 검색이 필요 (100 units, 채널당 최초 1회)
+            channel_id = self.get_channel_id(channel_name, priority=priority)
+            if not channel_id:
+                return None
+            params['id'] = channel_id
+        
+        data = self.client.get('channels', params, priority=priority)
+        if 'error' in data:
+            print(f"YouTube API 오류 (channels.list): {data['error'].get('message')}", file=sys.stderr)
+            return None
+        items = data.get('items', [])
+        if not items:
+            return None
+        
+        item = items[0]
+        channel = {
+            'channel_id': item['id'],
+            'channel_title': item.get('snippet', {}).get('title', ''),
+            'uploads_playlist_id': item['contentDetails']['relatedPlaylists']['uploads'],
+            'resolved_at': datetime.now().isoformat()
         }
         
-        try:
-            response = requests.get(url, params=params)
-            data = response.json()
+        def put(cache):
+            cache[channel_name] = channel
+            return cache
+        self.channel_cache.update(put)
+        return channel
+    
+    def get_playlist_uploads(self, playlist_id: str, published_after: datetime,
+                             max_results: int = 50, priority: str = 'medium') -> List[Dict]:
+        """업로드 재생목록을 최신순으로 페이지 단위 조회 (playlistItems.list, 페이지당 1 unit)
+        published_after보다 오래된 영상이 나오면 중단"""
+        videos = []
+        page_token = None
+        cutoff = published_after.strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        while len(videos) < max_results:
+            params = {
+                'part': 'snippet,contentDetails',
+                'playlistId': playlist_id,
+                'maxResults': 50
+            }
+            if page_token:
+                params['pageToken'] = page_token
             
-            if 'items' in data and len(data['items']) > 0:
-                item = data['items'][0]
-                return {
-                    'subscriber_count': item['statistics'].get('subscriberCount', '0')
-                }
-            return None
+            data = self.client.get('playlistItems', params, priority=priority)
+            if 'error' in data:
+                print(f"YouTube API 오류 (playlistItems.list): {data['error'].get('message')}", file=sys.stderr)
+                break
+            
+            reached_cutoff = False
+            for item in data.get('items', []):
+                snippet = item.get('snippet', {})
+                content = item.get('contentDetails', {})
+                video_id = content.get('videoId')
+                published_at = content.get('videoPublishedAt') or snippet.get('publishedAt', '')
+                
+                # 비공개/삭제 영상은 게시일이 없음
+                if not video_id or not content.get('videoPublishedAt'):
+                    continue
+                if published_at < cutoff:
+                    reached_cutoff = True
+                    break
+                
+                thumbnails = snippet.get('thumbnails', {})
+                videos.append({
+                    'video_id': video_id,
+                    'title': snippet.get('title', ''),
+                    'description': snippet.get('description', ''),
+                    'published_at': published_at,
+                    'thumbnail': (thumbnails.get('medium') or thumbnails.get('default') or {}).get('url', ''),
+                    'channel_title': snippet.get('channelTitle', ''),
+                    'video_url': f'https://www.youtube.com/watch?v={video_id}',
+                    'channel_id': snippet.get('channelId', '')
+                })
+                if len(videos) >= max_results:
+                    break
+            
+            page_token = data.get('nextPageToken')
+            if reached_cutoff or not page_token:
+                break
+        
+        return videos
+    
+    def get_recent_uploads(self, channel_name: str, days_back: int = 7, max_results: int = 10,
+                           priority: str = 'medium', incremental: bool = False) -> List[Dict]:
+        """채널 업로드 재생목록 기반 최근 영상 목록 (search.list를 쓰지 않아 채널당 약 3 units)
+        incremental=True면 지난 실행 이후 새로 올라온 영상만 반환하고,
+        이미 처리한 영상은 조회수만 갱신해 refreshed_stats에 담음"""
+        channel = self.resolve_channel(channel_name, priority=priority)
+        if not channel:
+            return []
+        
+        from datetime import timezone
+        cursor_key = f"channel:{channel_name}"
+        published_after = datetime.now(timezone.utc) - timedelta(days=days_back)
+        if incremental:
+            published_after = self.cursors.published_after(cursor_key, published_after)
+        videos = self.get_playlist_uploads(channel['uploads_playlist_id'], published_after,
+                                           max_results=max_results, priority=priority)
+        if incremental:
+            videos, _ = self.cursors.split_new(cursor_key, videos)
+            self.refreshed_stats.update(self.refresh_video_stats(self.cursors.known_ids(cursor_key), priority))
+            self.cursors.advance(cursor_key, videos, [v['video_id'] for v in videos])
+        
+        # 영상 상세 정보 + 채널 정보(구독자 수) 일괄 병합
+        self.enrich_videos(videos, priority=priority)
+        
+        # 자막 여부 실제 체크 (동시 조회)
+        transcripts = self.fetch_transcripts([v['video_id'] for v in videos], with_text=False)
+        for video_info in videos:
+            video_info['has_subtitle'] = transcripts[video_info['video_id']]['has_subtitle']
+            video_info['email'] = ''
+        
+        return videos
+    
+    def _video_info_from_search_item(self, item: Dict) -> Dict:
+        """search.list 결과 항목을 영상 정보 딕셔너리로 변환"""
+        video_id = item['id']['videoId']
+        snippet = item['snippet']
+        return {
+            'video_id': video_id,
+            'title': snippet['title'],
+            'description': snippet['description'],
+            'published_at': snippet['publishedAt'],
+            'thumbnail': snippet['thumbnails']['medium']['url'],
+            'channel_title': snippet['channelTitle'],
+            'video_url': f'https://www.youtube.com/watch?v={video_id}',
+            'channel_id': snippet['channelId']
+        }
+    
+    def enrich_videos(self, videos: List[Dict], priority: str = 'medium') -> None:
+        """영상 목록에 상세 정보와 구독자 수를 일괄 병합
+        (영상마다 videos.list / channels.list를 호출하는 대신 50개씩 묶어서 호출)
+        priority는 영상 목록을 가져온 검색과 같은 우선순위로 할당량을 확인하기 위함"""
+        video_details = self.get_videos_details([v['video_id'] for v in videos], priority=priority)
+        channel_infos = self.get_channels_info([v['channel_id'] for v in videos if v.get('channel_id')],
+                                               priority=priority)
+        self._merge_enrichment(videos, video_details, channel_infos)
+    
+    @staticmethod
+    def _merge_enrichment(videos: List[Dict], video_details: Dict[str, Dict], channel_infos: Dict[str, Dict]) -> None:
+        for video_info in videos:
+            details = video_details.get(video_info['video_id'])
+            if details:
+                video_info.update(details)
+            
+            channel_info = channel_infos.get(video_info.get('channel_id'))
+            if channel_info:
+                video_info['subscriber_count'] = channel_info.get('subscriber_count', '0')
+            else:
+                video_info['subscriber_count'] = '0'
+    
+    def _list_by_ids(self, resource: str, part: str, ids: List[str], priority: str = 'medium') -> List[Dict]:
+        """videos.list / channels.list를 id 최대 50개씩 묶어서 호출"""
+        items = []
+        for params in self._id_chunk_params(part, ids):
+            items.extend(self._list_items(resource, self.client.get(resource, params, priority=priority)))
+        return items
+    
+    def _id_chunk_params(self, part: str, ids: List[str]) -> List[Dict]:
+        """중복을 제거한 id를 50개씩 묶은 list 호출 파라미터 목록"""
+        unique_ids = list(dict.fromkeys(i for i in ids if i))
+        return [
+            {'part': part, 'id': ','.join(unique_ids[start:start + self.MAX_IDS_PER_REQUEST])}
+            for start in range(0, len(unique_ids), self.MAX_IDS_PER_REQUEST)
+        ]
+    
+    @staticmethod
+    def _list_items(resource: str, data: Dict) -> List[Dict]:
+        if 'error' in data:
+            print(f"YouTube API 오류 ({resource}.list): {data['error'].get('message')}", file=sys.stderr)
+            return []
+        return data.get('items', [])
+    
+    def get_channels_info(self, channel_ids: List[str], priority: str = 'medium') -> Dict[str, Dict]:
+        """여러 채널 정보를 한 번에 가져오기 (channel_id → 구독자 수 등)"""
+        try:
+            return self._parse_channels_info(self._list_by_ids('channels', 'statistics', channel_ids, priority))
         except Exception as e:
-            import sys
             print(f"채널 정보 가져오기 오류: {e}", file=sys.stderr)
-            return None
+            return {}
+    
+    def get_videos_details(self, video_ids: List[str], priority: str = 'medium') -> Dict[str, Dict]:
+        """여러 영상의 상세 정보를 한 번에 가져오기 (video_id → 상세 정보)"""
+        try:
+            return self._parse_videos_details(
+                self._list_by_ids('videos', 'statistics,contentDetails', video_ids, priority))
+        except Exception as e:
+            print(f"영상 상세 정보 오류: {e}", file=sys.stderr)
+            return {}
+    
+    @staticmethod
+    def _parse_channels_info(items: List[Dict]) -> Dict[str, Dict]:
+        return {
+            item['id']: {
+                'subscriber_count': item.get('statistics', {}).get('subscriberCount', '0')
+            }
+            for item in items
+        }
+    
+    @staticmethod
+    def _parse_video_stats(item: Dict) -> Dict:
+        statistics = item.get('statistics', {})
+        return {
+            'view_count': statistics.get('viewCount', '0'),
+            'like_count': statistics.get('likeCount', '0'),
+            'comment_count': statistics.get('commentCount', '0'),
+        }
+    
+    @classmethod
+    def _parse_videos_details(cls, items: List[Dict]) -> Dict[str, Dict]:
+        return {
+            item['id']: {**cls._parse_video_stats(item), 'duration': item['contentDetails']['duration']}
+            for item in items
+        }
+    
+    def refresh_video_stats(self, video_ids: List[str], priority: str = 'medium') -> Dict[str, Dict]:
+        """이미 처리한 영상들의 조회수/좋아요/댓글 수만 일괄 갱신 (videos.list statistics, 50개당 1 unit)"""
+        if not video_ids:
+            return {}
+        try:
+            return {item['id']: self._parse_video_stats(item)
+                    for item in self._list_by_ids('videos', 'statistics', video_ids, priority)}
+        except Exception as e:
+            print(f"조회수 갱신 오류: {e}", file=sys.stderr)
+            return {}
+    
+    def get_channel_info(self, channel_id: str) -> Optional[Dict]:
+        """채널 정보 가져오기 (구독자 수 등)"""
+        return self.get_channels_info([channel_id]).get(channel_id)
     
     def get_video_details(self, video_id: str) -> Optional[Dict]:
         """영상 상세 정보 가져오기"""
-        url = f"{self.base_url}/videos"
-        params = {
-            'part': 'statistics,contentDetails',
-            'id': video_id,
-            'key': self.api_key
-        }
+        return self.get_videos_details([video_id]).get(video_id)
+    
+    def _list_transcripts(self, video_id: str):
+        """자막 목록 조회 (youtube.com 호출이므로 호스트 rate limit 적용)"""
+        self.transcript_limiter.acquire()
+        return YouTubeTranscriptApi.list_transcripts(video_id)
+    
+    @staticmethod
+    def _has_korean_transcript(transcript_list) -> bool:
+        """한국어 자막 (수동 또는 자동생성) 존재 여부"""
+        # 수동 자막 우선
+        try:
+            transcript_list.find_transcript(['ko', 'kr'])
+            return True
+        except:
+            pass
         
+        # 자동생성 자막 확인
         try:
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if 'items' in data and len(data['items']) > 0:
-                item = data['items'][0]
+            transcript_list.find_generated_transcript(['ko', 'kr'])
+            return True
+        except:
+            pass
+        
+        return False
+    
+    def _fetch_best_transcript(self, transcript_list) -> Optional[Dict]:
+        """자막 목록에서 우선순위대로 자막을 골라 {'lang', 'is_generated', 'text'}로 반환"""
+        # 1순위: 한국어 수동 자막 / 2순위: 한국어 자동생성 자막 / 3순위: 영어 자막 / 4순위: 영어 자동생성 자막
+        for finder, languages in (('find_transcript', ['ko', 'kr']),
+                                  ('find_generated_transcript', ['ko', 'kr']),
+                                  ('find_transcript', ['en']),
+                                  ('find_generated_transcript', ['en'])):
+            try:
+                transcript = getattr(transcript_list, finder)(languages)
+                if finder == 'find_transcript' and languages[0] == 'ko' and transcript.is_generated:
+                    continue
+                self.transcript_limiter.acquire()
+                transcript_data = transcript.fetch()
+            except:
+                continue
+            if transcript_data:
                 return {
-                    'view_count': item['statistics'].get('viewCount', '0'),
-                    'like_count': item['statistics'].get('likeCount', '0'),
-                    'comment_count': item['statistics'].get('commentCount', '0'),
-                    'duration': item['contentDetails']['duration']
+                    'lang': 'en' if languages[0] == 'en' else 'ko',
+                    'is_generated': bool(getattr(transcript, 'is_generated', finder == 'find_generated_transcript')),
+                    # 자막 텍스트 결합
+                    'text': " ".join([t['text'] for t in transcript_data]),
                 }
-            return None
-            
-        except Exception as e:
-            import sys
-            print(f"영상 상세 정보 오류: {e}", file=sys.stderr)
-            return None
+        return None
+    
+    @staticmethod
+    def _transcript_cache_key(video_id: str, lang: str, is_generated: bool) -> str:
+        return f"{video_id}:{lang}:{int(is_generated)}"
+    
+    def _cached_transcript(self, video_id: str) -> Optional[Dict]:
+        """캐시된 자막 (우선순위가 가장 높은 것). 자막 없음이 기록돼 있으면 text=None, 기록이 없으면 None"""
+        for lang, is_generated in TRANSCRIPT_PRIORITY:
+            text = self.transcript_cache.get(self._transcript_cache_key(video_id, lang, is_generated))
+            if text is not None:
+                return {'lang': lang, 'is_generated': is_generated, 'text': text}
+        if self.transcript_cache.get(f"{video_id}:none") is not None:
+            return {'lang': '', 'is_generated': False, 'text': None}
+        return None
+    
+    def _store_transcript(self, video_id: str, picked: Optional[Dict]):
+        if picked:
+            key = self._transcript_cache_key(video_id, picked['lang'], picked['is_generated'])
+            self.transcript_cache.set(key, picked['text'])
+        else:
+            # 자막이 없는 영상도 잠시 기억해 두어 같은 영상을 반복 조회하지 않음
+            missing_ttl = TRANSCRIPT_SETTINGS.get('missing_ttl_hours', 6) * 3600
+            self.transcript_cache.set(f"{video_id}:none", '', ttl=missing_ttl)
     
     def check_subtitle_availability(self, video_id: str) -> bool:
         """자막 존재 여부 확인 (자동생성 자막 포함)"""
-        try:
-            # 자막 목록 가져오기 시도
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            
-            # 한국어 자막 (수동 또는 자동생성) 확인
-            try:
-                # 수동 자막 우선
-                transcript_list.find_transcript(['ko', 'kr'])
-                return True
-            except:
-                pass
-            
-            # 자동생성 자막 확인
-            try:
-                transcript_list.find_generated_transcript(['ko', 'kr'])
-                return True
-            except:
-                pass
-                
-            return False
-        except (TranscriptsDisabled, NoTranscriptFound):
-            return False
-        except Exception as e:
-            print(f"자막 확인 오류 (video_id: {video_id}): {e}", file=sys.stderr)
-            return False
+        return self._transcript_info(video_id, with_text=False)['has_subtitle']
     
     def get_video_transcript(self, video_id: str) -> Optional[str]:
-        """영상 자막 가져오기 (자동생성 자막 포함)"""
+        """영상 자막 가져오기 (자동생성 자막 포함, 로컬 캐시 우선)"""
+        cached = self._cached_transcript(video_id)
+        if cached is not None:
+            return cached['text']
         try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            transcript_data = None
-            
-            # 1순위: 한국어 수동 자막
-            try:
-                transcript = transcript_list.find_transcript(['ko', 'kr'])
-                if not transcript.is_generated:
-                    transcript_data = transcript.fetch()
-            except:
-                pass
-            
-            # 2순위: 한국어 자동생성 자막
-            if not transcript_data:
-                try:
-                    transcript = transcript_list.find_generated_transcript(['ko', 'kr'])
-                    transcript_data = transcript.fetch()
-                except:
-                    pass
-            
-            # 3순위: 영어 자막
-            if not transcript_data:
-                try:
-                    transcript = transcript_list.find_transcript(['en'])
-                    transcript_data = transcript.fetch()
-                except:
-                    pass
-            
-            # 4순위: 영어 자동생성 자막
-            if not transcript_data:
-                try:
-                    transcript = transcript_list.find_generated_transcript(['en'])
-                    transcript_data = transcript.fetch()
-                except:
-                    pass
-            
-            if transcript_data:
-                # 자막 텍스트 결합
-                transcript_text = " ".join([t['text'] for t in transcript_data])
-                return transcript_text
-            
+            transcript_list = self._list_transcripts(video_id)
+        except (TranscriptsDisabled, NoTranscriptFound):
+            self._store_transcript(video_id, None)
             return None
-            
         except Exception as e:
             print(f"자막 가져오기 오류 (video_id: {video_id}): {e}", file=sys.stderr)
             return None
+        
+        picked = self._fetch_best_transcript(transcript_list)
+        if picked:
+            self._store_transcript(video_id, picked)
+            return picked['text']
+        return None
     
-    def search_videos_by_keyword(self, keyword: str, max_results: int = 10, hours_back: int = 24) -> List[Dict]:
-        """키워드로 영상 직접 검색 (채널 검색이 아닌 영상 검색)
-        최근 24시간 이내 업로드된 영상 중 조회수 상위 영상 반환"""
-        url = f"{self.base_url}/search"
+    def _transcript_info(self, video_id: str, with_text: bool) -> Dict:
+        """자막 목록을 한 번만 조회해 한국어 자막 존재 여부와 (필요 시) 자막 텍스트를 함께 반환"""
+        info = {'has_subtitle': False, 'transcript': None}
+        cached = self._cached_transcript(video_id)
+        if cached is not None:
+            # 캐시는 우선순위가 가장 높은 자막이므로 ko가 아니면 한국어 자막이 없는 영상
+            if cached['lang'] == 'ko':
+                info['has_subtitle'] = True
+                info['transcript'] = cached['text'] if with_text else None
+            return info
+        
+        try:
+            transcript_list = self._list_transcripts(video_id)
+        except (TranscriptsDisabled, NoTranscriptFound):
+            self._store_transcript(video_id, None)
+            return info
+        except Exception as e:
+            print(f"자막 확인 오류 (video_id: {video_id}): {e}", file=sys.stderr)
+            return info
         
+        info['has_subtitle'] = self._has_korean_transcript(transcript_list)
+        if with_text and info['has_subtitle']:
+            try:
+                picked = self._fetch_best_transcript(transcript_list)
+                if picked:
+                    self._store_transcript(video_id, picked)
+                    info['transcript'] = picked['text']
+            except Exception as e:
+                print(f"자막 가져오기 오류 (video_id: {video_id}): {e}", file=sys.stderr)
+        return info
+    
+    def fetch_transcripts(self, video_ids: List[str], with_text: bool = True) -> Dict[str, Dict]:
+        """여러 영상의 자막 정보를 동시에 조회 (video_id → {'has_subtitle', 'transcript'})
+        with_text=False면 존재 여부만 확인"""
+        if not video_ids:
+            return {}
+        workers = max(1, min(self.transcript_workers, len(video_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 상주 브릿지의 요청별 로그 라우팅이 작업 스레드에서도 유지되도록 컨텍스트 복사
+            futures = {
+                video_id: executor.submit(contextvars.copy_context().run, self._transcript_info, video_id, with_text)
+                for video_id in dict.fromkeys(video_ids)
+            }
+            return {video_id: future.result() for video_id, future in futures.items()}
+    
+    def _keyword_search_params(self, keyword: str, max_results: int, hours_back: int,
+                               incremental: bool = False) -> Dict:
         # 수집 버튼을 누른 시간으로부터 hours_back 시간 이내 (RFC 3339 형식: YYYY-MM-DDThh:mm:ssZ)
         # UTC 시간으로 변환하여 전송 (YouTube API는 UTC 기준)
         from datetime import timezone
-        published_after = (datetime.now(timezone.utc) - timedelta(hours=hours_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        window_start = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        if incremental:
+            # 지난 실행에서 본 마지막 게시 시각 이후만 검색
+            window_start = self.cursors.published_after(f"keyword:{keyword}", window_start)
+        published_after = window_start.strftime('%Y-%m-%dT%H:%M:%SZ')
         
         # 더 많은 결과를 가져와서 조회수로 정렬하기 위해 maxResults를 늘림
         # YouTube API는 최대 50개까지 한 번에 가져올 수 있음
         search_max_results = min(max_results * 5, 50)  # 최소 5배, 최대 50개
         
-        params = {
+        return {
             'part': 'snippet',
             'q': keyword,
             'type': 'video',
             'order': 'date',  # 날짜 순으로 가져온 후 조회수로 정렬
             'maxResults': search_max_results,
-            'key': self.api_key,
             'publishedAfter': published_after,
             'regionCode': 'KR',  # 한국 지역
             'relevanceLanguage': 'ko'  # 한국어 우선
         }
+    
+    def _search_hits(self, data: Dict, keyword: str) -> List[Dict]:
+        # API 응답 전체 로그 출력 (문제 파악용)
+        print(f"DEBUG YouTube API Response for '{keyword}': {json.dumps(data)[:500]}...", file=sys.stderr)
+        
+        if 'error' in data:
+            print(f"YouTube API 오류 (search_videos_by_keyword): {data['error'].get('message')}", file=sys.stderr)
+            return []
+        return [self._video_info_from_search_item(item) for item in data.get('items', [])]
+    
+    def _select_videos(self, search_hits: List[Dict], keyword: str,
+                       max_results: int) -> Tuple[List[Dict], List[Dict]]:
+        """관련성/자막 필터를 거쳐 조회수 상위 max_results개 반환 (상세 정보가 병합된 검색 결과 대상)
+
+        Returns:
+            (선택된 영상, 필터는 통과했지만 max_results 제한으로 잘린 영상)
+        """
+        videos = []
+        # 키워드 관련성 확인 (제목, 설명 기반) - 네트워크 호출 없이 먼저 거름
+        relevant_hits = []
+        for video_info in search_hits:
+            if not self.is_relevant_video(video_info, keyword):
+                print(f"[YouTube Crawler] 키워드 불일치 필터링: {video_info['title'][:50]}... (키워드: {keyword})", file=sys.stderr)
+                continue
+            relevant_hits.append(video_info)
+        
+        # 자막 목록 1회 조회로 존재 여부 + 내용을 동시에 가져옴 (워커 풀)
+        transcripts = self.fetch_transcripts([v['video_id'] for v in relevant_hits])
+        
+        for video_info in relevant_hits:
+            info = transcripts[video_info['video_id']]
+            video_info['has_subtitle'] = info['has_subtitle']
+            video_info['email'] = ''
+        
+            # 자막이 있는 경우 자막 내용도 확인
+            transcript = info['transcript']
+            if transcript:
+                # 자막에 키워드가 포함되어 있는지 확인
+                if not self._program_hits(transcript, keyword):
+                    print(f"[YouTube Crawler] 자막 내 키워드 부재 필터링: {video_info['title'][:50]}...", file=sys.stderr)
+                    continue
+        
+            videos.append(video_info)
+        
+        # 조회수 순으로 정렬 (내림차순)
+        videos.sort(key=lambda x: int(x.get('view_count', 0)), reverse=True)
+        
+        # 상위 max_results개만 반환 (잘린 영상은 증분 크롤링에서 다음 실행에 다시 후보가 되도록 따로 반환)
+        return videos[:max_results], videos[max_results:]
+    
+    def search_videos_by_keyword(self, keyword: str, max_results: int = 10, hours_back: int = 24,
+                                 priority: str = 'medium', incremental: bool = False) -> List[Dict]:
+        """키워드로 영상 직접 검색 (채널 검색이 아닌 영상 검색)
+        최근 24시간 이내 업로드된 영상 중 조회수 상위 영상 반환
+        incremental=True면 지난 실행 이후 처음 보는 영상만 상세 조회/필터링하고,
+        이미 처리한 영상은 조회수만 갱신해 refreshed_stats에 담음"""
+        params = self._keyword_search_params(keyword, max_results, hours_back, incremental=incremental)
+        cursor_key = f"keyword:{keyword}"
         
         try:
-            response = requests.get(url, params=params)
-            data = response.json()
+            search_hits = self._search_hits(self.client.get('search', params, priority=priority), keyword)
+            if incremental:
+                search_hits, _ = self.cursors.split_new(cursor_key, search_hits)
             
-            # API 응답 전체 로그 출력 (문제 파악용)
-            import sys
-            print(f"DEBUG YouTube API Response for '{keyword}': {json.dumps(data)[:500]}...", file=sys.stderr)
+            videos, cut = [], []
+            if search_hits:
+                # 영상 상세 정보 + 채널 정보(구독자 수) 일괄 병합 (최대 50개씩 묶어서 호출)
+                self.enrich_videos(search_hits, priority=priority)
+                videos, cut = self._select_videos(search_hits, keyword, max_results)
             
-            if 'error' in data:
-                print(f"YouTube API 오류 (search_videos_by_keyword): {data['error'].get('message')}", file=sys.stderr)
-                return []
-                
-            videos = []
-            if 'items' in data:
-                for item in data['items']:
-                    video_id = item['id']['videoId']
-                    channel_id = item['snippet']['channelId']
-                    
-                    video_info = {
-                        'video_id': video_id,
-                        'title': item['snippet']['title'],
-                        'description': item['snippet']['description'],
-                        'published_at': item['snippet']['publishedAt'],
-                        'thumbnail': item['snippet']['thumbnails']['medium']['url'],
-                        'channel_title': item['snippet']['channelTitle'],
-                        'video_url': f'https://www.youtube.com/watch?v={video_id}',
-                        'channel_id': channel_id
-                    }
-                    
-                    # 영상 상세 정보 가져오기
-                    video_details = self.get_video_details(video_id)
-                    if video_details:
-                        video_info.update(video_details)
-                    
-                    # 채널 정보 가져오기 (구독자 수 등)
-                    channel_info = self.get_channel_info(channel_id)
-                    if channel_info:
-                        video_info['subscriber_count'] = channel_info.get('subscriber_count', '0')
-                    else:
-                        video_info['subscriber_count'] = '0'
-                    
-                    # 자막 여부 실제 체크
-                    video_info['has_subtitle'] = self.check_subtitle_availability(video_id)
-                    video_info['email'] = ''
-                    
-                    # 키워드 관련성 확인 (제목, 설명 기반)
-                    if not self.is_relevant_video(video_info, keyword):
-                        print(f"[YouTube Crawler] 키워드 불일치 필터링: {video_info['title'][:50]}... (키워드: {keyword})", file=sys.stderr)
-                        continue
-                    
-                    # 자막이 있는 경우 자막 내용도 확인
-                    if video_info['has_subtitle']:
-                        try:
-                            transcript = self.get_video_transcript(video_id)
-                            if transcript:
-                                transcript_lower = transcript.lower()
-                                program_keywords_list = self.program_keywords.get(keyword, [keyword])
-                                # 자막에 키워드가 포함되어 있는지 확인
-                                if not any(kw.lower() in transcript_lower for kw in program_keywords_list):
-                                    print(f"[YouTube Crawler] 자막 내 키워드 부재 필터링: {video_info['title'][:50]}...", file=sys.stderr)
-                                    continue
-                        except Exception as e:
-                            # 자막 확인 실패해도 계속 진행 (제목/설명 기반으로 이미 필터링됨)
-                            print(f"[YouTube Crawler] 자막 확인 오류 (계속 진행): {e}", file=sys.stderr)
-                    
-                    videos.append(video_info)
+            if incremental:
+                self.refreshed_stats.update(self.refresh_video_stats(self.cursors.known_ids(cursor_key), priority))
+                self.cursors.advance(cursor_key, search_hits, [v['video_id'] for v in videos], unseen=cut)
+            return videos
+            
+        except QuotaExceededError as e:
+            print(f"[YouTube Crawler] 할당량 부족으로 검색을 미룹니다 ({keyword}): {e}", file=sys.stderr)
+            return []
+        except Exception as e:
+            print(f"키워드 검색 오류 ({keyword}): {e}", file=sys.stderr)
+            return []
+    
+    async def _alist_by_ids(self, client: AsyncYouTubeApiClient, resource: str, part: str,
+                            ids: List[str], priority: str = 'medium') -> List[Dict]:
+        """_list_by_ids의 비동기 버전 (50개 묶음들을 동시에 호출)"""
+        chunks = self._id_chunk_params(part, ids)
+        responses = await asyncio.gather(*(client.aget(resource, params, priority=priority) for params in chunks))
+        return [item for data in responses for item in self._list_items(resource, data)]
+    
+    async def aenrich_videos(self, client: AsyncYouTubeApiClient, videos: List[Dict],
+                             priority: str = 'medium') -> None:
+        """enrich_videos의 비동기 버전 (videos.list와 channels.list를 동시에 호출)"""
+        video_items, channel_items = await asyncio.gather(
+            self._alist_by_ids(client, 'videos', 'statistics,contentDetails', [v['video_id'] for v in videos],
+                               priority),
+            self._alist_by_ids(client, 'channels', 'statistics', [v.get('channel_id') for v in videos], priority),
+            return_exceptions=True,
+        )
+        for label, result in (('영상 상세 정보', video_items), ('채널 정보', channel_items)):
+            if isinstance(result, QuotaExceededError):
+                raise result
+            if isinstance(result, Exception):
+                print(f"{label} 오류: {result}", file=sys.stderr)
+        video_details = {} if isinstance(video_items, Exception) else self._parse_videos_details(video_items)
+        channel_infos = {} if isinstance(channel_items, Exception) else self._parse_channels_info(channel_items)
+        self._merge_enrichment(videos, video_details, channel_infos)
+    
+    async def arefresh_video_stats(self, client: AsyncYouTubeApiClient, video_ids: List[str],
+                                   priority: str = 'medium') -> Dict[str, Dict]:
+        """refresh_video_stats의 비동기 버전"""
+        if not video_ids:
+            return {}
+        try:
+            items = await self._alist_by_ids(client, 'videos', 'statistics', video_ids, priority)
+            return {item['id']: self._parse_video_stats(item) for item in items}
+        except Exception as e:
+            print(f"조회수 갱신 오류: {e}", file=sys.stderr)
+            return {}
+    
+    async def asearch_videos_by_keyword(self, client: AsyncYouTubeApiClient, keyword: str, max_results: int = 10,
+                                        hours_back: int = 24, priority: str = 'medium',
+                                        incremental: bool = False) -> List[Dict]:
+        """search_videos_by_keyword의 비동기 버전
+        (API 호출은 이벤트 루프에서, 자막 조회는 기존 워커 풀을 별도 스레드에서 실행)"""
+        params = self._keyword_search_params(keyword, max_results, hours_back, incremental=incremental)
+        cursor_key = f"keyword:{keyword}"
+        
+        try:
+            search_hits = self._search_hits(await client.aget('search', params, priority=priority), keyword)
+            if incremental:
+                search_hits, _ = self.cursors.split_new(cursor_key, search_hits)
             
-            # 조회수 순으로 정렬 (내림차순)
-            videos.sort(key=lambda x: int(x.get('view_count', 0)), reverse=True)
+            videos, cut = [], []
+            if search_hits:
+                await self.aenrich_videos(client, search_hits, priority=priority)
+                videos, cut = await asyncio.to_thread(
+                    contextvars.copy_context().run, self._select_videos, search_hits, keyword, max_results
+                )
             
-            # 상위 max_results개만 반환
-            return videos[:max_results]
+            if incremental:
+                self.refreshed_stats.update(
+                    await self.arefresh_video_stats(client, self.cursors.known_ids(cursor_key), priority))
+                self.cursors.advance(cursor_key, search_hits, [v['video_id'] for v in videos], unseen=cut)
+            return videos
             
+        except QuotaExceededError as e:
+            print(f"[YouTube Crawler] 할당량 부족으로 검색을 미룹니다 ({keyword}): {e}", file=sys.stderr)
+            return []
         except Exception as e:
-            import sys
             print(f"키워드 검색 오류 ({keyword}): {e}", file=sys.stderr)
             return []
     
-    def crawl_target_channels(self, channel_names: List[str]) -> Dict[str, List[Dict]]:
-        """타겟 채널들의 최신 영상 크롤링"""
+    def search_keywords(self, keywords: List[str], max_results: int = 10, hours_back: int = 24,
+                        priorities: Optional[Dict[str, str]] = None,
+                        incremental: bool = False) -> Dict[str, List[Dict]]:
+        """여러 키워드를 한 번에 검색 (keyword → 영상 목록)
+        httpx가 있으면 하나의 이벤트 루프에서 키워드별 검색을 동시에 실행하고 연결을 재사용,
+        없으면 키워드 순서대로 동기 검색"""
+        priorities = priorities or {}
+        if not HAS_HTTPX:
+            return {
+                keyword: self.search_videos_by_keyword(keyword, max_results, hours_back=hours_back,
+                                                       priority=priorities.get(keyword, 'medium'),
+                                                       incremental=incremental)
+                for keyword in keywords
+            }
+        
+        async def run():
+            async with AsyncYouTubeApiClient(self.api_key, tracker=self.client.tracker,
+                                             base_url=self.base_url) as client:
+                results = await asyncio.gather(*(
+                    self.asearch_videos_by_keyword(client, keyword, max_results, hours_back=hours_back,
+                                                   priority=priorities.get(keyword, 'medium'),
+                                                   incremental=incremental)
+                    for keyword in keywords
+                ))
+            return dict(zip(keywords, results))
+        
+        return asyncio.run(run())
+    
+    # 채널 1개 크롤링 예상 비용 (search 모드): 채널 검색 + 최근 영상 검색 + 상세/채널 정보 일괄 조회
+    CHANNEL_CRAWL_COST = QUOTA_COSTS['search'] * 2 + QUOTA_COSTS['videos'] + QUOTA_COSTS['channels']
+    # 업로드 재생목록 모드: 재생목록 1페이지 + 상세/채널 정보 일괄 조회 (채널 ID가 캐시된 경우)
+    UPLOADS_CRAWL_COST = QUOTA_COSTS['playlistItems'] + QUOTA_COSTS['videos'] + QUOTA_COSTS['channels']
+    
+    def _estimate_channel_cost(self, channel_name: str, use_uploads_playlist: bool) -> int:
+        if not use_uploads_playlist:
+            return self.CHANNEL_CRAWL_COST
+        cached = self.channel_cache.load().get(channel_name)
+        if cached and cached.get('uploads_playlist_id'):
+            return self.UPLOADS_CRAWL_COST
+        # 최초 1회 resolve 비용 (검색 + channels.list)
+        resolve_cost = QUOTA_COSTS['channels'] if channel_name.startswith(('@', 'UC')) else QUOTA_COSTS['search'] + QUOTA_COSTS['channels']
+        return self.UPLOADS_CRAWL_COST + resolve_cost
+    
+    def crawl_target_channels(self, channels: List, use_uploads_playlist: bool = True,
+                              days_back: int = 7, max_results: int = 10,
+                              incremental: bool = False) -> Dict[str, List[Dict]]:
+        """타겟 채널들의 최신 영상 크롤링
+        
+        Args:
+            channels: 채널명 목록 또는 config/settings.TARGET_CHANNELS 형식의 딕셔너리 목록
+                      ('priority'가 high인 채널부터 남은 할당량 안에서 처리, 부족하면 deferred_channels로 미룸)
+            use_uploads_playlist: True면 업로드 재생목록(playlistItems.list)으로 조회,
+                                  False면 기존 search.list 방식
+            incremental: True면 채널별 커서 이후 새 영상만 반환 (업로드 재생목록 모드에서만 적용)
+        """
+        tasks = []
+        for channel in channels:
+            task = dict(channel) if isinstance(channel, dict) else {'name': channel, 'priority': 'medium'}
+            task['estimated_cost'] = self._estimate_channel_cost(task['name'], use_uploads_playlist)
+            tasks.append(task)
+        
+        runnable, self.deferred_channels = schedule_by_priority(tasks, self.client.tracker)
+        for task in self.deferred_channels:
+            print(f"할당량 부족으로 다음 실행으로 미룸: {task['name']} (우선순위 {task.get('priority')})", file=sys.stderr)
+        
         results = {}
         
-        for channel_name in channel_names:
-            import sys
-            print(f"크롤링 중: {channel_name}", file=sys.stderr)
+        for task in runnable:
+            channel_name = task['name']
+            priority = task.get('priority', 'medium')
+            print(f"크롤링 중: {channel_name} (우선순위 {priority}, 남은 할당량 {self.client.remaining_budget()})", file=sys.stderr)
             
-            # 채널 ID 검색
-            channel_id = self.get_channel_id(channel_name)
-            if not channel_id:
-                print(f"채널을 찾을 수 없습니다: {channel_name}", file=sys.stderr)
+            try:
+                if use_uploads_playlist:
+                    videos = self.get_recent_uploads(channel_name, days_back=days_back,
+                                                     max_results=max_results, priority=priority,
+                                                     incremental=incremental)
+                else:
+                    # 채널 ID 검색
+                    channel_id = self.get_channel_id(channel_name, priority=priority)
+                    if not channel_id:
+                        print(f"채널을 찾을 수 없습니다: {channel_name}", file=sys.stderr)
+                        continue
+                    
+                    # 최근 영상 가져오기
+                    videos = self.get_recent_videos(channel_id, max_results=max_results, priority=priority)
+            except QuotaExceededError as e:
+                print(f"할당량 부족으로 중단: {channel_name} - {e}", file=sys.stderr)
+                self.deferred_channels.append(task)
                 continue
-            
-            # 최근 영상 가져오기
-            videos = self.get_recent_videos(channel_id)
             results[channel_name] = videos
             
             print(f"완료: {channel_name} - {len(videos)}개 영상", file=sys.stderr)
@@ -410,32 +857,21 @@ class YouTubeCrawler:
         try:
             with open(f"data/{filename}", 'w', encoding='utf-8') as f:
                 json.dump(results, f, ensure_ascii=False, indent=2)
-            import sys
             print(f"결과 저장 완료: {filename}", file=sys.stderr)
             
         except Exception as e:
-            import sys
             print(f"파일 저장 오류: {e}", file=sys.stderr)
 
 
-# 테스트용 타겟 채널 목록 (5개)
-TARGET_CHANNELS = [
-    "나는솔로",
-    "돌싱글즈", 
-    "하트시그널",
-    "SBS Entertainment",
-    "MBC Entertainment"
-]
-
 def main():
     """테스트용 메인 함수"""
     # API 키는 환경변수에서 가져오기
     api_key = os.getenv('YOUTUBE_API_KEY')
     if not api_key:
-        import sys
         print("YouTube API 키가 설정되지 않았습니다.", file=sys.stderr)
         return
     
+    from config.settings import TARGET_CHANNELS
     crawler = YouTubeCrawler(api_key)
     results = crawler.crawl_target_channels(TARGET_CHANNELS)
     crawler.save_crawl_results(results)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# crawler/ 기준 import (modules.*, config.*)
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,61 @@
+"""modules.json_response 파서/미션 검증 테스트"""
+
+from modules.json_response import is_complete_mission, parse_json_response
+
+MISSION_A = '{"title": "A", "kind": "PREDICT", "form": "binary", "options": ["네", "아니요"]}'
+
+
+def test_direct():
+    assert parse_json_response('{"missions": []}') == ({'missions': []}, 'direct')
+
+
+def test_fenced():
+    value, outcome = parse_json_response('```json\n{"missions": [' + MISSION_A + ']}\n```')
+    assert outcome == 'direct'
+    assert value['missions'][0]['title'] == 'A'
+
+
+def test_surrounding_text():
+    value, outcome = parse_json_response('결과입니다:\n{"a": 1}\n이상입니다.')
+    assert (value, outcome) == ({'a': 1}, 'extracted')
+
+
+def test_trailing_comma():
+    value, outcome = parse_json_response('{"missions": [' + MISSION_A + ',],}')
+    assert outcome == 'repaired'
+    assert len(value['missions']) == 1 and is_complete_mission(value['missions'][0])
+
+
+def test_truncated_in_string():
+    value, outcome = parse_json_response('{"missions": [' + MISSION_A + ', {"title": "B", "kind": "PRED')
+    assert outcome == 'repaired'
+    assert [is_complete_mission(m) for m in value['missions']] == [True, False]
+
+
+def test_truncated_mid_item_is_incomplete():
+    text = ('{"videos": {"a": {"missions": [' + MISSION_A + ']}, '
+            '"b": {"missions": [{"title": "B", "kind": "PRED')
+    value, outcome = parse_json_response(text)
+    assert outcome == 'repaired'
+    assert is_complete_mission(value['videos']['a']['missions'][0])
+    # 잘린 미션은 앞쪽 키만 남으므로 필수 필드 검사에서 걸러져야 함
+    assert value['videos']['b']['missions'] == [{'title': 'B'}]
+    assert not is_complete_mission(value['videos']['b']['missions'][0])
+
+
+def test_truncated_options():
+    value, _ = parse_json_response('{"title": "A", "kind": "PREDICT", "form": "binary", "options": ["네", "아')
+    assert value is not None
+    assert not is_complete_mission(value)
+
+
+def test_unrecoverable():
+    assert parse_json_response('') == (None, 'failed')
+    assert parse_json_response('응답 없음') == (None, 'failed')
+
+
+def test_is_complete_mission():
+    assert is_complete_mission({'title': 'A', 'kind': 'PREDICT', 'form': 'binary', 'options': ['x', 'y']})
+    assert not is_complete_mission({'title': 'A', 'kind': 'PREDICT', 'form': 'binary', 'options': []})
+    assert not is_complete_mission({'title': 'A', 'kind': 'PREDICT', 'options': ['x', 'y']})
+    assert not is_complete_mission('A')